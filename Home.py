@@ -5,9 +5,16 @@ Página inicial do aplicativo Streamlit
 Autor: Leandro Tanno (POSTECH Data Analytics)
 """
 import streamlit as st
-import pandas as pd
+import sys
 from pathlib import Path
 
+# Adicionar path para imports
+sys.path.append(str(Path(__file__).parent))
+
+from utils.query import query
+from utils.instrumentation import diagnostics_panel
+from utils.tracing import begin_rerun, end_rerun, section, span
+
 # Configuração da página
 st.set_page_config(
     page_title="Vinhos do Brasil: Rumo ao Mercado Premium",
@@ -16,121 +23,123 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# CSS customizado
-st.markdown("""
-<style>
-    .main-header {
-        font-size: 3rem;
-        color: #8B0000;
-        text-align: center;
-        font-weight: bold;
-        margin-bottom: 0;
-    }
-    .sub-header {
-        font-size: 1.5rem;
-        color: #4A4A4A;
-        text-align: center;
-        margin-top: 0;
-        margin-bottom: 2rem;
-    }
-    .metric-card {
-        background-color: #f0f0f0;
-        padding: 1rem;
-        border-radius: 0.5rem;
-        border-left: 4px solid #8B0000;
-    }
-    .highlight-box {
-        background-color: #fff9e6;
-        padding: 1.5rem;
-        border-radius: 0.5rem;
-        border-left: 4px solid #DAA520;
-        margin: 1rem 0;
-    }
-</style>
-""", unsafe_allow_html=True)
-
-# Header
-st.markdown('<p class="main-header">🍷 Vinhos do Brasil: Rumo ao Mercado Premium</p>', unsafe_allow_html=True)
-st.markdown('<p class="sub-header">Análise Estratégica das Exportações Brasileiras de Vinho (2009-2023)</p>', unsafe_allow_html=True)
+# Trace do rerun (WINE_TRACE=1)
+begin_rerun('Home')
 
-# Linha separadora
-st.markdown("---")
-
-# Introdução
-col1, col2 = st.columns([2, 1])
-
-with col1:
+# CSS customizado
+with section('Cabeçalho'):
     st.markdown("""
-    ## 📋 Sobre o Projeto
-    
-    Este projeto analisa **15 anos de dados** (2009-2023) das exportações brasileiras de vinho, 
-    com o objetivo de identificar oportunidades estratégicas para transformar o Brasil em um 
-    **player relevante no mercado internacional de vinhos premium**.
-    
-    ### 🎯 Pergunta Norteadora
-    
-    > *"Como o Brasil pode evoluir de um modelo de volume/baixo valor para um posicionamento 
-    > competitivo no mercado internacional de vinhos premium?"*
-    
-    ### 📊 Dados Analisados
+    <style>
+        .main-header {
+            font-size: 3rem;
+            color: #8B0000;
+            text-align: center;
+            font-weight: bold;
+            margin-bottom: 0;
+        }
+        .sub-header {
+            font-size: 1.5rem;
+            color: #4A4A4A;
+            text-align: center;
+            margin-top: 0;
+            margin-bottom: 2rem;
+        }
+        .metric-card {
+            background-color: #f0f0f0;
+            padding: 1rem;
+            border-radius: 0.5rem;
+            border-left: 4px solid #8B0000;
+        }
+        .highlight-box {
+            background-color: #fff9e6;
+            padding: 1.5rem;
+            border-radius: 0.5rem;
+            border-left: 4px solid #DAA520;
+            margin: 1rem 0;
+        }
+    </style>
+    """, unsafe_allow_html=True)
     
-    - **Exportações**: 137 países destino | Volume e valor (USD)
-    - **Importações**: 68 países origem | Análise comparativa
-    - **Produção**: Categorias e volumes produzidos
-    - **Processamento**: Cultivares processadas
-    - **Comercialização**: Mercado interno brasileiro
+    # Header
+    st.markdown('<p class="main-header">🍷 Vinhos do Brasil: Rumo ao Mercado Premium</p>', unsafe_allow_html=True)
+    st.markdown('<p class="sub-header">Análise Estratégica das Exportações Brasileiras de Vinho (2009-2023)</p>', unsafe_allow_html=True)
     
-    **Fonte**: EMBRAPA Vitibrasil
-    """)
-
-with col2:
-    st.markdown("""
-    ### 🚀 Navegação
+    # Linha separadora
+    st.markdown("---")
     
-    Use o menu lateral para explorar:
+    # Introdução
+    col1, col2 = st.columns([2, 1])
     
-    **📊 Diagnóstico**
-    - Situação atual das exportações
-    - Principais destinos
-    - Análise de volume e valor
+    with col1:
+        st.markdown("""
+        ## 📋 Sobre o Projeto
+        
+        Este projeto analisa **15 anos de dados** (2009-2023) das exportações brasileiras de vinho, 
+        com o objetivo de identificar oportunidades estratégicas para transformar o Brasil em um 
+        **player relevante no mercado internacional de vinhos premium**.
+        
+        ### 🎯 Pergunta Norteadora
+        
+        > *"Como o Brasil pode evoluir de um modelo de volume/baixo valor para um posicionamento 
+        > competitivo no mercado internacional de vinhos premium?"*
+        
+        ### 📊 Dados Analisados
+        
+        - **Exportações**: 137 países destino | Volume e valor (USD)
+        - **Importações**: 68 países origem | Análise comparativa
+        - **Produção**: Categorias e volumes produzidos
+        - **Processamento**: Cultivares processadas
+        - **Comercialização**: Mercado interno brasileiro
+        
+        **Fonte**: EMBRAPA Vitibrasil
+        """)
     
-    **🔍 Contexto**
-    - Comparação Export vs Import
-    - Análise de preços
-    - Posicionamento competitivo
+    with col2:
+        st.markdown("""
+        ### 🚀 Navegação
+        
+        Use o menu lateral para explorar:
+        
+        **📊 Diagnóstico**
+        - Situação atual das exportações
+        - Principais destinos
+        - Análise de volume e valor
+        
+        **🔍 Contexto**
+        - Comparação Export vs Import
+        - Análise de preços
+        - Posicionamento competitivo
+        
+        **🎯 Estratégias**
+        - Oportunidades identificadas
+        - Recomendações acionáveis
+        - Projeções futuras
+        """)
     
-    **🎯 Estratégias**
-    - Oportunidades identificadas
-    - Recomendações acionáveis
-    - Projeções futuras
-    """)
-
-st.markdown("---")
+    st.markdown("---")
 
 # KPIs Principais
-st.markdown("## 📈 Métricas Gerais (2009-2023)")
-
-try:
-    # Carregar dados processados
-    data_path = Path('data/processed')
-    df_export = pd.read_csv(data_path / 'export_processed.csv')
-    df_import = pd.read_csv(data_path / 'import_processed.csv')
-    df_comparacao = pd.read_csv(data_path / 'comparacao_exp_imp.csv')
-    
-    # Calcular métricas
-    total_export_litros = df_export['quantidade_litros'].sum()
-    total_export_usd = df_export['valor_usd'].sum()
-    preco_medio_exp = total_export_usd / total_export_litros
-    
-    total_import_litros = df_import['quantidade_litros'].sum()
-    total_import_usd = df_import['valor_usd'].sum()
-    preco_medio_imp = total_import_usd / total_import_litros
-    
-    num_paises_destino = df_export['pais_destino'].nunique()
-    
-    # Balança comercial
-    balanca_litros = total_export_litros - total_import_litros
-    balanca_usd = total_export_usd - total_import_usd
+with section('KPIs Principais'):
+    st.markdown("## 📈 Métricas Gerais (2009-2023)")
+    
+    # Totais do período (camada de consultas, sobre o cubo em cache)
+    with span('Home › totais dos KPIs', 'agregacao'):
+        totais_export = query('export', None, ['quantidade_litros', 'valor_usd', 'preco_medio', 'num_paises']).iloc[0]
+        totais_import = query('import', None, ['quantidade_litros', 'valor_usd', 'preco_medio']).iloc[0]
+        
+        total_export_litros = totais_export['quantidade_litros']
+        total_export_usd = totais_export['valor_usd']
+        preco_medio_exp = totais_export['preco_medio']
+        
+        total_import_litros = totais_import['quantidade_litros']
+        total_import_usd = totais_import['valor_usd']
+        preco_medio_imp = totais_import['preco_medio']
+        
+        num_paises_destino = int(totais_export['num_paises'])
+        
+        # Balança comercial
+        balanca_litros = total_export_litros - total_import_litros
+        balanca_usd = total_export_usd - total_import_usd
     
     # Display métricas
     col1, col2, col3, col4 = st.columns(4)
@@ -196,83 +205,88 @@ try:
             delta="Import > Export",
             delta_color="inverse"
         )
-
-except FileNotFoundError:
-    st.error("❌ Erro ao carregar dados. Execute `python utils/data_processing.py` primeiro.")
-    st.stop()
-
-st.markdown("---")
+    
+    st.markdown("---")
 
 # Insights Principais
-st.markdown("## 💡 Principais Insights")
-
-col1, col2 = st.columns(2)
+with section('Insights Principais'):
+    st.markdown("## 💡 Principais Insights")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("""
+        <div class="highlight-box">
+        <h3>🔴 Desafios Identificados</h3>
+        <ul>
+            <li><strong>Concentração extrema:</strong> ~70% das exportações vão para o Paraguai</li>
+            <li><strong>Baixo valor agregado:</strong> Preço médio de US$ 1.92/L (vinho de mesa)</li>
+            <li><strong>Balança negativa:</strong> Importamos 25x mais do que exportamos em volume</li>
+            <li><strong>Gap de preço:</strong> Importamos vinhos 66% mais caros do que exportamos</li>
+        </ul>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown("""
+        <div class="highlight-box">
+        <h3>🟢 Oportunidades Identificadas</h3>
+        <ul>
+            <li><strong>Mercados crescentes:</strong> China, EUA e Reino Unido com potencial</li>
+            <li><strong>Produção robusta:</strong> 200M+ litros comercializados internamente</li>
+            <li><strong>Diversificação:</strong> Reduzir dependência do mercado paraguaio</li>
+            <li><strong>Premium:</strong> Desenvolver vinhos finos e espumantes de qualidade</li>
+        </ul>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    st.markdown("---")
 
-with col1:
-    st.markdown("""
-    <div class="highlight-box">
-    <h3>🔴 Desafios Identificados</h3>
-    <ul>
-        <li><strong>Concentração extrema:</strong> ~70% das exportações vão para o Paraguai</li>
-        <li><strong>Baixo valor agregado:</strong> Preço médio de US$ 1.92/L (vinho de mesa)</li>
-        <li><strong>Balança negativa:</strong> Importamos 25x mais do que exportamos em volume</li>
-        <li><strong>Gap de preço:</strong> Importamos vinhos 66% mais caros do que exportamos</li>
-    </ul>
-    </div>
-    """, unsafe_allow_html=True)
+# Metodologia
+with section('Metodologia'):
+    with st.expander("📚 Metodologia e Fontes de Dados"):
+        st.markdown("""
+        ### Metodologia
+        
+        1. **Coleta de Dados**: Extração de dados da plataforma Embrapa Vitibrasil
+        2. **Processamento**: Transformação de formato wide para long, limpeza e agregações
+        3. **Análise Exploratória**: Identificação de padrões, tendências e outliers
+        4. **Visualização**: Criação de dashboards interativos com Plotly
+        5. **Insights**: Geração de recomendações estratégicas baseadas em dados
+        
+        ### Conversão de Unidades
+        
+        Conforme especificado no enunciado: **1 kg = 1 litro**
+        
+        ### Período de Análise
+        
+        **2009-2023** (últimos 15 anos conforme solicitado)
+        
+        ### Fontes
+        
+        - **EMBRAPA Vitibrasil**: http://vitibrasil.cnpuv.embrapa.br
+        - Datasets: Exportação, Importação, Produção, Processamento, Comercialização
+        
+        ### Tecnologias Utilizadas
+        
+        - **Python 3.12**: Linguagem principal
+        - **Pandas**: Manipulação de dados
+        - **Plotly**: Visualizações interativas
+        - **Streamlit**: Interface web
+        """)
 
-with col2:
+# Footer
+with section('Footer'):
+    st.markdown("---")
     st.markdown("""
-    <div class="highlight-box">
-    <h3>🟢 Oportunidades Identificadas</h3>
-    <ul>
-        <li><strong>Mercados crescentes:</strong> China, EUA e Reino Unido com potencial</li>
-        <li><strong>Produção robusta:</strong> 200M+ litros comercializados internamente</li>
-        <li><strong>Diversificação:</strong> Reduzir dependência do mercado paraguaio</li>
-        <li><strong>Premium:</strong> Desenvolver vinhos finos e espumantes de qualidade</li>
-    </ul>
+    <div style='text-align: center; color: #666;'>
+        <p><strong>Tech Challenge Fase 1 - POSTECH Data Analytics</strong></p>
+        <p>Desenvolvido por Tanno | 2025</p>
     </div>
     """, unsafe_allow_html=True)
 
-st.markdown("---")
+# Painel de diagnóstico (oculto; ?diagnostico=1 na URL)
+diagnostics_panel()
 
-# Metodologia
-with st.expander("📚 Metodologia e Fontes de Dados"):
-    st.markdown("""
-    ### Metodologia
-    
-    1. **Coleta de Dados**: Extração de dados da plataforma Embrapa Vitibrasil
-    2. **Processamento**: Transformação de formato wide para long, limpeza e agregações
-    3. **Análise Exploratória**: Identificação de padrões, tendências e outliers
-    4. **Visualização**: Criação de dashboards interativos com Plotly
-    5. **Insights**: Geração de recomendações estratégicas baseadas em dados
-    
-    ### Conversão de Unidades
-    
-    Conforme especificado no enunciado: **1 kg = 1 litro**
-    
-    ### Período de Análise
-    
-    **2009-2023** (últimos 15 anos conforme solicitado)
-    
-    ### Fontes
-    
-    - **EMBRAPA Vitibrasil**: http://vitibrasil.cnpuv.embrapa.br
-    - Datasets: Exportação, Importação, Produção, Processamento, Comercialização
-    
-    ### Tecnologias Utilizadas
-    
-    - **Python 3.12**: Linguagem principal
-    - **Pandas**: Manipulação de dados
-    - **Plotly**: Visualizações interativas
-    - **Streamlit**: Interface web
-    """)
-
-# Footer
-st.markdown("---")
-st.markdown("""
-<div style='text-align: center; color: #666;'>
-    <p><strong>Tech Challenge Fase 1 - POSTECH Data Analytics</strong></p>
-    <p>Desenvolvido por Tanno | 2025</p>
-</div>
-""", unsafe_allow_html=True)
\ No newline at end of file
+# Fecha o trace do rerun
+end_rerun()
\ No newline at end of file
@@ -0,0 +1,145 @@
+"""
+Benchmark do cache em disco de tabelas derivadas (`utils.disk_cache`).
+
+1. Partida a frio: dois processos novos calculam as tabelas derivadas das
+   páginas (consultas agregadas e mercados em crescimento); o primeiro
+   encontra o cache vazio, o segundo reaproveita o que o primeiro gravou.
+2. Despejo LRU: grava mais entradas do que cabem no orçamento e confere
+   que o diretório respeita o limite e que as entradas usadas por último
+   sobrevivem.
+3. Concorrência: vários processos calculam/leem as mesmas chaves ao mesmo
+   tempo e todos recebem o resultado correto, sem temporários órfãos.
+
+Uso:
+    python benchmarks/bench_disk_cache.py [--processos 8]
+"""
+import argparse
+import logging
+import subprocess
+import sys
+import tempfile
+import time
+from multiprocessing import Pool
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Adicionar path para imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.disk_cache import clear_disk_cache, configure_disk_cache, disk_cache_info, disk_cached
+
+
+# Consultas feitas pelas páginas (argumentos de `utils.query.query`)
+PAGE_QUERIES = [
+    ('export', None, ['valor_usd'], None, None, None),
+    ('import', None, ['valor_usd'], None, None, None),
+    ('export', 'pais', ['quantidade_litros', 'valor_usd', 'preco_medio', 'participacao_pct'], None, 15, '-valor_usd'),
+    ('import', 'pais', ['quantidade_litros', 'valor_usd', 'preco_medio'], None, 10, '-valor_usd'),
+    ('export', 'pais', ['preco_medio'], None, 5, '-valor_usd'),
+    ('export', 'pais', ['valor_usd', 'quantidade_litros', 'preco_medio'], None, None, None),
+    ('export', 'pais', ['participacao_pct'], None, None, None),
+]
+
+
+def worker(cache_path):
+    """
+    Processo novo: calcula as tabelas derivadas das páginas e imprime o tempo
+    (sem contar os imports).
+    """
+    logging.getLogger('streamlit').setLevel(logging.ERROR)
+    
+    from utils.data_loader import get_growing_markets
+    from utils.query import _run_query
+    
+    configure_disk_cache(path=cache_path)
+    start = time.perf_counter()
+    for args in PAGE_QUERIES:
+        _run_query(*args)
+    get_growing_markets(min_years=5, min_cagr=5)
+    
+    info = disk_cache_info()
+    print(f"{(time.perf_counter() - start) * 1000:.1f} {info['hits']} {info['misses']}")
+
+
+def cold_start(cache_path):
+    command = [sys.executable, __file__, '--worker', str(cache_path)]
+    results = []
+    for _ in range(2):
+        output = subprocess.run(command, capture_output=True, text=True, check=True).stdout.split()
+        results.append((float(output[0]), int(output[1]), int(output[2])))
+    return results
+
+
+@disk_cached
+def synthetic_table(seed, rows=20_000):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({'pais_id': rng.integers(0, 200, rows).astype(np.int16), 'valor_usd': rng.random(rows)})
+
+
+def check_eviction(cache_path):
+    configure_disk_cache(path=cache_path, max_bytes=10 ** 9)
+    synthetic_table(0)
+    entry_size = disk_cache_info()['bytes']
+    
+    # Orçamento para 5 entradas; a entrada 0 é relida antes de cada gravação
+    clear_disk_cache()
+    configure_disk_cache(max_bytes=entry_size * 5)
+    for seed in range(20):
+        synthetic_table(0)
+        time.sleep(0.01)
+        synthetic_table(seed)
+        time.sleep(0.01)
+    
+    info = disk_cache_info()
+    kept = {path.name for path in Path(cache_path).glob('*.feather')}
+    synthetic_table(0)
+    survived = disk_cache_info()['hits'] > info['hits']
+    return info, len(kept), survived
+
+
+def concurrent_job(args):
+    cache_path, seed = args
+    configure_disk_cache(path=cache_path)
+    return float(synthetic_table(seed)['valor_usd'].sum())
+
+
+def check_concurrency(cache_path, processos):
+    jobs = [(str(cache_path), seed % 4) for seed in range(processos * 8)]
+    with Pool(processos) as pool:
+        results = pool.map(concurrent_job, jobs)
+    
+    expected = [float(synthetic_table.__wrapped__(seed)['valor_usd'].sum()) for _, seed in jobs]
+    orphans = list(Path(cache_path).glob('.*.tmp'))
+    return np.allclose(results, expected) and not orphans, len(jobs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--processos', type=int, default=8)
+    parser.add_argument('--worker', metavar='CACHE', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.worker:
+        worker(args.worker)
+        return
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        (frio_ms, _, frio_misses), (quente_ms, quente_hits, _) = cold_start(Path(tmp) / 'frio')
+        print(f"Partida a frio: cache vazio {frio_ms:7.1f} ms ({frio_misses} cálculos) | "
+              f"processo seguinte {quente_ms:7.1f} ms ({quente_hits} leituras do disco)")
+        
+        info, kept, survived = check_eviction(Path(tmp) / 'lru')
+        ok = info['bytes'] <= info['maximo_bytes'] and survived
+        print(f"Despejo LRU: {info['gravacoes']} gravações, {info['despejos']} despejos, {kept} entradas "
+              f"({info['bytes']} de {info['maximo_bytes']} bytes) | entrada mais usada mantida: "
+              f"{'ok ✅' if ok else 'FALHOU ❌'}")
+        
+        ok, num_jobs = check_concurrency(Path(tmp) / 'concorrencia', args.processos)
+        print(f"Concorrência: {num_jobs} chamadas em {args.processos} processos | "
+              f"{'resultados corretos, sem temporários ✅' if ok else 'FALHOU ❌'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark do cache de figuras do dashboard (`utils.figure_cache`).
+
+Para cada figura de DASHBOARD_FIGURES compara o builder chamado a cada
+rerun (agregação + construção da figura) com a leitura do JSON pré-gerado
+pelo ETL (primeira visita de um processo novo) e com o cache de processo
+(reruns seguintes), conferindo que a figura em cache é idêntica à do builder compactada.
+
+Uso:
+    python benchmarks/bench_figures.py [--repeat 5]
+"""
+import argparse
+import json
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Adicionar path para imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+import utils.figure_cache as figure_cache
+from utils.figure_cache import DASHBOARD_FIGURES, _file_source, clear_figure_cache, dashboard_figure, prebuild_figures
+from utils.figure_payload import compact_figure
+from utils.processed_store import PROCESSED_DATA_PATH
+
+
+def best_of(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    
+    # Sem runtime do Streamlit os caches avisam a cada chamada
+    logging.getLogger('streamlit').setLevel(logging.ERROR)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        figure_cache.FIGURES_PATH = Path(tmp)
+        prebuild_figures(PROCESSED_DATA_PATH, tmp)
+        
+        totals = [0.0, 0.0, 0.0]
+        for name, spec in DASHBOARD_FIGURES.items():
+            source = _file_source(spec['fonte'], PROCESSED_DATA_PATH)
+            
+            def build():
+                return spec['builder'](source, **spec['params'])
+            
+            def from_file():
+                clear_figure_cache()
+                return dashboard_figure(name)
+            
+            t_build = best_of(build, args.repeat)
+            t_file = best_of(from_file, args.repeat)
+            t_memory = best_of(lambda: dashboard_figure(name), args.repeat)
+            
+            identical = json.loads(dashboard_figure(name).to_json()) == json.loads(compact_figure(build()).to_json())
+            for i, value in enumerate((t_build, t_file, t_memory)):
+                totals[i] += value
+            
+            print(f"{name:<20}: builder {t_build:7.2f} ms | JSON pré-gerado {t_file:6.2f} ms | "
+                  f"cache de processo {t_memory:6.3f} ms | {'idêntico ✅' if identical else 'DIFERENTE ❌'}")
+        
+        print(f"{'Total':<20}: builder {totals[0]:7.2f} ms | JSON pré-gerado {totals[1]:6.2f} ms | "
+              f"cache de processo {totals[2]:6.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
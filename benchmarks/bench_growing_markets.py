@@ -0,0 +1,113 @@
+"""
+Benchmark de `identify_growing_markets`: laço por país vs cálculo vetorizado.
+
+Gera exportações sintéticas com milhares de destinos (cada um presente em
+parte dos anos, com tendência e ruído aleatórios), roda a implementação
+original (máscara + cópia + `calculate_cagr` por país) e a vetorizada
+(matriz país x ano) e verifica que o resultado é o mesmo.
+
+Uso:
+    python benchmarks/bench_growing_markets.py [--destinos 100 1000 5000] [--seed 42]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Adicionar path para imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.analytics import calculate_cagr, identify_growing_markets
+
+
+def legacy_identify_growing_markets(df_export, min_years=5, min_cagr=5):
+    """
+    Implementação original (um filtro por país), mantida como referência.
+    """
+    growing_markets = []
+    
+    for pais_id in df_export['pais_id'].unique():
+        df_pais = df_export[df_export['pais_id'] == pais_id].copy()
+        pais = df_pais['pais_destino'].iloc[0]
+        
+        if len(df_pais) < min_years:
+            continue
+        
+        cagr_valor = calculate_cagr(df_pais, 'valor_usd')
+        cagr_volume = calculate_cagr(df_pais, 'quantidade_litros')
+        
+        if cagr_valor >= min_cagr:
+            growing_markets.append({
+                'pais': pais,
+                'cagr_valor': cagr_valor,
+                'cagr_volume': cagr_volume,
+                'total_valor_usd': df_pais['valor_usd'].sum(),
+                'total_litros': df_pais['quantidade_litros'].sum(),
+                'anos_dados': len(df_pais)
+            })
+    
+    return pd.DataFrame(growing_markets).sort_values('cagr_valor', ascending=False)
+
+
+def synthetic_export(num_destinos, seed, year_start=2009, year_end=2023, fill=0.6):
+    """
+    Tabela long sintética no formato de `export_processed`.
+    """
+    rng = np.random.default_rng(seed)
+    anos = np.arange(year_start, year_end + 1)
+    
+    present = rng.random((num_destinos, len(anos))) < fill
+    base = rng.lognormal(mean=9, sigma=2, size=(num_destinos, 1))
+    trend = rng.normal(0.03, 0.15, size=(num_destinos, 1))
+    noise = rng.lognormal(0, 0.3, size=(num_destinos, len(anos)))
+    litros = np.maximum(1, base * np.exp(trend * np.arange(len(anos))) * noise).astype(np.int32)
+    preco = rng.lognormal(0.3, 0.5, size=(num_destinos, len(anos)))
+    
+    rows, cols = np.nonzero(present)
+    df = pd.DataFrame({
+        'pais_destino': pd.Categorical([f"Destino {i}" for i in rows]),
+        'pais_id': rows.astype(np.int16),
+        'ano': anos[cols].astype(np.int16),
+        'valor_usd': np.round(litros[rows, cols] * preco[rows, cols]),
+        'quantidade_litros': litros[rows, cols],
+    })
+    df['preco_medio_usd_litro'] = (df['valor_usd'] / df['quantidade_litros']).astype(np.float32)
+    
+    # Ordem do arquivo processado não é garantida: embaralhar
+    return df.sample(frac=1, random_state=seed).reset_index(drop=True)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--destinos', type=int, nargs='+', default=[100, 1000, 5000])
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+    
+    for num_destinos in args.destinos:
+        df = synthetic_export(num_destinos, args.seed)
+        
+        legacy, t_legacy = timed(legacy_identify_growing_markets, df)
+        grouped, t_grouped = timed(identify_growing_markets, df)
+        
+        pd.testing.assert_frame_equal(
+            legacy.reset_index(drop=True),
+            grouped.reset_index(drop=True),
+            check_dtype=False
+        )
+        
+        print(f"{num_destinos:>6} destinos ({len(df):>7} registros, {len(grouped):>5} em crescimento): "
+              f"laço {t_legacy:8.3f}s | vetorizado {t_grouped:7.4f}s | "
+              f"speedup {t_legacy / t_grouped:7.1f}x ✅")
+
+
+if __name__ == '__main__':
+    main()
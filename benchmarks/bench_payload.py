@@ -0,0 +1,99 @@
+"""
+Benchmark do payload das figuras enviadas ao navegador (`utils.figure_payload`).
+
+1. Figuras do dashboard: bytes do JSON de cada figura, direto do builder e
+   depois de `compact_figure`, com o total por página.
+2. Séries sintéticas no nível de produto (linhas longas e dispersões
+   com muitos pontos), em tamanhos crescentes: bytes antes/depois, tempo da
+   compactação e conferência de que a série reduzida mantém o primeiro e o
+   último ponto e o traçado dentro da faixa original.
+
+Uso:
+    python benchmarks/bench_payload.py [--pontos 10000 100000 1000000]
+"""
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+# Adicionar path para imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.figure_cache import DASHBOARD_FIGURES, _file_source
+from utils.figure_payload import compact_figure, payload_bytes
+from utils.processed_store import PROCESSED_DATA_PATH
+
+
+def dashboard_payloads():
+    rows = []
+    sources = {}
+    for name, spec in DASHBOARD_FIGURES.items():
+        if spec['fonte'] not in sources:
+            sources[spec['fonte']] = _file_source(spec['fonte'], PROCESSED_DATA_PATH)
+        fig = spec['builder'](sources[spec['fonte']], **spec['params'])
+        original = payload_bytes(fig)
+        rows.append({'pagina': spec['pagina'], 'figura': name, 'original': original,
+                     'compacta': payload_bytes(compact_figure(fig))})
+    return pd.DataFrame(rows)
+
+
+def synthetic_figures(num_pontos, seed):
+    """
+    Série temporal longa (linha) e dispersão produto x destino (marcadores).
+    """
+    rng = np.random.default_rng(seed)
+    datas = pd.date_range('1970-01-01', periods=num_pontos, freq='h')
+    volume = np.abs(np.cumsum(rng.normal(0, 1e4, num_pontos))) + rng.lognormal(12, 1, num_pontos)
+    line = go.Figure(go.Scatter(x=datas, y=volume / 1_000_000, mode='lines', name='Exportação'))
+    
+    grupos = pd.DataFrame({
+        'quantidade_litros': rng.lognormal(10, 2, num_pontos),
+        'preco_medio': rng.lognormal(1, 0.5, num_pontos),
+    })
+    scatter = px.scatter(grupos, x='quantidade_litros', y='preco_medio', color='preco_medio',
+                         render_mode='svg')
+    return line, scatter
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--pontos', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+    
+    # Sem runtime do Streamlit os caches avisam a cada chamada
+    logging.getLogger('streamlit').setLevel(logging.ERROR)
+    
+    report = dashboard_payloads()
+    for row in report.itertuples():
+        print(f"{row.pagina:<12} {row.figura:<20}: {row.original / 1024:8.1f} KiB -> {row.compacta / 1024:8.1f} KiB")
+    for pagina, total in report.groupby('pagina', sort=False)[['original', 'compacta']].sum().iterrows():
+        print(f"{'Total ' + pagina:<33}: {total['original'] / 1024:8.1f} KiB -> {total['compacta'] / 1024:8.1f} KiB")
+    
+    for num_pontos in args.pontos:
+        for label, fig in zip(['linha    ', 'dispersão'], synthetic_figures(num_pontos, args.seed)):
+            original = payload_bytes(fig)
+            y_min, y_max = np.min(fig.data[0].y), np.max(fig.data[0].y)
+            first, last = fig.data[0].y[0], fig.data[0].y[-1]
+            
+            start = time.perf_counter()
+            compact_figure(fig)
+            elapsed = (time.perf_counter() - start) * 1000
+            
+            trace = fig.data[0]
+            y = np.asarray(trace.y)
+            ok = (np.isclose(y[0], first, rtol=1e-6) and np.isclose(y[-1], last, rtol=1e-6)
+                  and y.min() >= y_min * (1 - 1e-6) and y.max() <= y_max * (1 + 1e-6))
+            print(f"{num_pontos:>8} pontos, {label}: {original / 1024:9.1f} KiB -> {payload_bytes(fig) / 1024:7.1f} KiB "
+                  f"({len(y)} pontos, {trace.type}) em {elapsed:7.1f} ms | "
+                  f"{'traçado preservado ✅' if ok else 'DIFERENTE ❌'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark de carga a frio dos dados processados: CSV vs colunar (Feather).
+
+Cada medição roda em um processo Python novo (carga a frio), importa e
+aquece pandas/pyarrow antes de cronometrar e mede tempo e RSS da leitura
+das três tabelas processadas.
+
+Uso:
+    python benchmarks/bench_processed_store.py [--repeat 5]
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+CHILD_CODE = r'''
+import json, sys, time
+sys.path.append({root!r})
+import pandas as pd
+import pyarrow.feather
+from utils.processed_store import PROCESSED_TABLES, read_processed_table, PROCESSED_DATA_PATH
+
+
+def rss_kb():
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1])
+    return 0
+
+
+mode = {mode!r}
+
+# Aquecimento: inicializa parsers e o memory pool do Arrow fora da medição
+import io
+warm = pd.DataFrame({{'a': [1, 2], 'b': ['x', 'y']}})
+pd.read_csv(io.StringIO(warm.to_csv(index=False)))
+buffer = io.BytesIO()
+warm.to_feather(buffer)
+pyarrow.feather.read_table(io.BytesIO(buffer.getvalue())).to_pandas()
+
+rss_before = rss_kb()
+start = time.perf_counter()
+if mode == 'csv':
+    frames = [pd.read_csv(PROCESSED_DATA_PATH / (t['arquivo'] + '.csv')) for t in PROCESSED_TABLES.values()]
+else:
+    frames = [read_processed_table(name) for name in PROCESSED_TABLES]
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    'tempo_ms': elapsed * 1000,
+    'rss_kb': rss_kb() - rss_before,
+    'frame_kb': sum(df.memory_usage(deep=True).sum() for df in frames) / 1024,
+}}))
+'''
+
+
+def run_child(mode):
+    code = CHILD_CODE.format(root=str(ROOT), mode=mode)
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5, help='Número de processos por formato')
+    args = parser.parse_args()
+    
+    for mode in ('csv', 'columnar'):
+        runs = [run_child(mode) for _ in range(args.repeat)]
+        tempo = statistics.median(r['tempo_ms'] for r in runs)
+        rss = statistics.median(r['rss_kb'] for r in runs)
+        frame = statistics.median(r['frame_kb'] for r in runs)
+        print(f"{mode:<9} carga a frio {tempo:7.2f} ms | Δ RSS {rss:8.0f} KB | "
+              f"frames (deep) {frame:7.1f} KB")
+
+
+if __name__ == '__main__':
+    main()
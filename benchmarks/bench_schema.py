@@ -0,0 +1,67 @@
+"""
+Benchmark de memória do registro de tipos (`utils.schema`).
+
+Lê cada tabela processada do CSV com os tipos padrão do pandas, aplica o
+schema compacto e compara o uso de memória (deep) antes e depois. Confere
+que os valores não mudam: mesmas colunas (exceto os aliases removidos),
+categorias iguais ao texto original e números iguais dentro da precisão
+do tipo declarado.
+
+Uso:
+    python benchmarks/bench_schema.py
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Adicionar path para imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.processed_store import PROCESSED_DATA_PATH, PROCESSED_TABLES
+from utils.schema import COLUMN_ALIASES, apply_schema, memory_report
+
+
+def same_values(before, after):
+    """
+    Confere que o schema só trocou os tipos (e removeu os aliases redundantes).
+    """
+    expected = [col for col in before.columns
+                if not (col in COLUMN_ALIASES and COLUMN_ALIASES[col] in before.columns)]
+    if list(after.columns) != expected:
+        return False
+    
+    for col in expected:
+        original, compact = before[col], after[col]
+        if isinstance(compact.dtype, pd.CategoricalDtype):
+            ok = (compact.astype(object).to_numpy() == original.to_numpy()).all()
+        elif compact.dtype == np.float32:
+            ok = np.allclose(compact.to_numpy(), original.to_numpy(), rtol=1e-6, equal_nan=True)
+        else:
+            ok = (compact.to_numpy() == original.to_numpy()).all()
+        if not ok:
+            return False
+    return True
+
+
+def main():
+    before = {
+        name: pd.read_csv(PROCESSED_DATA_PATH / f"{table['arquivo']}.csv")
+        for name, table in PROCESSED_TABLES.items()
+    }
+    after = {name: apply_schema(df, name) for name, df in before.items()}
+    
+    report = memory_report(before, after)
+    for row in report.itertuples():
+        ok = same_values(before[row.tabela], after[row.tabela])
+        print(f"{row.tabela:<16} {row.antes_kb:9.1f} KB -> {row.depois_kb:9.1f} KB "
+              f"(-{row.reducao_pct:5.1f}%) | {'idêntico ✅' if ok else 'DIFERENTE ❌'}")
+    
+    total_before, total_after = report['antes_kb'].sum(), report['depois_kb'].sum()
+    print(f"{'Total':<16} {total_before:9.1f} KB -> {total_after:9.1f} KB "
+          f"(-{(1 - total_after / total_before) * 100:5.1f}%)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+"""
+Benchmark do cache das tabelas processadas com várias sessões simultâneas.
+
+Simula N sessões (cada uma guarda as tabelas que recebeu, como durante um
+rerun) e compara o `st.cache_data` anterior, que desserializa uma cópia
+das três tabelas a cada acesso, com o handle compartilhado somente
+leitura de `load_processed_data` (`st.cache_resource`). Mede o tempo por
+rerun com o cache quente e a memória alocada por sessão (tracemalloc), e
+confere a invalidação quando o conteúdo dos dados muda.
+
+Uso:
+    python benchmarks/bench_sessions.py [--sessoes 50] [--reruns 5]
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import pandas as pd
+import streamlit as st
+
+# Adicionar path para imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.data_loader import load_processed_data, sort_by_year
+from utils.processed_store import (
+    PROCESSED_DATA_PATH, processed_files, read_processed_table, write_processed_table
+)
+
+
+@st.cache_data
+def legacy_load_processed_data():
+    """
+    Versão anterior (st.cache_data: uma cópia por acesso), como referência.
+    """
+    return tuple(
+        sort_by_year(read_processed_table(name, PROCESSED_DATA_PATH))
+        for name in ('export', 'import', 'comparacao')
+    )
+
+
+def simulate_sessions(loader, num_sessoes, reruns):
+    """
+    Retorna (ms por rerun, KiB alocados por sessão).
+    """
+    loader()  # aquecer o cache
+    
+    times = []
+    for _ in range(reruns):
+        start = time.perf_counter()
+        loader()
+        times.append(time.perf_counter() - start)
+    
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    sessions = [loader() for _ in range(num_sessoes)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    
+    del sessions
+    return min(times) * 1000, (after - before) / num_sessoes / 1024
+
+
+def check_invalidation():
+    """
+    Confere que só uma mudança de conteúdo gera uma nova versão: alterar o
+    mtime mantém o handle; regravar a tabela de exportação sem a última
+    linha o recarrega. Os arquivos originais são restaurados ao final.
+    """
+    paths = processed_files('export', PROCESSED_DATA_PATH)
+    originals = {path: (path.read_bytes(), path.stat()) for path in paths}
+    first = load_processed_data()
+    try:
+        for path, (_, stat) in originals.items():
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        touched = load_processed_data()
+        write_processed_table(read_processed_table('export', PROCESSED_DATA_PATH).iloc[:-1],
+                              'export', PROCESSED_DATA_PATH)
+        reloaded = load_processed_data()
+    finally:
+        for path, (content, stat) in originals.items():
+            path.write_bytes(content)
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    restored = load_processed_data()
+    return (touched[0] is first[0] and reloaded[0] is not first[0]
+            and len(reloaded[0]) == len(first[0]) - 1 and restored[0] is not reloaded[0])
+
+
+def check_read_only():
+    """
+    Confere que o handle compartilhado recusa alterar valores, incluir ou
+    remover colunas, e que `.copy()` devolve um DataFrame comum.
+    """
+    df_export = load_processed_data()[0]
+    columns = list(df_export.columns)
+    mutations = [
+        lambda: df_export['valor_usd'].to_numpy().__setitem__(0, 0),
+        lambda: df_export.__setitem__('coluna_nova', 0),
+        lambda: df_export.loc.__setitem__((slice(None), 'coluna_nova'), 0),
+        lambda: df_export.pop('valor_usd'),
+        lambda: df_export.rename(columns={'valor_usd': 'usd'}, inplace=True),
+    ]
+    
+    blocked = []
+    for mutation in mutations:
+        try:
+            mutation()
+            blocked.append(False)
+        except ValueError:
+            blocked.append(True)
+    
+    copy = df_export.copy()
+    copy['coluna_nova'] = 0
+    return all(blocked) and type(copy) is pd.DataFrame and list(df_export.columns) == columns
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sessoes', type=int, default=50)
+    parser.add_argument('--reruns', type=int, default=5)
+    args = parser.parse_args()
+    
+    # Sem runtime do Streamlit os caches avisam a cada chamada
+    logging.getLogger('streamlit').setLevel(logging.ERROR)
+    
+    for label, loader in [('cache_data (cópias)  ', legacy_load_processed_data),
+                          ('handle compartilhado', load_processed_data)]:
+        t_rerun, kib_sessao = simulate_sessions(loader, args.sessoes, args.reruns)
+        print(f"{label}: {t_rerun:7.3f} ms por rerun | {kib_sessao:8.1f} KiB por sessão "
+              f"({args.sessoes} sessões: {kib_sessao * args.sessoes / 1024:6.2f} MiB)")
+    
+    print(f"Handle somente leitura (valores e colunas): {'ok ✅' if check_read_only() else 'FALHOU ❌'}")
+    print(f"Invalidação por versão dos dados: {'ok ✅' if check_invalidation() else 'FALHOU ❌'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+Perfil de partida a frio: tempo de import por módulo do Home.py e de cada página.
+
+Para cada ponto de entrada, os imports de nível de módulo do script são
+executados em um processo novo com `python -X importtime` (várias vezes,
+ficando o menor tempo de cada módulo). Por padrão o `streamlit` é importado
+antes da medição, como no servidor, que já o tem carregado quando a
+primeira sessão abre a página.
+
+O relatório mostra, por ponto de entrada, o tempo total de import, os
+módulos importados diretamente (com o tempo acumulado de tudo que puxam)
+e o tempo próprio somado por pacote (pandas, numpy, plotly, utils...).
+
+Uso:
+    python benchmarks/bench_startup.py [--repeat 3] [--top 8] [--incluir-streamlit]
+"""
+import argparse
+import ast
+import subprocess
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).parent.parent
+
+ENTRY_POINTS = [ROOT / 'Home.py'] + sorted((ROOT / 'pages').glob('*.py'))
+
+_MARKER = '--inicio--'
+
+
+def entry_point_imports(path):
+    """
+    Código com os imports de nível de módulo de um script (sem executar a página).
+    """
+    tree = ast.parse(Path(path).read_text(encoding='utf-8'))
+    imports = [node for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+    return ast.unparse(ast.Module(body=imports, type_ignores=[]))
+
+
+def parse_importtime(stderr):
+    """
+    Linhas do `-X importtime` após o marcador -> DataFrame
+    (modulo | nivel | proprio_ms | acumulado_ms).
+    """
+    rows = []
+    for line in stderr.split(_MARKER, 1)[-1].splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        rows.append({
+            'modulo': name.strip(),
+            'nivel': (len(name) - len(name.lstrip()) - 1) // 2,
+            'proprio_ms': int(self_us) / 1000,
+            'acumulado_ms': int(cumulative_us) / 1000,
+        })
+    return pd.DataFrame(rows, columns=['modulo', 'nivel', 'proprio_ms', 'acumulado_ms'])
+
+
+def profile_imports(path, repeat, include_streamlit=False):
+    """
+    Tempo de import de um ponto de entrada.
+    
+    Returns:
+        tuple: (total em ms, DataFrame por módulo com o menor tempo entre as execuções)
+    """
+    preload = '' if include_streamlit else 'import streamlit\n'
+    code = f"import os\n{preload}os.write(2, {(_MARKER + chr(10)).encode()!r})\n{entry_point_imports(path)}"
+    
+    runs = []
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                                cwd=ROOT, capture_output=True, text=True, check=True)
+        runs.append(parse_importtime(result.stderr))
+    
+    total = min(run.loc[run['nivel'] == 0, 'acumulado_ms'].sum() for run in runs)
+    modules = pd.concat(runs).groupby('modulo', sort=False).agg(
+        nivel=('nivel', 'first'), proprio_ms=('proprio_ms', 'min'), acumulado_ms=('acumulado_ms', 'min')
+    ).reset_index()
+    return total, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--top', type=int, default=8, help='Módulos diretos listados por ponto de entrada')
+    parser.add_argument('--incluir-streamlit', action='store_true',
+                        help='Conta também o import do streamlit')
+    args = parser.parse_args()
+    
+    for path in ENTRY_POINTS:
+        total, modules = profile_imports(path, args.repeat, args.incluir_streamlit)
+        print(f"{path.relative_to(ROOT)}: {total:7.1f} ms de imports")
+        
+        direct = modules[modules['nivel'] == 0].nlargest(args.top, 'acumulado_ms')
+        for row in direct.itertuples():
+            print(f"    {row.modulo:<40} {row.acumulado_ms:7.1f} ms")
+        
+        packages = modules.groupby(modules['modulo'].str.split('.').str[0])['proprio_ms'].sum()
+        packages = packages.nlargest(args.top)
+        print("    por pacote: " + " | ".join(f"{name} {ms:.1f} ms" for name, ms in packages.items()))
+
+
+if __name__ == '__main__':
+    main()
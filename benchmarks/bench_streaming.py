@@ -0,0 +1,102 @@
+"""
+Benchmark do ETL de exportação em memória vs streaming (em blocos).
+
+Gera versões ampliadas de `Exportacao.csv` (linhas replicadas com países
+renomeados), processa cada uma pelos dois caminhos e confere que a saída é
+idêntica: CSV byte a byte e Feather com o mesmo DataFrame (o arquivo em
+streaming tem vários record batches). Tempo e pico de memória (tracemalloc)
+são medidos em execuções separadas, pois o tracemalloc distorce o tempo.
+
+Uso:
+    python benchmarks/bench_streaming.py [--scales 10 100 1000] [--chunksize 5000]
+"""
+import argparse
+import filecmp
+import logging
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+# Adicionar path para imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.data_processing import process_export_data, process_trade_data_chunked, sort_trade_table
+from utils.processed_store import processed_files, read_processed_table, write_processed_table
+from utils.raw_data import RAW_DATA_PATH, RAW_SCHEMAS, read_raw_dataset
+
+
+def write_scaled_raw(raw_dir, scale):
+    """
+    Grava em `raw_dir` um Exportacao.csv com as linhas replicadas `scale` vezes.
+    """
+    source = RAW_DATA_PATH / RAW_SCHEMAS['exportacao']['arquivo']
+    header, *lines = source.read_text(encoding='utf-8').splitlines()
+    
+    with open(raw_dir / source.name, 'w', encoding='utf-8') as f:
+        f.write(header + '\n')
+        for k in range(scale):
+            for line in lines:
+                row_id, pais, rest = line.split(';', 2)
+                f.write(f"{row_id};{pais} #{k};{rest}\n")
+
+
+def measure(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    elapsed = time.perf_counter() - start
+    
+    tracemalloc.start()
+    func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    return elapsed, peak / 1024 / 1024
+
+
+def in_memory(raw_dir, out_dir):
+    df_export = process_export_data(read_raw_dataset('exportacao', raw_dir))
+    write_processed_table(sort_trade_table(df_export), 'export', out_dir)
+
+
+def streaming(raw_dir, out_dir, chunksize):
+    process_trade_data_chunked('export', raw_dir, out_dir, chunksize)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scales', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--chunksize', type=int, default=5000, help='Linhas brutas por bloco')
+    args = parser.parse_args()
+    
+    # Os países replicados ('País #k') não estão na dimensão: sem um aviso por bloco
+    logging.getLogger('utils.countries').setLevel(logging.ERROR)
+    
+    for scale in args.scales:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            raw_dir, mem_dir, stream_dir = tmp / 'raw', tmp / 'mem', tmp / 'stream'
+            for path in (raw_dir, mem_dir, stream_dir):
+                path.mkdir()
+            
+            write_scaled_raw(raw_dir, scale)
+            size_mb = (raw_dir / 'Exportacao.csv').stat().st_size / 1024 / 1024
+            
+            t_mem, peak_mem = measure(in_memory, raw_dir, mem_dir)
+            t_stream, peak_stream = measure(streaming, raw_dir, stream_dir, args.chunksize)
+            
+            identical = filecmp.cmp(
+                processed_files('export', mem_dir)[0],
+                processed_files('export', stream_dir)[0],
+                shallow=False
+            ) and read_processed_table('export', mem_dir).equals(read_processed_table('export', stream_dir))
+            
+            print(f"{scale:>5}x ({size_mb:7.1f} MB): "
+                  f"memória {t_mem:6.2f}s / pico {peak_mem:7.1f} MB | "
+                  f"streaming {t_stream:6.2f}s / pico {peak_stream:7.1f} MB | "
+                  f"{'idêntico ✅' if identical else 'DIFERENTE ❌'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,244 @@
+"""
+Suíte de benchmarks em escala das funções de processamento e análise.
+
+Cronometra as funções de `utils.data_processing`, `utils.analytics` e
+`utils.data_loader` usadas pelo ETL e pelas páginas com os dados atuais
+replicados 1x, 10x, 100x e 1000x. Os arquivos brutos são replicados
+linha a linha. Nas tabelas processadas, cada cópia recebe novos pais_id,
+então o número de países cresce com a escala. Registra o tempo (melhor
+de N execuções) e o pico de memória alocada (tracemalloc, em uma
+execução separada).
+
+Os resultados vão para um JSON (por padrão em benchmarks/results/). Com
+`--comparar`, cada (função, escala) é confrontada com um baseline
+gravado antes. Tempo ou memória acima da tolerância é marcado como
+regressão, e o processo sai com código 1 (uso em CI).
+
+Uso:
+    python benchmarks/bench_suite.py [--escalas 1 10 100 1000] [--funcoes get_top_countries ...]
+    python benchmarks/bench_suite.py --comparar baseline.json [--tolerancia 0.2]
+    python benchmarks/bench_suite.py --comparar baseline.json --resultado atual.json
+"""
+import argparse
+import json
+import logging
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Adicionar path para imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.analytics import TRADE_TABLES, create_comparison_table, identify_growing_markets, segment_countries_by_price
+from utils.data_loader import calculate_market_concentration, get_top_countries, get_yearly_trends
+from utils.data_processing import process_export_data, process_import_data
+from utils.processed_store import read_processed_table
+from utils.raw_data import read_raw_dataset
+
+RESULTS_PATH = Path(__file__).parent / 'results'
+
+# Funções medidas: nome -> entradas usadas e chamada
+SUITE = {
+    'process_export_data': {
+        'entradas': ['bruto_export'],
+        'chamada': lambda d: process_export_data(d['bruto_export']),
+    },
+    'process_import_data': {
+        'entradas': ['bruto_import'],
+        'chamada': lambda d: process_import_data(d['bruto_import']),
+    },
+    'create_comparison_table': {
+        'entradas': ['export', 'import'],
+        'chamada': lambda d: create_comparison_table(d['export'], d['import']),
+    },
+    'identify_growing_markets': {
+        'entradas': ['export'],
+        'chamada': lambda d: identify_growing_markets(d['export'], min_years=5, min_cagr=5),
+    },
+    'segment_countries_by_price': {
+        'entradas': ['export'],
+        'chamada': lambda d: segment_countries_by_price(d['export']),
+    },
+    'get_top_countries': {
+        'entradas': ['export'],
+        'chamada': lambda d: get_top_countries(d['export'], n=15),
+    },
+    'calculate_market_concentration': {
+        'entradas': ['export'],
+        'chamada': lambda d: calculate_market_concentration(d['export'], 2015, 2023),
+    },
+    'get_yearly_trends': {
+        'entradas': ['export'],
+        'chamada': lambda d: get_yearly_trends(d['export']),
+    },
+}
+
+# Abaixo disso a diferença é ruído de medição, não regressão
+MIN_DELTA_MS = 1.0
+MIN_DELTA_MIB = 0.5
+
+
+def scaled_raw(dataset, scale):
+    df = read_raw_dataset(dataset)
+    return pd.concat([df] * scale, ignore_index=True) if scale > 1 else df
+
+
+def scaled_processed(table, scale):
+    """
+    Tabela processada replicada; cada cópia com pais_id deslocado (países novos).
+    """
+    df = read_processed_table(table)
+    country_col = TRADE_TABLES[table][1]
+    if scale == 1:
+        return df
+    frames = []
+    for k in range(scale):
+        df_k = df.copy()
+        df_k['pais_id'] = (df_k['pais_id'].astype(np.int32) + k * 1000).astype(np.int32)
+        if k:
+            # Países novos: nome e chave distintos em cada cópia (o cubo exige 1:1)
+            df_k[country_col] = df_k[country_col].astype(str) + f" #{k}"
+        frames.append(df_k)
+    return pd.concat(frames, ignore_index=True)
+
+
+INPUTS = {
+    'bruto_export': lambda scale: scaled_raw('exportacao', scale),
+    'bruto_import': lambda scale: scaled_raw('importacao', scale),
+    'export': lambda scale: scaled_processed('export', scale),
+    'import': lambda scale: scaled_processed('import', scale),
+}
+
+
+def best_of(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def peak_memory(func):
+    """
+    Pico de memória alocada durante a chamada (MiB).
+    """
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024 / 1024
+
+
+def environment():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=Path(__file__).parent,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'plataforma': platform.platform(),
+        'commit': commit,
+    }
+
+
+def run_suite(scales, functions, repeat):
+    results = []
+    for scale in scales:
+        needed = {name for func in functions for name in SUITE[func]['entradas']}
+        inputs = {name: INPUTS[name](scale) for name in sorted(needed)}
+        
+        for func in functions:
+            spec = SUITE[func]
+            
+            def call():
+                return spec['chamada'](inputs)
+            
+            tempo_ms = best_of(call, repeat)
+            pico_mib = peak_memory(call)
+            linhas = sum(len(inputs[name]) for name in spec['entradas'])
+            results.append({'funcao': func, 'escala': scale, 'linhas': linhas,
+                            'tempo_ms': round(tempo_ms, 3), 'pico_mib': round(pico_mib, 3)})
+            print(f"{func:<32} {scale:>5}x ({linhas:>9} linhas): {tempo_ms:10.2f} ms | pico {pico_mib:9.2f} MiB")
+    return results
+
+
+def compare(baseline, current, tolerance):
+    """
+    Compara resultados por (função, escala).
+    
+    Returns:
+        int: Número de regressões
+    """
+    base = {(row['funcao'], row['escala']): row for row in baseline['resultados']}
+    regressions = 0
+    for row in current['resultados']:
+        ref = base.get((row['funcao'], row['escala']))
+        if ref is None:
+            continue
+        
+        slower = (row['tempo_ms'] > ref['tempo_ms'] * (1 + tolerance)
+                  and row['tempo_ms'] - ref['tempo_ms'] > MIN_DELTA_MS)
+        bigger = (row['pico_mib'] > ref['pico_mib'] * (1 + tolerance)
+                  and row['pico_mib'] - ref['pico_mib'] > MIN_DELTA_MIB)
+        regressions += slower or bigger
+        
+        status = 'REGRESSÃO ❌' if slower or bigger else 'ok ✅'
+        print(f"{row['funcao']:<32} {row['escala']:>5}x: "
+              f"tempo {ref['tempo_ms']:10.2f} -> {row['tempo_ms']:10.2f} ms "
+              f"({row['tempo_ms'] / ref['tempo_ms'] - 1:+7.1%}) | "
+              f"pico {ref['pico_mib']:8.2f} -> {row['pico_mib']:8.2f} MiB | {status}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--escalas', type=int, nargs='+', default=[1, 10, 100, 1000])
+    parser.add_argument('--funcoes', nargs='+', choices=list(SUITE), default=list(SUITE))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--saida', type=Path, default=None,
+                        help='JSON de resultados (padrão: benchmarks/results/suite-<data>.json)')
+    parser.add_argument('--comparar', type=Path, metavar='BASELINE', help='JSON de baseline para comparar')
+    parser.add_argument('--resultado', type=Path, help='Com --comparar: usa este JSON em vez de rodar a suíte')
+    parser.add_argument('--tolerancia', type=float, default=0.2, help='Aumento relativo aceito (0.2 = 20%%)')
+    args = parser.parse_args()
+    
+    # Sem runtime do Streamlit os caches avisam a cada chamada
+    logging.getLogger('streamlit').setLevel(logging.ERROR)
+    
+    if args.resultado:
+        current = json.loads(args.resultado.read_text(encoding='utf-8'))
+    else:
+        current = {
+            'data': datetime.now().isoformat(timespec='seconds'),
+            'ambiente': environment(),
+            'repeat': args.repeat,
+            'resultados': run_suite(args.escalas, args.funcoes, args.repeat),
+        }
+        output = args.saida or RESULTS_PATH / f"suite-{datetime.now():%Y%m%d-%H%M%S}.json"
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(current, indent=2, ensure_ascii=False), encoding='utf-8')
+        print(f"💾 Resultados salvos em {output}")
+    
+    if args.comparar:
+        baseline = json.loads(args.comparar.read_text(encoding='utf-8'))
+        regressions = compare(baseline, current, args.tolerancia)
+        print(f"{'❌' if regressions else '✅'} {regressions} regressão(ões) "
+              f"(tolerância {args.tolerancia:.0%}, baseline {baseline.get('data')})")
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
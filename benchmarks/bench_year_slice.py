@@ -0,0 +1,81 @@
+"""
+Benchmark do recorte por intervalo de anos: máscaras + cópia vs busca binária.
+
+Replica `export_processed` com `pais_id` deslocados, ordena por ano (como
+`load_processed_data`) e mede, para cada escala, o filtro original (duas
+máscaras booleanas e `.copy()`) e `filter_by_year_range` (bloco contíguo
+localizado por busca binária) em um intervalo parcial e no intervalo
+completo.
+
+Uso:
+    python benchmarks/bench_year_slice.py [--scales 1 10 100 1000] [--repeat 50]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Adicionar path para imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.data_loader import filter_by_year_range, sort_by_year
+from utils.processed_store import read_processed_table
+
+
+def legacy_filter_by_year_range(df, year_start, year_end):
+    """
+    Implementação original, mantida como referência.
+    """
+    return df[(df['ano'] >= year_start) & (df['ano'] <= year_end)].copy()
+
+
+def scaled_export(scale):
+    df = read_processed_table('export')
+    frames = []
+    for k in range(scale):
+        df_k = df.copy()
+        df_k['pais_id'] = (df_k['pais_id'].astype(np.int32) + k * 200).astype(np.int32)
+        if k:
+            # Países novos: nome e chave distintos em cada cópia (o cubo exige 1:1)
+            df_k['pais_destino'] = df_k['pais_destino'].astype(str) + f" #{k}"
+        frames.append(df_k)
+    return sort_by_year(pd.concat(frames, ignore_index=True))
+
+
+def best_of(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 100, 1000])
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--anos', type=int, nargs=2, default=[2015, 2019], help='Intervalo parcial')
+    args = parser.parse_args()
+    year_start, year_end = args.anos
+    
+    for scale in args.scales:
+        df = scaled_export(scale)
+        ano_min, ano_max = int(df['ano'].min()), int(df['ano'].max())
+        
+        for label, (start, end) in [('parcial ', (year_start, year_end)), ('completo', (ano_min, ano_max))]:
+            t_legacy = best_of(lambda: legacy_filter_by_year_range(df, start, end), args.repeat)
+            t_block = best_of(lambda: filter_by_year_range(df, start, end), args.repeat)
+            
+            identical = legacy_filter_by_year_range(df, start, end).equals(filter_by_year_range(df, start, end))
+            
+            print(f"{scale:>5}x ({len(df):>8} registros) {label}: "
+                  f"máscara+cópia {t_legacy:8.3f} ms | bloco {t_block:7.3f} ms | "
+                  f"speedup {t_legacy / t_block:8.1f}x | {'idêntico ✅' if identical else 'DIFERENTE ❌'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+"""
+Resumo dos traces de rerun das páginas (`utils.tracing`): spans mais lentos.
+
+Lê um ou mais arquivos de trace (por padrão, todos em data/traces/),
+reconstrói o aninhamento dos spans (contenção no tempo dentro de cada
+thread) e agrega por span: chamadas, reruns em que aparece, tempo total,
+médio, p95 e máximo, e o tempo próprio (sem os spans filhos). Lista também
+a duração dos reruns por página e quantos foram interrompidos (st.stop(),
+interação do usuário durante o rerun ou erro).
+
+Para gerar traces: `WINE_TRACE=1 streamlit run Home.py` e navegue pelas
+páginas; cada processo grava data/traces/trace-<data>-<pid>.json.
+
+Uso:
+    python benchmarks/trace_report.py [arquivos ...] [--top 20] [--ordenar p95_ms] [--categoria secao]
+"""
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Adicionar path para imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.tracing import TRACE_PATH, read_trace
+
+SORT_COLUMNS = ['total_ms', 'medio_ms', 'p95_ms', 'max_ms', 'proprio_ms']
+
+
+def load_spans(paths):
+    """
+    Spans completos ('X') dos arquivos, com tempo próprio e rerun de origem.
+    
+    Returns:
+        pd.DataFrame: name | cat | ts | dur | pid | tid | erro | proprio | rerun
+    """
+    events = [event for path in paths for event in read_trace(path) if event.get('ph') == 'X']
+    spans = pd.DataFrame(events, columns=['name', 'cat', 'ts', 'dur', 'pid', 'tid'])
+    spans['erro'] = [event.get('args', {}).get('erro') for event in events]
+    if spans.empty:
+        return spans.assign(proprio=[], rerun=[])
+    
+    # Pai antes dos filhos: início crescente e, no mesmo início, o mais longo primeiro
+    spans = spans.sort_values(['pid', 'tid', 'ts', 'dur'], ascending=[True, True, True, False],
+                              ignore_index=True)
+    own = spans['dur'].to_numpy(dtype=np.int64).copy()
+    rerun = np.full(len(spans), -1, dtype=np.int64)
+    
+    stack = []
+    previous_thread = None
+    for i, row in enumerate(spans.itertuples(index=False)):
+        thread = (row.pid, row.tid)
+        if thread != previous_thread:
+            stack, previous_thread = [], thread
+        while stack and row.ts >= stack[-1][1]:
+            stack.pop()
+        if stack:
+            own[stack[-1][0]] -= row.dur
+            rerun[i] = rerun[stack[-1][0]]
+        if row.cat == 'rerun':
+            rerun[i] = i
+        stack.append((i, row.ts + row.dur))
+    
+    return spans.assign(proprio=own, rerun=rerun)
+
+
+def summarize(spans):
+    """
+    Agregado por (categoria, span), em ms.
+    """
+    grouped = spans.groupby(['cat', 'name'])
+    summary = grouped.agg(
+        chamadas=('dur', 'size'),
+        reruns=('rerun', lambda r: r[r >= 0].nunique()),
+        total_ms=('dur', 'sum'),
+        medio_ms=('dur', 'mean'),
+        p95_ms=('dur', lambda d: np.percentile(d, 95)),
+        max_ms=('dur', 'max'),
+        proprio_ms=('proprio', 'sum'),
+    ).reset_index()
+    
+    columns = ['total_ms', 'medio_ms', 'p95_ms', 'max_ms', 'proprio_ms']
+    summary[columns] = summary[columns] / 1000
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('arquivos', nargs='*', type=Path,
+                        help='Arquivos de trace (padrão: data/traces/*.json)')
+    parser.add_argument('--top', type=int, default=20, help='Spans listados')
+    parser.add_argument('--ordenar', choices=SORT_COLUMNS, default='p95_ms')
+    parser.add_argument('--categoria', help="Só spans desta categoria ('secao', 'agregacao', 'funcao', 'grafico'...)")
+    args = parser.parse_args()
+    
+    paths = args.arquivos or sorted(TRACE_PATH.glob('*.json'))
+    if not paths:
+        print(f"❌ Nenhum trace em {TRACE_PATH} (rode o app com WINE_TRACE=1)")
+        sys.exit(1)
+    
+    spans = load_spans(paths)
+    reruns = spans[spans['cat'] == 'rerun']
+    print(f"📂 {len(paths)} arquivo(s), {len(reruns)} rerun(s), {len(spans)} spans")
+    
+    print("\n⏱️ Reruns por página")
+    for name, page_reruns in reruns.groupby('name'):
+        durations = page_reruns['dur'] / 1000
+        print(f"    {name:<40} {len(durations):>5}x | médio {durations.mean():8.1f} ms | "
+              f"p95 {np.percentile(durations, 95):8.1f} ms | máx {durations.max():8.1f} ms | "
+              f"{page_reruns['erro'].notna().sum():>4} interrompido(s)")
+    
+    summary = summarize(spans[spans['cat'] != 'rerun'])
+    if args.categoria:
+        summary = summary[summary['cat'] == args.categoria]
+    
+    print(f"\n🐢 Spans mais lentos (por {args.ordenar})")
+    print(f"    {'categoria':<8} {'span':<55} {'chamadas':>8} {'reruns':>6} "
+          f"{'total':>9} {'médio':>8} {'p95':>8} {'máx':>8} {'próprio':>9}")
+    for row in summary.nlargest(args.top, args.ordenar).itertuples():
+        print(f"    {row.cat:<8} {row.name[:55]:<55} {row.chamadas:>8} {row.reruns:>6} "
+              f"{row.total_ms:9.1f} {row.medio_ms:8.2f} {row.p95_ms:8.2f} {row.max_ms:8.2f} {row.proprio_ms:9.1f}")
+
+
+if __name__ == '__main__':
+    main()
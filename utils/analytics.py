@@ -0,0 +1,169 @@
+"""
+Análises sobre as tabelas processadas (comparação anual, CAGR, mercados em
+crescimento, segmentação por preço), sem as dependências do ETL
+"""
+import numpy as np
+import pandas as pd
+
+from utils.cube import as_trade_cube, country_totals
+from utils.growth import market_growth
+from utils.instrumentation import instrumented
+
+
+# Tabelas de comércio exterior: dataset bruto e coluna de país
+TRADE_TABLES = {
+    'export': ('exportacao', 'pais_destino'),
+    'import': ('importacao', 'pais_origem'),
+}
+
+
+def _yearly_totals(data, country_col):
+    """
+    Litros e USD por ano (só anos com dados) de uma tabela long, cubo ou matriz.
+    """
+    if isinstance(data, pd.DataFrame):
+        return data.groupby('ano').agg({
+            'quantidade_litros': 'sum',
+            'valor_usd': 'sum'
+        }).reset_index()
+    
+    por_ano = as_trade_cube(data, country_col)['por_ano']
+    return por_ano[['ano', 'quantidade_litros', 'valor_usd']].copy()
+
+
+@instrumented
+def create_comparison_table(df_export, df_import):
+    """
+    Cria tabela comparativa entre exportação e importação por ano.
+    
+    Args:
+        df_export: DataFrame de exportações processado, cubo ou CountryYearMatrix
+        df_import: DataFrame de importações processado, cubo ou CountryYearMatrix
+        
+    Returns:
+        DataFrame: Tabela comparativa
+    """
+    # Agregação por ano - Exportação
+    export_yearly = _yearly_totals(df_export, 'pais_destino')
+    export_yearly.columns = ['ano', 'exp_litros', 'exp_usd']
+    
+    # Agregação por ano - Importação
+    import_yearly = _yearly_totals(df_import, 'pais_origem')
+    import_yearly.columns = ['ano', 'imp_litros', 'imp_usd']
+    
+    # Merge
+    comparacao = export_yearly.merge(import_yearly, on='ano', how='outer').fillna(0)
+    
+    # Calcular balanças
+    comparacao['balanca_litros'] = comparacao['exp_litros'] - comparacao['imp_litros']
+    comparacao['balanca_usd'] = comparacao['exp_usd'] - comparacao['imp_usd']
+    
+    # Preços médios
+    comparacao['preco_medio_exp'] = comparacao['exp_usd'] / comparacao['exp_litros']
+    comparacao['preco_medio_imp'] = comparacao['imp_usd'] / comparacao['imp_litros']
+    
+    # Diferença percentual de preços
+    comparacao['diferenca_preco_pct'] = (
+        (comparacao['preco_medio_imp'] / comparacao['preco_medio_exp'] - 1) * 100
+    )
+    
+    return comparacao
+
+
+@instrumented
+def calculate_cagr(df, value_col, year_col='ano'):
+    """
+    Calcula CAGR (Compound Annual Growth Rate) para uma série temporal.
+    
+    Args:
+        df: DataFrame com dados temporais
+        value_col: Nome da coluna de valores
+        year_col: Nome da coluna de anos
+        
+    Returns:
+        float: CAGR em percentual
+    """
+    df_sorted = df.sort_values(year_col)
+    
+    initial_value = df_sorted[value_col].iloc[0]
+    final_value = df_sorted[value_col].iloc[-1]
+    num_years = df_sorted[year_col].iloc[-1] - df_sorted[year_col].iloc[0]
+    
+    if initial_value == 0 or num_years == 0:
+        return 0
+    
+    cagr = (np.power(final_value / initial_value, 1 / num_years) - 1) * 100
+    
+    return cagr
+
+
+@instrumented
+def identify_growing_markets(df_export, min_years=5, min_cagr=5):
+    """
+    Identifica mercados com crescimento consistente.
+    
+    O CAGR de valor e de volume de todos os países é calculado de uma vez
+    sobre as matrizes país x ano do cubo (`utils.growth.market_growth`),
+    entre o primeiro e o último ano com dados de cada país.
+    
+    Args:
+        df_export: DataFrame de exportações ou cubo (`utils.cube`)
+        min_years: Mínimo de anos com dados
+        min_cagr: CAGR mínimo para considerar (%)
+        
+    Returns:
+        DataFrame: Países com crescimento identificado
+    """
+    cube = as_trade_cube(df_export)
+    por_pais = cube['por_pais']
+    
+    # Linhas do cubo e de por_pais estão na mesma ordem (pais_id)
+    valor = market_growth(cube, 'valor_usd')
+    volume = market_growth(cube, 'quantidade_litros')
+    
+    df_growing = pd.DataFrame({
+        'pais': por_pais[cube['country_col']].to_numpy(),
+        # Como em calculate_cagr: 0 quando só há um ano
+        'cagr_valor': valor['cagr_lacunas'].fillna(0).to_numpy(),
+        'cagr_volume': volume['cagr_lacunas'].fillna(0).to_numpy(),
+        'total_valor_usd': por_pais['valor_usd'].to_numpy(),
+        'total_litros': por_pais['quantidade_litros'].to_numpy(),
+        'anos_dados': por_pais['anos_dados'].to_numpy()
+    })
+    
+    # Filtrar países com dados suficientes e crescimento mínimo
+    df_growing = df_growing[
+        (df_growing['anos_dados'] >= min_years) & (df_growing['cagr_valor'] >= min_cagr)
+    ]
+    df_growing = df_growing.sort_values('cagr_valor', ascending=False)
+    
+    return df_growing
+
+
+@instrumented
+def segment_countries_by_price(df_export, low_threshold=1.5, high_threshold=3.0):
+    """
+    Segmenta países por faixa de preço médio.
+    
+    Args:
+        df_export: DataFrame de exportações ou cubo (`utils.cube`)
+        low_threshold: Limite inferior (USD/L)
+        high_threshold: Limite superior (USD/L)
+        
+    Returns:
+        dict: Países segmentados por faixa
+    """
+    pais_preco = country_totals(as_trade_cube(df_export))[['pais_destino', 'pais_id', 'valor_usd', 'quantidade_litros']]
+    
+    pais_preco['preco_medio'] = pais_preco['valor_usd'] / pais_preco['quantidade_litros']
+    
+    segments = {
+        'baixo': pais_preco[pais_preco['preco_medio'] < low_threshold]['pais_destino'].tolist(),
+        'medio': pais_preco[
+            (pais_preco['preco_medio'] >= low_threshold) & 
+            (pais_preco['preco_medio'] < high_threshold)
+        ]['pais_destino'].tolist(),
+        'alto': pais_preco[pais_preco['preco_medio'] >= high_threshold]['pais_destino'].tolist()
+    }
+    
+    return segments, pais_preco
@@ -0,0 +1,144 @@
+"""
+Métricas de concentração de mercado (HHI, top-k, Gini, Theil) por janela de anos
+"""
+import numpy as np
+import pandas as pd
+
+from utils.cube import as_trade_cube, year_range_slice
+
+
+# Tamanhos de top-k calculados por padrão
+TOP_K = (5, 10)
+
+
+def concentration_metrics(totals, top_k=TOP_K):
+    """
+    Calcula as métricas de concentração de várias distribuições de uma vez.
+    
+    Cada coluna de `totals` é uma distribuição (ex.: valor por país numa
+    janela de anos). Gini e Theil consideram só os países com valor > 0 na
+    coluna; HHI e top-k não dependem dos zeros. Colunas sem nenhum valor
+    ficam NaN.
+    
+    Args:
+        totals: Array 1D (países) ou 2D (países x distribuições), valores >= 0
+        top_k: Tamanhos de top-k (participação % dos k maiores)
+        
+    Returns:
+        dict: hhi | top{k}_pct | gini | theil | num_paises, cada um com um
+            valor por coluna (escalares se `totals` é 1D)
+    """
+    values = np.asarray(totals, dtype=np.float64)
+    single = values.ndim == 1
+    if single:
+        values = values[:, None]
+    num_rows = values.shape[0]
+    
+    total = values.sum(axis=0)
+    positive = values > 0
+    n = positive.sum(axis=0)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        shares = values / total
+        metrics = {'hhi': (shares ** 2).sum(axis=0) * 10000}
+        
+        # Uma ordenação serve ao top-k e ao Gini
+        ascending = np.sort(values, axis=0)
+        
+        # Participação acumulada dos maiores (linha i = soma dos i maiores)
+        top_shares = np.cumsum(np.vstack([np.zeros_like(total), ascending[::-1][:max(top_k, default=0)] / total]), axis=0)
+        for k in top_k:
+            metrics[f'top{k}_pct'] = top_shares[min(k, num_rows)] * 100
+        
+        # Gini: G = 2 * sum(r * x) / (n * sum(x)) - (n + 1) / n, com r = posto
+        # entre os positivos; os zeros ocupam as primeiras posições da ordem
+        positions = np.arange(1, num_rows + 1)[:, None]
+        weighted = (positions * ascending).sum(axis=0) - (num_rows - n) * total
+        metrics['gini'] = 2 * weighted / (n * total) - (n + 1) / n
+        
+        # Theil: T = sum(s * ln(s * n)) sobre os positivos
+        metrics['theil'] = np.where(positive, shares * np.log(shares * n), 0).sum(axis=0)
+    
+    empty = total <= 0
+    for name in metrics:
+        metrics[name] = np.where(empty, np.nan, metrics[name])
+    metrics['num_paises'] = n
+    
+    if single:
+        return {name: value[0].item() for name, value in metrics.items()}
+    return metrics
+
+
+def window_totals(cube, year_start=None, year_end=None, measure='valor_usd'):
+    """
+    Total de cada país numa janela de anos, pelas somas acumuladas do cubo
+    (O(países), sem reler os registros).
+    
+    Returns:
+        ndarray: Um valor por país, na ordem de `cube['pais_ids']`
+    """
+    i, j = year_range_slice(cube, year_start, year_end)
+    acumulado = cube['acumulado'][measure]
+    return acumulado[:, j] - acumulado[:, i]
+
+
+def concentration(data, year_start=None, year_end=None, measure='valor_usd', top_k=TOP_K):
+    """
+    Concentração dos destinos numa janela [year_start, year_end].
+    
+    Args:
+        data: Cubo (`get_trade_cube`), CountryYearMatrix ou DataFrame processado
+        year_start: Ano inicial (inclusivo); None = primeiro ano
+        year_end: Ano final (inclusivo); None = último ano
+        measure: 'valor_usd' ou 'quantidade_litros'
+        top_k: Tamanhos de top-k
+        
+    Returns:
+        dict: hhi | top{k}_pct | gini | theil | num_paises
+    """
+    cube = as_trade_cube(data)
+    return concentration_metrics(window_totals(cube, year_start, year_end, measure), top_k)
+
+
+def rolling_concentration(data, window_lengths=None, measure='valor_usd', top_k=TOP_K):
+    """
+    Série de concentração para todas as janelas deslizantes de cada tamanho.
+    
+    Todas as janelas são resolvidas em uma única indexação das somas
+    acumuladas (países x janelas) e as métricas saem de uma única chamada
+    vetorizada de `concentration_metrics`.
+    
+    Args:
+        data: Cubo (`get_trade_cube`), CountryYearMatrix ou DataFrame processado
+        window_lengths: Tamanhos de janela em anos; None = todos (1 até o
+            número de anos do cubo)
+        measure: 'valor_usd' ou 'quantidade_litros'
+        top_k: Tamanhos de top-k
+        
+    Returns:
+        DataFrame: janela | ano_inicial | ano_final | hhi | top{k}_pct |
+            gini | theil | num_paises, uma linha por janela
+    """
+    cube = as_trade_cube(data)
+    anos = cube['anos']
+    num_years = len(anos)
+    if window_lengths is None:
+        window_lengths = range(1, num_years + 1)
+    lengths = np.array([length for length in window_lengths if 1 <= length <= num_years], dtype=np.int64)
+    
+    # Posições [inicio, fim) de cada janela nas somas acumuladas: para cada
+    # tamanho, os inícios vão de 0 a num_years - tamanho
+    counts = num_years - lengths + 1
+    sizes = np.repeat(lengths, counts)
+    starts = np.arange(len(sizes)) - np.repeat(np.cumsum(counts) - counts, counts)
+    ends = starts + sizes
+    
+    acumulado = cube['acumulado'][measure]
+    metrics = concentration_metrics(acumulado[:, ends] - acumulado[:, starts], top_k)
+    
+    return pd.DataFrame({
+        'janela': sizes,
+        'ano_inicial': anos[starts],
+        'ano_final': anos[ends - 1],
+        **metrics,
+    })
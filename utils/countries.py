@@ -0,0 +1,197 @@
+"""
+Dimensão canônica de países, compartilhada por exportação e importação
+"""
+import hashlib
+import logging
+import re
+import sys
+import unicodedata
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+logger = logging.getLogger(__name__)
+
+COUNTRY_DIMENSION_PATH = Path(__file__).parent.parent / 'data' / 'reference' / 'paises.csv'
+
+# Nomes fora da dimensão recebem uma chave negativa própria, derivada do
+# nome normalizado (mesma chave em qualquer arquivo, bloco ou execução)
+UNKNOWN_ID_BITS = 62
+
+
+def normalize_country_name(name):
+    """
+    Normaliza um nome de país para comparação: sem acentos, sem diferença
+    entre maiúsculas/minúsculas e com pontuação/espaços colapsados.
+    
+    Ex.: 'África do Sul' e 'Africa do Sul' -> 'africa do sul'
+    
+    Args:
+        name: Nome como aparece nos arquivos da Embrapa
+        
+    Returns:
+        str: Nome normalizado
+    """
+    text = unicodedata.normalize('NFKD', str(name))
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    text = re.sub(r'[\W_]+', ' ', text.casefold())
+    return text.strip()
+
+
+def country_dimension_path(data_path=None):
+    """
+    Dimensão usada para os nomes de país dos dados brutos em `data_path`.
+    
+    Um `paises.csv` no próprio diretório dos dados brutos (ex.: dados
+    sintéticos de `utils.synthetic_data`, com países além da dimensão real)
+    tem precedência sobre a dimensão do projeto.
+    
+    Args:
+        data_path: Diretório dos dados brutos (None = dimensão do projeto)
+        
+    Returns:
+        Path: CSV da dimensão
+    """
+    if data_path is not None:
+        local = Path(data_path) / COUNTRY_DIMENSION_PATH.name
+        if local.exists():
+            return local
+    return COUNTRY_DIMENSION_PATH
+
+
+@lru_cache(maxsize=None)
+def load_country_dimension(path=COUNTRY_DIMENSION_PATH):
+    """
+    Carrega a tabela de referência de países.
+    
+    Cada país tem uma chave inteira estável (`pais_id`), o nome canônico
+    exibido no dashboard, o código ISO 3166-1 alfa-3 (vazio para entradas
+    que não são países, como 'Outros') e aliases separados por '|'.
+    O resultado é compartilhado entre chamadas: não modifique.
+    
+    Args:
+        path: CSV da dimensão
+        
+    Returns:
+        DataFrame: pais_id | nome | iso3 | aliases
+    """
+    dim = pd.read_csv(path, sep=';', dtype={'nome': str, 'iso3': str, 'aliases': str},
+                      keep_default_na=False, encoding='utf-8')
+    dim['pais_id'] = dim['pais_id'].astype('int16')
+    
+    if dim['pais_id'].duplicated().any():
+        raise ValueError(f"pais_id duplicado em {path}")
+    
+    return dim
+
+
+@lru_cache(maxsize=None)
+def _alias_index(path=COUNTRY_DIMENSION_PATH):
+    index = {}
+    for row in load_country_dimension(path).itertuples(index=False):
+        for alias in [row.nome, *filter(None, row.aliases.split('|'))]:
+            key = normalize_country_name(alias)
+            if index.setdefault(key, row.pais_id) != row.pais_id:
+                raise ValueError(f"Alias '{alias}' aponta para mais de um país em {path}")
+    return index
+
+
+def unknown_country_id(name):
+    """
+    Chave de um nome que não está na dimensão: negativa (nunca colide com
+    um `pais_id` da dimensão) e estável, calculada do nome normalizado.
+    
+    Args:
+        name: Nome do país
+        
+    Returns:
+        int: Chave negativa
+    """
+    digest = hashlib.blake2b(normalize_country_name(name).encode('utf-8'), digest_size=8).digest()
+    return -1 - (int.from_bytes(digest, 'big') & ((1 << UNKNOWN_ID_BITS) - 1))
+
+
+def map_country_ids(names, path=COUNTRY_DIMENSION_PATH):
+    """
+    Converte nomes brutos em chaves da dimensão e nomes canônicos.
+    
+    A busca é feita uma vez por nome distinto. Cada nome sem correspondência
+    recebe a sua própria chave negativa (`unknown_country_id`) e mantém o
+    nome original, para que países fora da dimensão não se fundam nas
+    agregações por `pais_id`.
+    
+    Args:
+        names: Sequência de nomes de países
+        path: CSV da dimensão
+        
+    Returns:
+        tuple: (array int64 de pais_id, array de nomes canônicos, lista de nomes sem correspondência)
+        
+    Raises:
+        ValueError: Se dois nomes distintos fora da dimensão caírem na mesma chave
+    """
+    index = _alias_index(path)
+    canonical = load_country_dimension(path).set_index('pais_id')['nome']
+    
+    codes, uniques = pd.factorize(pd.Series(names, dtype=object).str.strip())
+    normalized = [normalize_country_name(name) for name in uniques]
+    unique_ids = np.array(
+        [index[key] if key in index else unknown_country_id(name) for key, name in zip(normalized, uniques)],
+        dtype=np.int64
+    )
+    matched = unique_ids >= 0
+    unmatched = [name for name, found in zip(uniques, matched) if not found]
+    
+    # Nomes distintos fora da dimensão continuam distintos depois do mapeamento
+    unmatched_keys = {key for key, found in zip(normalized, matched) if not found}
+    if len(np.unique(unique_ids[~matched])) != len(unmatched_keys):
+        raise ValueError("Colisão de chaves entre países fora da dimensão; adicione-os a "
+                         f"{COUNTRY_DIMENSION_PATH.name}")
+    
+    unique_names = np.asarray(uniques, dtype=object).copy()
+    unique_names[matched] = canonical.loc[unique_ids[matched]].to_numpy()
+    
+    return unique_ids[codes], unique_names[codes], unmatched
+
+
+def country_id(name, path=COUNTRY_DIMENSION_PATH):
+    """
+    Retorna a chave de um único país (aceita nome canônico ou alias).
+    
+    Raises:
+        KeyError: Se o nome não está na dimensão
+    """
+    return _alias_index(path)[normalize_country_name(name)]
+
+
+def report_unmatched_countries(table, unmatched, max_names=10):
+    """
+    Avisa sobre nomes de países que não estão na dimensão (devem virar aliases),
+    pelo logger `utils.countries` (nível WARNING).
+    """
+    if unmatched:
+        names = sorted(unmatched)
+        listed = ', '.join(names[:max_names])
+        if len(names) > max_names:
+            listed += f" ... (+{len(names) - max_names})"
+        logger.warning(f"⚠️  {table}: {len(names)} país(es) sem correspondência em "
+                       f"{COUNTRY_DIMENSION_PATH.name}: {listed}")
+
+
+if __name__ == '__main__':
+    # Relatório de cobertura da dimensão sobre os arquivos brutos
+    sys.path.append(str(Path(__file__).parent.parent))
+    from utils.raw_data import read_raw_dataset
+    
+    ids = {}
+    for dataset in ['exportacao', 'importacao']:
+        names = read_raw_dataset(dataset)['País']
+        pais_ids, _, unmatched = map_country_ids(names)
+        ids[dataset] = set(pais_ids[pais_ids >= 0])
+        print(f"🌎 {dataset:<11} {names.nunique():>4} nomes -> {len(ids[dataset]):>4} países")
+        report_unmatched_countries(dataset, unmatched)
+    
+    print(f"🔗 Países presentes nos dois arquivos: {len(ids['exportacao'] & ids['importacao'])}")
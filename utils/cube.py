@@ -0,0 +1,196 @@
+"""
+Cubo pré-agregado país x ano para exportação/importação, com marginais em cache
+"""
+import numpy as np
+import pandas as pd
+
+from utils.instrumentation import instrumented
+from utils.matrix import CountryYearMatrix
+
+
+# Medidas somadas em cada célula do cubo
+CUBE_MEASURES = ['quantidade_litros', 'valor_usd']
+
+
+@instrumented
+def build_trade_cube(df, country_col='pais_destino'):
+    """
+    Materializa o cubo país x ano x {litros, USD} a partir da tabela long.
+    
+    Args:
+        df: DataFrame processado de exportação ou importação (com 'pais_id')
+        country_col: Coluna de país ('pais_destino' ou 'pais_origem')
+        
+    Returns:
+        dict: Cubo de `cube_from_matrix`
+    """
+    return cube_from_matrix(CountryYearMatrix.from_long(df, country_col))
+
+
+def cube_from_matrix(matrix):
+    """
+    Monta o cubo a partir de uma matriz país x ano (`utils.matrix`).
+    
+    Junto com os planos densos de cada medida são guardados:
+    - somas acumuladas ao longo dos anos (consulta de intervalo em O(países));
+    - totais por ano, por país e o total geral.
+    
+    Args:
+        matrix: CountryYearMatrix (densa ou esparsa)
+        
+    Returns:
+        dict: Cubo (arrays NumPy e DataFrames das marginais); trate como somente leitura
+    """
+    valores = {measure: matrix.dense(measure) for measure in CUBE_MEASURES}
+    presente = matrix.presence()
+    anos = matrix.anos
+    num_paises = len(matrix.pais_ids)
+    country_col = matrix.country_col
+    
+    # Somas acumuladas com uma coluna de zeros à esquerda:
+    # soma dos anos [i, j) = acumulado[:, j] - acumulado[:, i]
+    acumulado = {
+        measure: np.concatenate([np.zeros((num_paises, 1), dtype=plane.dtype), plane.cumsum(axis=1)], axis=1)
+        for measure, plane in valores.items()
+    }
+    acumulado['anos_dados'] = np.concatenate(
+        [np.zeros((num_paises, 1), dtype=np.int64), presente.cumsum(axis=1)], axis=1
+    )
+    
+    por_pais = pd.DataFrame({
+        country_col: matrix.paises,
+        'pais_id': matrix.pais_ids,
+        'quantidade_litros': valores['quantidade_litros'].sum(axis=1),
+        'valor_usd': valores['valor_usd'].sum(axis=1),
+        'anos_dados': presente.sum(axis=1),
+    })
+    
+    com_dados = presente.any(axis=0)
+    por_ano = pd.DataFrame({
+        'ano': anos[com_dados],
+        'quantidade_litros': valores['quantidade_litros'].sum(axis=0)[com_dados],
+        'valor_usd': valores['valor_usd'].sum(axis=0)[com_dados],
+        'num_paises': presente.sum(axis=0)[com_dados],
+    })
+    
+    return {
+        'country_col': country_col,
+        'matriz': matrix,
+        'pais_ids': matrix.pais_ids,
+        'paises': matrix.paises,
+        'anos': anos,
+        'valores': valores,
+        'presente': presente,
+        'acumulado': acumulado,
+        'por_pais': por_pais,
+        'por_ano': por_ano,
+        'total': {measure: por_ano[measure].sum() for measure in CUBE_MEASURES},
+    }
+
+
+def as_trade_cube(data, country_col='pais_destino'):
+    """
+    Aceita um cubo pronto, uma matriz país x ano ou a tabela long.
+    
+    Permite que as funções de análise recebam o cubo em cache, uma
+    `CountryYearMatrix` ou um DataFrame já filtrado.
+    """
+    if isinstance(data, dict):
+        return data
+    if isinstance(data, CountryYearMatrix):
+        return cube_from_matrix(data)
+    return build_trade_cube(data, country_col)
+
+
+def year_range_slice(cube, year_start=None, year_end=None):
+    """
+    Converte um intervalo de anos (inclusivo) em posições [i, j) do cubo.
+    
+    Returns:
+        tuple: (i, j)
+    """
+    anos = cube['anos']
+    i = 0 if year_start is None else int(np.searchsorted(anos, year_start, side='left'))
+    j = len(anos) if year_end is None else int(np.searchsorted(anos, year_end, side='right'))
+    return i, max(i, j)
+
+
+def select_years(cube, year_start=None, year_end=None):
+    """
+    Cubo restrito a um intervalo de anos.
+    
+    O intervalo completo devolve o próprio cubo. Países sem dados no
+    intervalo são omitidos, como ao filtrar a tabela long; quando não há
+    nenhum, os planos do recorte são views dos originais.
+    
+    Args:
+        cube: Cubo de `build_trade_cube`
+        year_start: Ano inicial (inclusivo); None = primeiro ano
+        year_end: Ano final (inclusivo); None = último ano
+        
+    Returns:
+        dict: Cubo do intervalo
+    """
+    i, j = year_range_slice(cube, year_start, year_end)
+    if (i, j) == (0, len(cube['anos'])):
+        return cube
+    
+    matrix = cube['matriz'].select_years(year_start, year_end)
+    com_dados = matrix.sum('registros', axis=1) > 0
+    if not com_dados.all():
+        matrix = matrix.select_countries(matrix.pais_ids[com_dados])
+    return cube_from_matrix(matrix)
+
+
+@instrumented
+def country_totals(cube, year_start=None, year_end=None):
+    """
+    Totais por país, opcionalmente restritos a um intervalo de anos.
+    
+    O intervalo completo devolve a marginal em cache; qualquer outro
+    intervalo é resolvido com duas leituras das somas acumuladas por país
+    (O(países), independente do número de registros). Países sem dados no
+    intervalo são omitidos, como num groupby.
+    
+    Args:
+        cube: Cubo de `build_trade_cube`
+        year_start: Ano inicial (inclusivo); None = primeiro ano
+        year_end: Ano final (inclusivo); None = último ano
+        
+    Returns:
+        DataFrame: <país> | pais_id | quantidade_litros | valor_usd | anos_dados
+    """
+    i, j = year_range_slice(cube, year_start, year_end)
+    if (i, j) == (0, len(cube['anos'])):
+        return cube['por_pais'].copy()
+    
+    acumulado = cube['acumulado']
+    totals = pd.DataFrame({
+        cube['country_col']: cube['paises'],
+        'pais_id': cube['pais_ids'],
+        'quantidade_litros': acumulado['quantidade_litros'][:, j] - acumulado['quantidade_litros'][:, i],
+        'valor_usd': acumulado['valor_usd'][:, j] - acumulado['valor_usd'][:, i],
+        'anos_dados': acumulado['anos_dados'][:, j] - acumulado['anos_dados'][:, i],
+    })
+    
+    return totals[totals['anos_dados'] > 0].reset_index(drop=True)
+
+
+@instrumented
+def year_totals(cube, year_start=None, year_end=None):
+    """
+    Totais por ano (marginal em cache), opcionalmente restritos a um intervalo.
+    
+    Args:
+        cube: Cubo de `build_trade_cube`
+        year_start: Ano inicial (inclusivo); None = primeiro ano
+        year_end: Ano final (inclusivo); None = último ano
+        
+    Returns:
+        DataFrame: ano | quantidade_litros | valor_usd | num_paises
+    """
+    por_ano = cube['por_ano']
+    anos = por_ano['ano'].to_numpy()
+    i = 0 if year_start is None else np.searchsorted(anos, year_start, side='left')
+    j = len(anos) if year_end is None else np.searchsorted(anos, year_end, side='right')
+    return por_ano.iloc[i:j].reset_index(drop=True)
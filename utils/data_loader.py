@@ -1,60 +1,156 @@
 """
 Funções para carregar e validar dados do projeto Wine Export Analysis
 """
-import pandas as pd
-from pathlib import Path
+import threading
+
+import numpy as np
 import streamlit as st
 
+from utils.analytics import TRADE_TABLES, identify_growing_markets
+from utils.concentration import concentration
+from utils.cube import as_trade_cube, build_trade_cube, country_totals, select_years, year_totals
+from utils.disk_cache import disk_cached
+from utils.figure_cache import clear_figure_cache
+from utils.instrumentation import instrumented
+from utils.matrix import CountryYearMatrix
+from utils.processed_store import PROCESSED_DATA_PATH, freeze_frame, get_data_version, read_processed_table
+from utils.query import clear_query_cache
+from utils.topk import top_k
 
-@st.cache_data
+
+# Versão dos dados vista pela última carga (invalidação dos caches compartilhados)
+_data_state = {'versao': None}
+_data_lock = threading.Lock()
+
+
+def current_data_version():
+    """
+    Versão atual dos dados processados, invalidando os caches compartilhados
+    quando ela muda (ex.: o ETL regravou as tabelas com o app no ar).
+    
+    Returns:
+        str: Versão de `utils.processed_store.get_data_version`
+    """
+    version = get_data_version(PROCESSED_DATA_PATH)
+    with _data_lock:
+        if _data_state['versao'] not in (None, version):
+            invalidate_data_caches()
+        _data_state['versao'] = version
+    return version
+
+
+def invalidate_data_caches():
+    """
+    Descarta as tabelas, cubos, consultas e figuras em cache de todas as sessões.
+    """
+    _load_processed_tables.clear()
+    load_trade_cube.clear()
+    clear_query_cache()
+    clear_figure_cache()
+
+
+@st.cache_resource(max_entries=1)
+def _load_processed_tables(data_version):
+    return tuple(
+        freeze_frame(sort_by_year(read_processed_table(name, PROCESSED_DATA_PATH)))
+        for name in ('export', 'import', 'comparacao')
+    )
+
+
+@instrumented
 def load_processed_data():
     """
     Carrega dados já processados de exportação, importação e comparação.
-    Usa cache do Streamlit para otimizar performance.
+    Lê o formato colunar (Feather, memory-mapped) quando disponível e cai
+    para o CSV caso contrário. As tabelas são ordenadas por ano (ver
+    `filter_by_year_range`).
+    
+    As tabelas são carregadas uma vez por versão dos dados e compartilhadas
+    (sem cópia) por todas as sessões e páginas, via `st.cache_resource`.
+    Por isso são somente leitura (`freeze_frame`): use `.copy()` antes de
+    modificar valores ou acrescentar colunas.
     
     Returns:
         tuple: (df_export, df_import, df_comparacao)
     """
-    data_path = Path(__file__).parent.parent / 'data' / 'processed'
-    
     try:
-        df_export = pd.read_csv(data_path / 'export_processed.csv')
-        df_import = pd.read_csv(data_path / 'import_processed.csv')
-        df_comparacao = pd.read_csv(data_path / 'comparacao_exp_imp.csv')
+        return _load_processed_tables(current_data_version())
+    
+    except FileNotFoundError as e:
+        _stop_missing_data(e)
+
+
+def _stop_missing_data(error):
+    st.error(f"❌ Erro ao carregar dados processados: {error}")
+    st.info("💡 Execute o script de processamento primeiro!")
+    st.stop()
+
+
+@st.cache_resource
+def load_trade_cube(flow='export', data_version=None):
+    """
+    Constrói o cubo país x ano de exportação ou importação.
+    
+    Fica em cache por `data_version`: o cubo é montado uma vez por versão
+    dos dados processados e compartilhado (sem cópia) por todas as páginas
+    e sessões; trate como somente leitura.
+    
+    Args:
+        flow: 'export' ou 'import'
+        data_version: Versão dos dados (chave do cache)
         
-        return df_export, df_import, df_comparacao
+    Returns:
+        dict: Cubo de `utils.cube.build_trade_cube`
+    """
+    _, country_col = TRADE_TABLES[flow]
+    return build_trade_cube(read_processed_table(flow, PROCESSED_DATA_PATH), country_col)
+
+
+@instrumented
+def get_trade_cube(flow='export'):
+    """
+    Retorna o cubo da versão atual dos dados processados.
+    """
+    try:
+        return load_trade_cube(flow, current_data_version())
     
     except FileNotFoundError as e:
-        st.error(f"❌ Erro ao carregar dados processados: {e}")
-        st.info("💡 Execute o script de processamento primeiro!")
-        st.stop()
+        _stop_missing_data(e)
 
 
+@instrumented
+@disk_cached
+def get_growing_markets(min_years=5, min_cagr=5):
+    """
+    Mercados em crescimento (`identify_growing_markets`) da versão atual dos
+    dados de exportação, com cache em disco entre reinícios do app.
+    
+    Args:
+        min_years: Mínimo de anos com dados
+        min_cagr: CAGR mínimo (%)
+        
+    Returns:
+        DataFrame: Mercados em crescimento
+    """
+    return identify_growing_markets(get_trade_cube('export'), min_years=min_years, min_cagr=min_cagr)
+
+
+@instrumented
 @st.cache_data
 def load_raw_data():
     """
     Carrega dados brutos dos CSVs originais da Embrapa.
+    Cada dataset é lido com o schema declarado em `utils.raw_data.RAW_SCHEMAS`,
+    já com colunas de ano numéricas ('nd' e '*' viram NaN).
     
     Returns:
         dict: Dicionário com os 5 dataframes
     """
-    data_path = Path(__file__).parent.parent / 'data' / 'raw'
-    
-    datasets = {}
+    # Leitura dos CSVs é do ETL: só importada quando os dados brutos são pedidos
+    from utils.raw_data import RAW_DATA_PATH, load_raw_datasets
     
     try:
-        # Exportação e Importação (sep=';')
-        datasets['exportacao'] = pd.read_csv(data_path / 'Exportacao.csv', sep=';')
-        datasets['importacao'] = pd.read_csv(data_path / 'Importacao.csv', sep=';')
-        
-        # Comercialização (sep=';')
-        datasets['comercializacao'] = pd.read_csv(data_path / 'Comercializacao.csv', sep=';')
-        
-        # Produção e Processamento (sep='\t', formato especial)
-        datasets['producao'] = pd.read_csv(data_path / 'Producao.csv', sep='\t', header=None)
-        datasets['processamento'] = pd.read_csv(data_path / 'Processamento.csv', sep='\t', header=None)
-        
-        return datasets
+        return load_raw_datasets(RAW_DATA_PATH)
     
     except FileNotFoundError as e:
         st.error(f"❌ Erro ao carregar dados brutos: {e}")
@@ -62,94 +158,161 @@ def load_raw_data():
         st.stop()
 
 
+@instrumented
 def get_export_summary(df_export):
     """
     Calcula estatísticas resumidas de exportação.
     
     Args:
-        df_export: DataFrame de exportações processado
+        df_export: DataFrame de exportações processado ou cubo (`get_trade_cube`)
         
     Returns:
         dict: Dicionário com métricas principais
     """
+    cube = as_trade_cube(df_export)
+    por_ano = cube['por_ano']
+    
     summary = {
-        'total_litros': df_export['quantidade_litros'].sum(),
-        'total_usd': df_export['valor_usd'].sum(),
-        'preco_medio': df_export['valor_usd'].sum() / df_export['quantidade_litros'].sum(),
-        'anos': df_export['ano'].nunique(),
-        'paises': df_export['pais_destino'].nunique(),
-        'ano_min': df_export['ano'].min(),
-        'ano_max': df_export['ano'].max()
+        'total_litros': cube['total']['quantidade_litros'],
+        'total_usd': cube['total']['valor_usd'],
+        'preco_medio': cube['total']['valor_usd'] / cube['total']['quantidade_litros'],
+        'anos': len(por_ano),
+        'paises': len(cube['pais_ids']),
+        'ano_min': por_ano['ano'].min(),
+        'ano_max': por_ano['ano'].max()
     }
     
     return summary
 
 
+@instrumented
 def get_top_countries(df_export, n=10, metric='valor_usd'):
     """
     Retorna top N países por uma métrica específica.
     
     Args:
-        df_export: DataFrame de exportações
+        df_export: DataFrame de exportações ou cubo (`get_trade_cube`)
         n: Número de países
         metric: 'valor_usd' ou 'quantidade_litros'
         
     Returns:
         DataFrame: Top países ordenados
     """
-    top = df_export.groupby('pais_destino').agg({
-        'quantidade_litros': 'sum',
-        'valor_usd': 'sum'
-    }).reset_index()
+    top = country_totals(as_trade_cube(df_export))[['pais_destino', 'quantidade_litros', 'valor_usd']]
     
     top['preco_medio'] = top['valor_usd'] / top['quantidade_litros']
-    top = top.sort_values(metric, ascending=False).head(n)
+    top = top_k(top, n, metric)
     
     return top
 
 
-def filter_by_year_range(df, year_start, year_end):
+def _sorted_by_year(anos):
+    return bool((anos[1:] >= anos[:-1]).all())
+
+
+def sort_by_year(df):
     """
-    Filtra DataFrame por intervalo de anos.
+    Ordena uma tabela por ano, preservando a ordem original dentro de cada ano.
+    
+    O ETL já grava as tabelas ordenadas (`utils.data_processing.sort_trade_table`),
+    e então a tabela lida é devolvida sem cópia; a ordenação só acontece
+    para arquivos gerados por versões anteriores.
     
     Args:
         df: DataFrame com coluna 'ano'
-        year_start: Ano inicial
-        year_end: Ano final
         
     Returns:
-        DataFrame: Dados filtrados
+        DataFrame: O próprio `df` se já estiver ordenado; senão, uma cópia ordenada
     """
-    return df[(df['ano'] >= year_start) & (df['ano'] <= year_end)].copy()
+    if _sorted_by_year(df['ano'].to_numpy()):
+        return df
+    return df.sort_values('ano', kind='stable', ignore_index=True)
 
 
-def calculate_market_concentration(df_export):
+def year_block(df, year_start=None, year_end=None):
     """
-    Calcula índice de concentração de mercado (Herfindahl-Hirschman Index).
+    Posições [i, j) das linhas de um intervalo de anos em uma tabela ordenada
+    por ano (busca binária, O(log n)).
+    
+    Args:
+        df: DataFrame ordenado por 'ano' (ver `sort_by_year`)
+        year_start: Ano inicial (inclusivo); None = primeiro ano
+        year_end: Ano final (inclusivo); None = último ano
+        
+    Returns:
+        tuple: (i, j)
+    """
+    anos = df['ano'].to_numpy()
+    i = 0 if year_start is None else int(np.searchsorted(anos, year_start, side='left'))
+    j = len(anos) if year_end is None else int(np.searchsorted(anos, year_end, side='right'))
+    return i, max(i, j)
+
+
+@instrumented
+def filter_by_year_range(df, year_start=None, year_end=None):
+    """
+    Filtra dados por intervalo de anos.
+    
+    Em uma tabela ordenada por ano (como as de `load_processed_data`) o
+    intervalo é um bloco contíguo de linhas, localizado por busca binária e
+    devolvido como fatia, sem máscaras nem cópia; o intervalo completo
+    devolve o próprio DataFrame. Trate o resultado como somente leitura
+    (use `.copy()` antes de modificá-lo). Tabelas fora de ordem caem no
+    filtro por máscara.
     
     Args:
-        df_export: DataFrame de exportações
+        df: DataFrame com coluna 'ano', cubo (`get_trade_cube`) ou CountryYearMatrix
+        year_start: Ano inicial (inclusivo); None = primeiro ano
+        year_end: Ano final (inclusivo); None = último ano
         
     Returns:
-        dict: Métricas de concentração
+        Dados filtrados, do mesmo tipo da entrada
     """
-    total_valor = df_export['valor_usd'].sum()
+    if isinstance(df, dict):
+        return select_years(df, year_start, year_end)
+    if isinstance(df, CountryYearMatrix):
+        return df.select_years(year_start, year_end)
+    
+    anos = df['ano'].to_numpy()
+    if not _sorted_by_year(anos):
+        mask = np.ones(len(anos), dtype=bool)
+        if year_start is not None:
+            mask &= anos >= year_start
+        if year_end is not None:
+            mask &= anos <= year_end
+        return df[mask]
     
-    # Market share por país
-    market_share = df_export.groupby('pais_destino')['valor_usd'].sum() / total_valor
+    i, j = year_block(df, year_start, year_end)
+    if (i, j) == (0, len(df)):
+        return df
+    return df.iloc[i:j]
+
+
+@instrumented
+def calculate_market_concentration(df_export, year_start=None, year_end=None):
+    """
+    Calcula índice de concentração de mercado (Herfindahl-Hirschman Index).
     
-    # HHI (soma dos quadrados dos market shares)
-    hhi = (market_share ** 2).sum() * 10000  # Multiplicado por 10000 (padrão)
+    Usa as somas acumuladas do cubo (`utils.concentration`): qualquer
+    intervalo de anos sai em O(países), sem reler os registros.
     
-    # Top 5 e Top 10 concentration
-    top5 = market_share.nlargest(5).sum() * 100
-    top10 = market_share.nlargest(10).sum() * 100
+    Args:
+        df_export: DataFrame de exportações ou cubo (`get_trade_cube`)
+        year_start: Ano inicial (inclusivo); None = primeiro ano
+        year_end: Ano final (inclusivo); None = último ano
+        
+    Returns:
+        dict: Métricas de concentração (hhi, top5_pct, top10_pct, gini, theil)
+    """
+    metrics = concentration(as_trade_cube(df_export), year_start, year_end)
     
     return {
-        'hhi': hhi,
-        'top5_pct': top5,
-        'top10_pct': top10,
-        'interpretation': get_hhi_interpretation(hhi)
+        'hhi': metrics['hhi'],
+        'top5_pct': metrics['top5_pct'],
+        'top10_pct': metrics['top10_pct'],
+        'gini': metrics['gini'],
+        'theil': metrics['theil'],
+        'interpretation': get_hhi_interpretation(metrics['hhi'])
     }
 
 
@@ -171,23 +334,18 @@ def get_hhi_interpretation(hhi):
         return "Mercado altamente concentrado"
 
 
+@instrumented
 def get_yearly_trends(df_export):
     """
     Calcula tendências anuais de exportação.
     
     Args:
-        df_export: DataFrame de exportações
+        df_export: DataFrame de exportações ou cubo (`get_trade_cube`)
         
     Returns:
         DataFrame: Agregação por ano
     """
-    trends = df_export.groupby('ano').agg({
-        'quantidade_litros': 'sum',
-        'valor_usd': 'sum',
-        'pais_destino': 'nunique'
-    }).reset_index()
-    
-    trends.columns = ['ano', 'quantidade_litros', 'valor_usd', 'num_paises']
+    trends = year_totals(as_trade_cube(df_export)).copy()
     trends['preco_medio'] = trends['valor_usd'] / trends['quantidade_litros']
     
     # Calcular crescimento YoY
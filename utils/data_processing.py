@@ -3,295 +3,353 @@ Funções para processar dados brutos da Embrapa Vitibrasil
 """
 import pandas as pd
 import numpy as np
+import sys
+import tempfile
 from pathlib import Path
 
+# Adicionar path para imports (permite `python utils/data_processing.py`)
+sys.path.append(str(Path(__file__).parent.parent))
 
-def process_export_data(df_raw, year_start=2009, year_end=2023):
+# Análises (re-exportadas: pipeline e scripts antigos importam daqui)
+from utils.analytics import (  # noqa: F401
+    TRADE_TABLES,
+    calculate_cagr,
+    create_comparison_table,
+    identify_growing_markets,
+    segment_countries_by_price
+)
+from utils.countries import (
+    COUNTRY_DIMENSION_PATH,
+    country_dimension_path,
+    map_country_ids,
+    report_unmatched_countries
+)
+from utils.processed_store import write_processed_chunks
+from utils.raw_data import RAW_SCHEMAS, read_raw_dataset
+
+
+def _reshape_trade_data(df_raw, country_col, year_start, year_end, country_path=COUNTRY_DIMENSION_PATH):
     """
-    Transforma dados de exportação de formato wide para long.
+    Reshape vetorizado wide -> long para os arquivos de comércio exterior.
     
-    Estrutura original: País | 1970 (kg) | 1970.1 (USD) | 1971 (kg) | 1971.1 (USD) ...
-    Estrutura final: país_destino | ano | quantidade_kg | valor_usd | quantidade_litros | preco_medio
+    Cada par de colunas `YYYY` (kg) / `YYYY.1` (USD) vira uma coluna das
+    matrizes NumPy `kg` e `usd`; a máscara de validade é aplicada de uma vez
+    e `np.nonzero` preserva a ordem país -> ano do formato original.
+    
+    Os nomes de país são resolvidos na dimensão de `utils.countries`: o
+    resultado traz o nome canônico e a chave inteira `pais_id`. Nomes sem
+    correspondência recebem uma chave negativa própria e são listados em
+    `df.attrs['paises_sem_id']`.
     
     Args:
-        df_raw: DataFrame bruto de exportação
+        df_raw: DataFrame bruto (Id | País | YYYY | YYYY.1 ...)
+        country_col: Nome da coluna de país no resultado
         year_start: Ano inicial para filtrar
         year_end: Ano final para filtrar
+        country_path: CSV da dimensão de países
         
     Returns:
-        DataFrame: Dados processados
+        DataFrame: Dados no formato long
     """
-    data_export = []
-    
-    for _, row in df_raw.iterrows():
-        pais = row['País']
-        
-        # Iterar pelas colunas de anos (pulando .1 que são valores USD)
-        for i in range(2, len(df_raw.columns), 2):
-            ano_col = df_raw.columns[i]
-            
-            if '.' in ano_col:  # Pular colunas .1
-                continue
-            
-            try:
-                ano = int(ano_col)
-                kg = row[ano_col]
-                valor_usd = row[f"{ano_col}.1"]
-                
-                # Filtrar apenas registros com valores válidos
-                if pd.notna(kg) and pd.notna(valor_usd) and kg > 0 and valor_usd > 0:
-                    data_export.append({
-                        'pais_destino': pais,
-                        'ano': ano,
-                        'quantidade_kg': int(kg),
-                        'valor_usd': float(valor_usd)
-                    })
-            except (ValueError, KeyError):
-                continue
-    
-    df_export = pd.DataFrame(data_export)
+    # Colunas de ano nas posições pares (a seguinte, .1, é o valor em USD)
+    year_cols = [
+        col for col in df_raw.columns[2::2]
+        if col.isdigit() and f"{col}.1" in df_raw.columns
+        and year_start <= int(col) <= year_end
+    ]
+    years = np.array([int(col) for col in year_cols], dtype=np.int64)
+    
+    kg = df_raw[year_cols].to_numpy(dtype=np.float64)
+    usd = df_raw[[f"{col}.1" for col in year_cols]].to_numpy(dtype=np.float64)
+    
+    # Filtrar apenas registros com valores válidos (NaN compara como False)
+    mask = (kg > 0) & (usd > 0)
+    rows, cols = np.nonzero(mask)
+    
+    pais_ids, pais_nomes, unmatched = map_country_ids(df_raw['País'], country_path)
+    
+    df_long = pd.DataFrame({
+        country_col: pais_nomes[rows],
+        'pais_id': pais_ids[rows],
+        'ano': years[cols],
+        'quantidade_kg': kg[rows, cols].astype(np.int64),
+        'valor_usd': usd[rows, cols]
+    })
     
     # Adicionar coluna de litros (1kg = 1L conforme enunciado)
-    df_export['quantidade_litros'] = df_export['quantidade_kg']
+    df_long['quantidade_litros'] = df_long['quantidade_kg']
     
     # Calcular preço médio
-    df_export['preco_medio_usd_litro'] = df_export['valor_usd'] / df_export['quantidade_litros']
+    df_long['preco_medio_usd_litro'] = df_long['valor_usd'] / df_long['quantidade_litros']
     
-    # Filtrar por anos
-    df_export = df_export[(df_export['ano'] >= year_start) & (df_export['ano'] <= year_end)]
+    df_long.attrs['paises_sem_id'] = unmatched
     
-    return df_export
+    return df_long
 
 
-def process_import_data(df_raw, year_start=2009, year_end=2023):
+def sort_trade_table(df):
     """
-    Transforma dados de importação (mesma estrutura que exportação).
+    Ordena uma tabela de comércio exterior por ano para gravação.
+    
+    A ordenação é estável: dentro de cada ano fica a ordem país do arquivo
+    bruto. Gravadas assim, as tabelas são lidas já ordenadas e o
+    `sort_by_year` do carregamento (`utils.data_loader`) não copia nada.
     
     Args:
-        df_raw: DataFrame bruto de importação
-        year_start: Ano inicial
-        year_end: Ano final
+        df: DataFrame long de `process_export_data` / `process_import_data`
         
     Returns:
-        DataFrame: Dados processados
+        DataFrame: Linhas ordenadas por 'ano' (índice 0..n-1)
+    """
+    return df.sort_values('ano', kind='stable', ignore_index=True)
+
+
+def _year_sorted_chunks(chunks):
     """
-    data_import = []
+    Reagrupa blocos long por ano, como `sort_trade_table` na tabela inteira.
     
-    for _, row in df_raw.iterrows():
-        pais = row['País']
+    Cada bloco é dividido por ano em arquivos temporários; depois cada ano
+    é lido (na ordem dos blocos) e devolvido como um bloco. O pico de
+    memória passa a ser o maior ano, não a tabela.
+    """
+    with tempfile.TemporaryDirectory(prefix='wine-etl-') as tmp:
+        parts = {}
+        empty = None
+        for i, chunk in enumerate(chunks):
+            empty = chunk.iloc[:0]
+            for year, part in chunk.groupby('ano', sort=False):
+                path = Path(tmp) / f"{year}-{i:06d}.pkl"
+                part.to_pickle(path)
+                parts.setdefault(year, []).append(path)
         
-        for i in range(2, len(df_raw.columns), 2):
-            ano_col = df_raw.columns[i]
-            
-            if '.' in ano_col:
-                continue
-            
-            try:
-                ano = int(ano_col)
-                kg = row[ano_col]
-                valor_usd = row[f"{ano_col}.1"]
-                
-                if pd.notna(kg) and pd.notna(valor_usd) and kg > 0 and valor_usd > 0:
-                    data_import.append({
-                        'pais_origem': pais,
-                        'ano': ano,
-                        'quantidade_kg': int(kg),
-                        'valor_usd': float(valor_usd)
-                    })
-            except (ValueError, KeyError):
-                continue
-    
-    df_import = pd.DataFrame(data_import)
-    df_import['quantidade_litros'] = df_import['quantidade_kg']
-    df_import['preco_medio_usd_litro'] = df_import['valor_usd'] / df_import['quantidade_litros']
-    
-    df_import = df_import[(df_import['ano'] >= year_start) & (df_import['ano'] <= year_end)]
-    
-    return df_import
+        if not parts and empty is not None:
+            yield empty
+        for year in sorted(parts):
+            yield pd.concat([pd.read_pickle(path) for path in parts[year]], ignore_index=True)
 
 
-def create_comparison_table(df_export, df_import):
+def process_export_data(df_raw, year_start=2009, year_end=2023, country_path=COUNTRY_DIMENSION_PATH):
     """
-    Cria tabela comparativa entre exportação e importação por ano.
+    Transforma dados de exportação de formato wide para long.
+    
+    Estrutura original: País | 1970 (kg) | 1970.1 (USD) | 1971 (kg) | 1971.1 (USD) ...
+    Estrutura final: país_destino | pais_id | ano | quantidade_kg | valor_usd | quantidade_litros | preco_medio
     
     Args:
-        df_export: DataFrame de exportações processado
-        df_import: DataFrame de importações processado
+        df_raw: DataFrame bruto de exportação
+        year_start: Ano inicial para filtrar
+        year_end: Ano final para filtrar
+        country_path: CSV da dimensão de países
         
     Returns:
-        DataFrame: Tabela comparativa
+        DataFrame: Dados processados
     """
-    # Agregação por ano - Exportação
-    export_yearly = df_export.groupby('ano').agg({
-        'quantidade_litros': 'sum',
-        'valor_usd': 'sum'
-    }).reset_index()
-    export_yearly.columns = ['ano', 'exp_litros', 'exp_usd']
-    
-    # Agregação por ano - Importação
-    import_yearly = df_import.groupby('ano').agg({
-        'quantidade_litros': 'sum',
-        'valor_usd': 'sum'
-    }).reset_index()
-    import_yearly.columns = ['ano', 'imp_litros', 'imp_usd']
-    
-    # Merge
-    comparacao = export_yearly.merge(import_yearly, on='ano', how='outer').fillna(0)
-    
-    # Calcular balanças
-    comparacao['balanca_litros'] = comparacao['exp_litros'] - comparacao['imp_litros']
-    comparacao['balanca_usd'] = comparacao['exp_usd'] - comparacao['imp_usd']
-    
-    # Preços médios
-    comparacao['preco_medio_exp'] = comparacao['exp_usd'] / comparacao['exp_litros']
-    comparacao['preco_medio_imp'] = comparacao['imp_usd'] / comparacao['imp_litros']
-    
-    # Diferença percentual de preços
-    comparacao['diferenca_preco_pct'] = (
-        (comparacao['preco_medio_imp'] / comparacao['preco_medio_exp'] - 1) * 100
-    )
-    
-    return comparacao
+    return _reshape_trade_data(df_raw, 'pais_destino', year_start, year_end, country_path)
 
 
-def calculate_cagr(df, value_col, year_col='ano'):
+def process_import_data(df_raw, year_start=2009, year_end=2023, country_path=COUNTRY_DIMENSION_PATH):
     """
-    Calcula CAGR (Compound Annual Growth Rate) para uma série temporal.
+    Transforma dados de importação (mesma estrutura que exportação).
     
     Args:
-        df: DataFrame com dados temporais
-        value_col: Nome da coluna de valores
-        year_col: Nome da coluna de anos
+        df_raw: DataFrame bruto de importação
+        year_start: Ano inicial
+        year_end: Ano final
+        country_path: CSV da dimensão de países
         
     Returns:
-        float: CAGR em percentual
+        DataFrame: Dados processados
+    """
+    return _reshape_trade_data(df_raw, 'pais_origem', year_start, year_end, country_path)
+
+
+def iter_trade_chunks(dataset, country_col, data_path='data/raw', chunksize=10_000,
+                      year_start=2009, year_end=2023):
+    """
+    Lê um arquivo bruto de comércio exterior em blocos e devolve cada bloco
+    já no formato long (mesmo reshape/filtro de `process_export_data`), com
+    a dimensão de países de `country_dimension_path(data_path)`.
+    
+    Args:
+        dataset: 'exportacao' ou 'importacao'
+        country_col: Nome da coluna de país no resultado
+        data_path: Caminho dos dados brutos
+        chunksize: Número de linhas (países) do arquivo bruto por bloco
+        year_start: Ano inicial
+        year_end: Ano final
+        
+    Yields:
+        DataFrame: Bloco processado
     """
-    df_sorted = df.sort_values(year_col)
+    country_path = country_dimension_path(data_path)
+    with read_raw_dataset(dataset, data_path, chunksize=chunksize) as reader:
+        for df_chunk in reader:
+            yield _reshape_trade_data(df_chunk, country_col, year_start, year_end, country_path)
+
+
+def process_trade_data_chunked(table, data_path='data/raw', output_path='data/processed',
+                               chunksize=10_000, year_start=2009, year_end=2023):
+    """
+    Processa exportação ou importação em modo streaming.
     
-    initial_value = df_sorted[value_col].iloc[0]
-    final_value = df_sorted[value_col].iloc[-1]
-    num_years = df_sorted[year_col].iloc[-1] - df_sorted[year_col].iloc[0]
+    O arquivo bruto é lido em blocos; cada bloco é transformado e reagrupado
+    por ano (`_year_sorted_chunks`) antes de ser acrescentado aos arquivos
+    processados. O pico de memória depende de `chunksize` e do maior ano,
+    não do tamanho do arquivo, e a saída é idêntica à do processamento em
+    memória seguido de `sort_trade_table`.
     
-    if initial_value == 0 or num_years == 0:
-        return 0
+    Args:
+        table: 'export' ou 'import'
+        data_path: Caminho dos dados brutos
+        output_path: Caminho para salvar dados processados
+        chunksize: Número de linhas do arquivo bruto por bloco
+        year_start: Ano inicial
+        year_end: Ano final
+        
+    Returns:
+        int: Número de registros gravados
+    """
+    dataset, country_col = TRADE_TABLES[table]
+    unmatched = set()
     
-    cagr = (np.power(final_value / initial_value, 1 / num_years) - 1) * 100
+    def tracked_chunks():
+        for chunk in iter_trade_chunks(dataset, country_col, data_path, chunksize, year_start, year_end):
+            unmatched.update(chunk.attrs['paises_sem_id'])
+            yield chunk
     
-    return cagr
+    num_rows = write_processed_chunks(_year_sorted_chunks(tracked_chunks()), table, output_path)
+    report_unmatched_countries(table, unmatched)
+    return num_rows
 
 
-def identify_growing_markets(df_export, min_years=5, min_cagr=5):
+def yearly_totals_chunked(csv_path, chunksize):
     """
-    Identifica mercados com crescimento consistente.
+    Soma litros e valor por ano lendo um CSV processado em blocos.
     
     Args:
-        df_export: DataFrame de exportações
-        min_years: Mínimo de anos com dados
-        min_cagr: CAGR mínimo para considerar (%)
+        csv_path: CSV processado de exportação ou importação
+        chunksize: Número de linhas por bloco
         
     Returns:
-        DataFrame: Países com crescimento identificado
+        DataFrame: ano | quantidade_litros | valor_usd
     """
-    growing_markets = []
+    totals = []
+    with pd.read_csv(csv_path, usecols=['ano', 'quantidade_litros', 'valor_usd'],
+                     chunksize=chunksize) as reader:
+        for df_chunk in reader:
+            totals.append(df_chunk.groupby('ano').sum())
     
-    for pais in df_export['pais_destino'].unique():
-        df_pais = df_export[df_export['pais_destino'] == pais].copy()
-        
-        # Filtrar países com dados suficientes
-        if len(df_pais) < min_years:
-            continue
-        
-        # Calcular CAGR
-        cagr_valor = calculate_cagr(df_pais, 'valor_usd')
-        cagr_volume = calculate_cagr(df_pais, 'quantidade_litros')
-        
-        if cagr_valor >= min_cagr:
-            total_valor = df_pais['valor_usd'].sum()
-            total_litros = df_pais['quantidade_litros'].sum()
-            
-            growing_markets.append({
-                'pais': pais,
-                'cagr_valor': cagr_valor,
-                'cagr_volume': cagr_volume,
-                'total_valor_usd': total_valor,
-                'total_litros': total_litros,
-                'anos_dados': len(df_pais)
-            })
-    
-    df_growing = pd.DataFrame(growing_markets)
-    df_growing = df_growing.sort_values('cagr_valor', ascending=False)
-    
-    return df_growing
+    return pd.concat(totals).groupby(level='ano').sum().reset_index()
 
 
-def segment_countries_by_price(df_export, low_threshold=1.5, high_threshold=3.0):
+def process_domestic_data(df_raw, dataset, year_start=2009, year_end=2023):
     """
-    Segmenta países por faixa de preço médio.
+    Transforma datasets hierárquicos (produção, processamento, comercialização)
+    de formato wide para long.
+    
+    Estrutura original: id | control | produto | 1970 | 1971 ...
+    Linhas cujo `control` não tem prefixo (ex.: 'VINHO DE MESA', 'TINTAS') são
+    totais de categoria; as demais (ex.: 'vm_Tinto') são itens da categoria
+    acima delas.
+    Estrutura final: categoria | produto | total_categoria | ano | quantidade
+    
+    Quantidades em litros (produção, comercialização) ou kg (processamento).
+    Valores ausentes ('nd', '*') são descartados.
     
     Args:
-        df_export: DataFrame de exportações
-        low_threshold: Limite inferior (USD/L)
-        high_threshold: Limite superior (USD/L)
+        df_raw: DataFrame bruto lido com `read_raw_dataset`
+        dataset: 'producao', 'processamento' ou 'comercializacao'
+        year_start: Ano inicial
+        year_end: Ano final
         
     Returns:
-        dict: Países segmentados por faixa
+        DataFrame: Dados processados
     """
-    pais_preco = df_export.groupby('pais_destino').agg({
-        'valor_usd': 'sum',
-        'quantidade_litros': 'sum'
-    }).reset_index()
-    
-    pais_preco['preco_medio'] = pais_preco['valor_usd'] / pais_preco['quantidade_litros']
-    
-    segments = {
-        'baixo': pais_preco[pais_preco['preco_medio'] < low_threshold]['pais_destino'].tolist(),
-        'medio': pais_preco[
-            (pais_preco['preco_medio'] >= low_threshold) & 
-            (pais_preco['preco_medio'] < high_threshold)
-        ]['pais_destino'].tolist(),
-        'alto': pais_preco[pais_preco['preco_medio'] >= high_threshold]['pais_destino'].tolist()
-    }
-    
-    return segments, pais_preco
+    schema = RAW_SCHEMAS[dataset]
+    label = df_raw[schema['label_col']].str.strip()
+    
+    is_total = ~df_raw[schema['control_col']].fillna('').str.match(r'^[a-z]{2}_')
+    categoria = label.where(is_total).ffill()
+    
+    year_cols = [
+        col for col in df_raw.columns
+        if col.isdigit() and year_start <= int(col) <= year_end
+    ]
+    years = np.array([int(col) for col in year_cols], dtype=np.int64)
+    values = df_raw[year_cols].to_numpy(dtype=np.float64)
+    
+    rows, cols = np.nonzero(~np.isnan(values))
+    
+    return pd.DataFrame({
+        'categoria': categoria.to_numpy()[rows],
+        'produto': label.to_numpy()[rows],
+        'total_categoria': is_total.to_numpy()[rows],
+        'ano': years[cols],
+        'quantidade': values[rows, cols]
+    })
 
 
-def process_all_data(data_path='data/raw', output_path='data/processed'):
+def process_all_data(data_path='data/raw', output_path='data/processed', force=False,
+                     chunksize=None, max_workers=None, figures=True):
     """
     Processa todos os dados brutos e salva versões processadas.
     Execute este script uma vez antes de rodar o Streamlit.
     
+    Cada tabela derivada é um estágio de `utils.pipeline`: exportação,
+    importação e os três datasets domésticos rodam em paralelo, e a
+    comparação roda depois de exportação/importação. O processamento é
+    incremental: o manifesto em `output_path` guarda os hashes de inputs e
+    outputs de cada estágio, e só são reconstruídas as tabelas cujos inputs
+    (ou outputs) mudaram.
+    
     Args:
         data_path: Caminho dos dados brutos
         output_path: Caminho para salvar dados processados
+        force: Se True, ignora o manifesto e reprocessa tudo
+        chunksize: Se informado, processa exportação/importação em modo
+            streaming, lendo `chunksize` linhas brutas por vez
+        max_workers: Processos em paralelo (1 = sequencial)
+        figures: Se True, pré-gera o JSON das figuras do dashboard
+            (`utils.figure_cache`) para a nova versão dos dados, em
+            `figures/` ao lado de `output_path` (ex.: data/figures);
+            ignorado se nenhuma tabela mudou
+            
+    Returns:
+        dict: Status, registros e tempo de cada estágio
     """
-    from pathlib import Path
-    
-    data_path = Path(data_path)
-    output_path = Path(output_path)
-    output_path.mkdir(parents=True, exist_ok=True)
+    from utils.pipeline import run_pipeline
     
     print("🔄 Processando dados...")
     
-    # Carregar dados brutos
-    df_exp_raw = pd.read_csv(data_path / 'Exportacao.csv', sep=';')
-    df_imp_raw = pd.read_csv(data_path / 'Importacao.csv', sep=';')
-    
-    # Processar
-    df_export = process_export_data(df_exp_raw)
-    df_import = process_import_data(df_imp_raw)
-    df_comparacao = create_comparison_table(df_export, df_import)
+    results = run_pipeline(data_path, output_path, force=force, chunksize=chunksize,
+                           max_workers=max_workers)
     
-    # Salvar
-    df_export.to_csv(output_path / 'export_processed.csv', index=False)
-    df_import.to_csv(output_path / 'import_processed.csv', index=False)
-    df_comparacao.to_csv(output_path / 'comparacao_exp_imp.csv', index=False)
+    changed = any(result['status'] == 'processado' for result in results.values())
+    if figures and not changed:
+        print("🖼️ Figuras mantidas: nenhuma tabela mudou")
+    elif figures:
+        from utils.figure_cache import DASHBOARD_FIGURES, FIGURES_PATH, prebuild_figures
+        
+        written = prebuild_figures(output_path, Path(output_path).parent / FIGURES_PATH.name)
+        print(f"🖼️ {len(written)} figuras pré-geradas "
+              f"({len(DASHBOARD_FIGURES) - len(written)} já existiam)")
     
-    print(f"✅ Dados processados salvos em {output_path}/")
-    print(f"   - export_processed.csv: {len(df_export)} registros")
-    print(f"   - import_processed.csv: {len(df_import)} registros")
-    print(f"   - comparacao_exp_imp.csv: {len(df_comparacao)} registros")
+    return results
 
 
 if __name__ == '__main__':
+    import argparse
+    
     # Executar processamento se rodado diretamente
-    process_all_data()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Processa os dados brutos da Embrapa')
+    parser.add_argument('--force', action='store_true', help='Reprocessa tudo, ignorando o manifesto')
+    parser.add_argument('--chunksize', type=int, default=None,
+                        help='Modo streaming: linhas brutas lidas por bloco')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Processos em paralelo (1 = sequencial)')
+    parser.add_argument('--sem-figuras', action='store_true',
+                        help='Não pré-gera as figuras do dashboard')
+    args = parser.parse_args()
+    
+    process_all_data(force=args.force, chunksize=args.chunksize, max_workers=args.workers,
+                     figures=not args.sem_figuras)
\ No newline at end of file
@@ -0,0 +1,259 @@
+"""
+Cache em disco (Feather) de tabelas derivadas, com despejo LRU por orçamento de bytes
+"""
+import functools
+import hashlib
+import inspect
+import json
+import os
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from utils.processed_store import PROCESSED_DATA_PATH, columnar_available, get_data_version
+
+
+DISK_CACHE_PATH = Path(__file__).parent.parent / 'data' / 'cache'
+
+# Orçamento padrão do diretório de cache (bytes)
+DISK_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Versão do código das tabelas derivadas. O código-fonte da função cacheada
+# já entra na chave; aumente este número quando mudar uma função auxiliar
+# que ela chama (ex.: `utils.analytics`), para não servir resultados antigos.
+CACHE_VERSION = 1
+
+_config = {'path': DISK_CACHE_PATH, 'max_bytes': DISK_CACHE_MAX_BYTES, 'ativo': True}
+_stats = {'hits': 0, 'misses': 0, 'gravacoes': 0, 'despejos': 0}
+_lock = threading.Lock()
+_source_hashes = {}
+
+
+def configure_disk_cache(path=None, max_bytes=None, enabled=None):
+    """
+    Ajusta o diretório, o orçamento de bytes ou liga/desliga o cache em disco.
+    
+    Args:
+        path: Diretório dos arquivos de cache
+        max_bytes: Tamanho máximo do diretório; os menos usados saem primeiro
+        enabled: False desliga o cache (as funções só calculam)
+    """
+    with _lock:
+        if path is not None:
+            _config['path'] = Path(path)
+        if max_bytes is not None:
+            _config['max_bytes'] = int(max_bytes)
+        if enabled is not None:
+            _config['ativo'] = bool(enabled)
+
+
+def _argument_token(value):
+    """
+    Representação estável (JSON) de um argumento; DataFrames entram pelo
+    hash do conteúdo.
+    """
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        content = int(pd.util.hash_pandas_object(value, index=True).to_numpy().sum(dtype=np.uint64))
+        columns = list(map(str, value.columns)) if isinstance(value, pd.DataFrame) else [str(value.name)]
+        return {'tabela': content, 'colunas': columns, 'linhas': len(value)}
+    if isinstance(value, (list, tuple)):
+        return [_argument_token(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): _argument_token(item) for key, item in value.items()}
+    if isinstance(value, np.generic):
+        return value.item()
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    raise TypeError(f"Argumento não suportado pelo cache em disco: {type(value).__name__}")
+
+
+def _source_hash(func):
+    """
+    Hash do código-fonte da função: alterá-la invalida as entradas antigas.
+    """
+    if func not in _source_hashes:
+        try:
+            source = inspect.getsource(func)
+        except (OSError, TypeError):
+            # Sem fonte disponível (ex.: definida no console): só o nome e CACHE_VERSION
+            source = ''
+        _source_hashes[func] = hashlib.sha256(source.encode()).hexdigest()
+    return _source_hashes[func]
+
+
+def cache_key(func, args, kwargs, data_version):
+    """
+    Chave do cache: nome e código da função, CACHE_VERSION, argumentos
+    (com os padrões aplicados) e versão dos dados de entrada.
+    
+    Returns:
+        str: Hash sha256 (hex)
+    """
+    bound = inspect.signature(func).bind(*args, **kwargs)
+    bound.apply_defaults()
+    payload = {
+        'funcao': f"{func.__module__}.{func.__qualname__}",
+        'codigo': _source_hash(func),
+        'versao': CACHE_VERSION,
+        'argumentos': _argument_token(dict(bound.arguments)),
+        'dados': data_version,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+def _read_entry(path):
+    import pyarrow.feather as feather
+    
+    try:
+        table = feather.read_table(path, memory_map=False)
+    except (FileNotFoundError, OSError):
+        # Despejado por outro processo entre a busca e a leitura
+        return None
+    
+    try:
+        os.utime(path)  # mtime = último uso (ordem do LRU)
+    except FileNotFoundError:
+        pass
+    return table.to_pandas()
+
+
+def _write_entry(path, df):
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        feather.write_feather(pa.Table.from_pandas(df), tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def _entries(cache_path):
+    entries = []
+    for path in Path(cache_path).glob('*.feather'):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime_ns, stat.st_size, path))
+    return sorted(entries)
+
+
+def evict(cache_path=None, max_bytes=None):
+    """
+    Remove as entradas menos usadas até o diretório caber no orçamento.
+    
+    Args:
+        cache_path: Diretório do cache (padrão: o configurado)
+        max_bytes: Orçamento em bytes (padrão: o configurado)
+        
+    Returns:
+        int: Número de arquivos removidos
+    """
+    cache_path = _config['path'] if cache_path is None else cache_path
+    max_bytes = _config['max_bytes'] if max_bytes is None else max_bytes
+    
+    entries = _entries(cache_path)
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, path in entries:
+        if total <= max_bytes:
+            break
+        try:
+            path.unlink()
+            removed += 1
+        except FileNotFoundError:
+            pass
+        total -= size
+    
+    with _lock:
+        _stats['despejos'] += removed
+    return removed
+
+
+def disk_cached(func):
+    """
+    Decorator: guarda o DataFrame devolvido por `func` em disco (Feather).
+    
+    A chave combina o nome da função, os argumentos e a versão dos dados
+    processados; um novo processo (ex.: após um deploy) reaproveita os
+    resultados do anterior. A gravação é atômica (temporário + rename), então
+    processos concorrentes nunca leem um arquivo pela metade. Após cada
+    gravação as entradas menos usadas são removidas até caber no orçamento.
+    
+    Sem pyarrow, com o cache desligado ou se o resultado não for um
+    DataFrame, a função só calcula.
+    
+    Args:
+        func: Função que devolve um DataFrame; argumentos devem ser valores
+            simples (str, números, None, listas/tuplas/dicts) ou DataFrames
+            
+    Returns:
+        Função decorada
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not (_config['ativo'] and columnar_available()):
+            return func(*args, **kwargs)
+        
+        key = cache_key(func, args, kwargs, get_data_version(PROCESSED_DATA_PATH))
+        path = Path(_config['path']) / f"{func.__name__}-{key[:32]}.feather"
+        
+        if path.exists():
+            df = _read_entry(path)
+            if df is not None:
+                with _lock:
+                    _stats['hits'] += 1
+                return df
+        
+        with _lock:
+            _stats['misses'] += 1
+        df = func(*args, **kwargs)
+        
+        if isinstance(df, pd.DataFrame):
+            try:
+                _write_entry(path, df)
+            except (OSError, ValueError, TypeError, NotImplementedError):
+                # Sem espaço/permissão ou tipo sem representação em Arrow
+                return df
+            with _lock:
+                _stats['gravacoes'] += 1
+            evict()
+        return df
+    
+    return wrapper
+
+
+def disk_cache_info():
+    """
+    Estatísticas do cache em disco.
+    
+    Returns:
+        dict: hits, misses, gravações, despejos, entradas, bytes e orçamento
+    """
+    entries = _entries(_config['path'])
+    with _lock:
+        return {
+            **_stats,
+            'entradas': len(entries),
+            'bytes': sum(size for _, size, _ in entries),
+            'maximo_bytes': _config['max_bytes'],
+        }
+
+
+def clear_disk_cache():
+    """
+    Remove todos os arquivos do cache em disco e zera os contadores.
+    """
+    for _, _, path in _entries(_config['path']):
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+    with _lock:
+        _stats.update(hits=0, misses=0, gravacoes=0, despejos=0)
@@ -0,0 +1,301 @@
+"""
+Cache das figuras do dashboard (builders de utils.visualizations), com pré-geração no ETL
+"""
+import hashlib
+import inspect
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import plotly.graph_objects as go
+
+from utils.analytics import TRADE_TABLES
+from utils.cube import build_trade_cube
+from utils.figure_payload import PAYLOAD_CONFIG, compact_figure, payload_report
+from utils.instrumentation import instrumented
+from utils.processed_store import PROCESSED_DATA_PATH, get_data_version, read_processed_table
+from utils.visualizations import (
+    create_bar_chart_value,
+    create_horizontal_bar_top_countries,
+    create_line_chart_evolution,
+    create_line_chart_price_trends,
+    create_pie_chart_concentration,
+    create_scatter_price_volume,
+    create_treemap_countries
+)
+
+
+# Figuras serializadas (JSON do Plotly), uma por builder + parâmetros + versão dos dados
+FIGURES_PATH = Path(__file__).parent.parent / 'data' / 'figures'
+
+FIGURE_CACHE_SIZE = 64
+
+# Dados de entrada dos builders: 'comparacao' (tabela anual) ou o cubo de um fluxo
+FIGURE_SOURCES = ['comparacao', 'export', 'import']
+
+# Figuras das páginas: nome -> página, builder, fonte de dados e parâmetros
+DASHBOARD_FIGURES = {
+    'evolucao_volume': {
+        'pagina': 'Diagnóstico',
+        'builder': create_line_chart_evolution,
+        'fonte': 'comparacao',
+        'params': {'title': "Evolução: Exportação vs Importação (2009-2023)"},
+    },
+    'valores_usd': {
+        'pagina': 'Diagnóstico',
+        'builder': create_bar_chart_value,
+        'fonte': 'comparacao',
+        'params': {'title': "Exportação vs Importação - Valores em USD"},
+    },
+    'treemap_paises': {
+        'pagina': 'Diagnóstico',
+        'builder': create_treemap_countries,
+        'fonte': 'export',
+        'params': {'top_n': 15, 'title': "Distribuição de Exportações por País (Top 15)"},
+    },
+    'top_paises': {
+        'pagina': 'Diagnóstico',
+        'builder': create_horizontal_bar_top_countries,
+        'fonte': 'export',
+        'params': {'top_n': 15, 'title': "Volume e Valor por País"},
+    },
+    'concentracao_pizza': {
+        'pagina': 'Diagnóstico',
+        'builder': create_pie_chart_concentration,
+        'fonte': 'export',
+        'params': {'top_n': 5, 'title': "Concentração de Mercado - Top 5 + Outros"},
+    },
+    'evolucao_precos': {
+        'pagina': 'Contexto',
+        'builder': create_line_chart_price_trends,
+        'fonte': 'comparacao',
+        'params': {'title': "Evolução do Preço Médio: Exportação vs Importação"},
+    },
+    'preco_volume': {
+        'pagina': 'Contexto',
+        'builder': create_scatter_price_volume,
+        'fonte': 'export',
+        'params': {'title': "Análise de Posicionamento: Preço Médio vs Volume Exportado"},
+    },
+}
+
+_cache = OrderedDict()
+_stats = {'hits': 0, 'arquivo': 0, 'misses': 0}
+_lock = threading.Lock()
+_source_hashes = {}
+
+
+def _builder_hash(builder):
+    """
+    Hash do código-fonte do builder: alterar a função invalida as figuras.
+    """
+    if builder not in _source_hashes:
+        _source_hashes[builder] = hashlib.sha256(inspect.getsource(builder).encode()).hexdigest()
+    return _source_hashes[builder]
+
+
+def figure_key(builder, source, params, data_version):
+    """
+    Chave de uma figura: builder (nome e código), fonte, parâmetros,
+    compactação (PAYLOAD_CONFIG) e versão dos dados.
+    
+    Returns:
+        str: Hash sha256 (hex)
+    """
+    payload = {
+        'builder': f"{builder.__module__}.{builder.__qualname__}",
+        'codigo': _builder_hash(builder),
+        'fonte': source,
+        'params': params,
+        'payload': PAYLOAD_CONFIG,
+        'dados': data_version,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _figure_path(builder, key, figures_path):
+    return Path(figures_path) / f"{builder.__name__}-{key[:32]}.json"
+
+
+def _is_dashboard_figure(path):
+    """
+    True se o arquivo tem o nome de uma figura de DASHBOARD_FIGURES
+    (`<builder>-<chave>.json`, como em `_figure_path`).
+    """
+    builders = {spec['builder'].__name__ for spec in DASHBOARD_FIGURES.values()}
+    match = re.fullmatch(r'(\w+)-[0-9a-f]{32}\.json', path.name)
+    return match is not None and match.group(1) in builders
+
+
+def _runtime_source(source):
+    # Import local: data_loader depende do Streamlit
+    from utils.data_loader import get_trade_cube, load_processed_data
+    
+    if source == 'comparacao':
+        return load_processed_data()[2]
+    return get_trade_cube(source)
+
+
+def _file_source(source, data_path):
+    if source == 'comparacao':
+        return read_processed_table('comparacao', data_path)
+    _, country_col = TRADE_TABLES[source]
+    return build_trade_cube(read_processed_table(source, data_path), country_col)
+
+
+def _write_figure(path, figure_json):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        tmp_path.write_text(figure_json, encoding='utf-8')
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def _remember(key, fig):
+    with _lock:
+        _cache[key] = fig
+        _cache.move_to_end(key)
+        while len(_cache) > FIGURE_CACHE_SIZE:
+            _cache.popitem(last=False)
+
+
+def cached_figure(builder, source, **params):
+    """
+    Retorna a figura de um builder, sem refazer agregação nem construção
+    quando ela já existe para a versão atual dos dados.
+    
+    Ordem de busca: cache de processo (objetos Figure) -> JSON em
+    FIGURES_PATH (pré-gerado no ETL ou gravado por outro processo) ->
+    chamada do builder, cujo resultado é compactado (`compact_figure`) e
+    serializado para os dois níveis.
+    
+    A figura devolvida é compartilhada entre sessões: não a modifique
+    (use `go.Figure(fig)` para obter uma cópia).
+    
+    Args:
+        builder: Função de `utils.visualizations` (dados como 1º argumento)
+        source: Fonte dos dados, de FIGURE_SOURCES
+        **params: Demais argumentos do builder (valores serializáveis em JSON)
+        
+    Returns:
+        plotly.graph_objects.Figure
+    """
+    if source not in FIGURE_SOURCES:
+        raise ValueError(f"Fonte desconhecida: {source!r} (use {FIGURE_SOURCES})")
+    
+    key = figure_key(builder, source, params, get_data_version(PROCESSED_DATA_PATH))
+    
+    with _lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            _stats['hits'] += 1
+            return _cache[key]
+    
+    path = _figure_path(builder, key, FIGURES_PATH)
+    try:
+        fig = go.Figure(json.loads(path.read_text(encoding='utf-8')))
+        stat = 'arquivo'
+    except (FileNotFoundError, json.JSONDecodeError):
+        fig = compact_figure(builder(_runtime_source(source), **params))
+        stat = 'misses'
+        try:
+            _write_figure(path, fig.to_json())
+        except OSError:
+            # Diretório somente leitura: a figura fica só no cache de processo
+            pass
+    
+    with _lock:
+        _stats[stat] += 1
+    _remember(key, fig)
+    return fig
+
+
+@instrumented
+def dashboard_figure(name):
+    """
+    Figura declarada em DASHBOARD_FIGURES (via `cached_figure`).
+    """
+    spec = DASHBOARD_FIGURES[name]
+    return cached_figure(spec['builder'], spec['fonte'], **spec['params'])
+
+
+def prebuild_figures(data_path=PROCESSED_DATA_PATH, figures_path=FIGURES_PATH):
+    """
+    Gera o JSON das figuras de DASHBOARD_FIGURES para a versão atual dos
+    dados processados (executado pelo ETL) e remove as de versões antigas.
+    
+    Figuras cujo arquivo já existe para a chave atual (mesmos dados, código
+    e parâmetros) não são refeitas, e as fontes só são lidas se alguma
+    figura precisar ser gerada. A limpeza só remove arquivos com o nome de
+    figuras de DASHBOARD_FIGURES; o restante de `figures_path` é mantido.
+    
+    Args:
+        data_path: Diretório dos dados processados
+        figures_path: Diretório das figuras
+        
+    Returns:
+        list: Arquivos gravados (figuras já existentes não entram)
+    """
+    data_version = get_data_version(data_path)
+    sources = {}
+    current = set()
+    written = []
+    
+    for spec in DASHBOARD_FIGURES.values():
+        source = spec['fonte']
+        key = figure_key(spec['builder'], source, spec['params'], data_version)
+        path = _figure_path(spec['builder'], key, figures_path)
+        current.add(path)
+        if path.exists():
+            continue
+        
+        if source not in sources:
+            sources[source] = _file_source(source, data_path)
+        fig = compact_figure(spec['builder'](sources[source], **spec['params']))
+        _write_figure(path, fig.to_json())
+        written.append(path)
+    
+    for path in Path(figures_path).glob('*.json'):
+        if path not in current and _is_dashboard_figure(path):
+            path.unlink()
+    
+    return written
+
+
+def dashboard_payload_report():
+    """
+    Payload (bytes enviados ao navegador) de cada figura de DASHBOARD_FIGURES.
+    
+    Returns:
+        pd.DataFrame: pagina | figura | traces | pontos | webgl | bytes
+    """
+    report = payload_report({name: dashboard_figure(name) for name in DASHBOARD_FIGURES})
+    report.insert(0, 'pagina', [DASHBOARD_FIGURES[name]['pagina'] for name in report['figura']])
+    return report
+
+
+def figure_cache_info():
+    """
+    Estatísticas do cache de figuras.
+    
+    Returns:
+        dict: hits (processo), arquivo (JSON lido), misses (builder chamado),
+            tamanho atual e máximo do cache de processo
+    """
+    with _lock:
+        return {**_stats, 'tamanho': len(_cache), 'maximo': FIGURE_CACHE_SIZE}
+
+
+def clear_figure_cache():
+    """
+    Esvazia o cache de processo das figuras e zera os contadores.
+    """
+    with _lock:
+        _cache.clear()
+        _stats.update(hits=0, arquivo=0, misses=0)
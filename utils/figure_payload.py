@@ -0,0 +1,245 @@
+"""
+Compactação das figuras Plotly enviadas ao navegador: precisão numérica,
+redução de séries longas (LTTB) e Scattergl para dispersões grandes
+"""
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import plotly.io as pio
+
+
+# Parâmetros padrão da compactação (ver `compact_figure`)
+PAYLOAD_CONFIG = {
+    'digitos': 7,              # Dígitos significativos (7 ~ float32); 0 mantém float64
+    'max_pontos': 2000,        # Séries de linha acima disso são reduzidas por LTTB
+    'webgl_min_pontos': 1000,  # Scatter com esse número de pontos vira Scattergl
+}
+
+# Atributos de trace com um valor por ponto
+POINT_ATTRIBUTES = ['x', 'y', 'z', 'values', 'customdata', 'text', 'hovertext', 'marker.size', 'marker.color']
+
+# Propriedades de Scatter sem equivalente em Scattergl
+_SVG_ONLY = ('stackgroup', 'fill')
+
+
+def round_significant(values, digits):
+    """
+    Arredonda um array de floats para `digits` dígitos significativos.
+    
+    O resultado continua float64, mas com representação decimal curta
+    (ex.: 28323.880859375 -> 28323.88), que é o que ocupa o JSON.
+    
+    Args:
+        values: Array numérico
+        digits: Número de dígitos significativos
+        
+    Returns:
+        np.ndarray: Valores arredondados (NaN/inf/zero preservados)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    finite = np.isfinite(values) & (values != 0)
+    
+    # Expoente decimal de cada valor: escala para `digits` dígitos inteiros
+    exponent = np.zeros(values.shape, dtype=np.int64)
+    exponent[finite] = digits - 1 - np.floor(np.log10(np.abs(values[finite]))).astype(np.int64)
+    
+    # Dividir/multiplicar por potências exatas de 10 mantém a representação curta
+    up = 10.0 ** np.clip(exponent, 0, None)
+    down = 10.0 ** np.clip(-exponent, 0, None)
+    rounded = np.round(values * up / down) * down / up
+    return np.where(finite, rounded, values)
+
+
+def lttb_indices(x, y, threshold):
+    """
+    Largest-Triangle-Three-Buckets: escolhe `threshold` pontos que preservam
+    a forma visual da série (picos e vales), sempre mantendo o primeiro e o
+    último.
+    
+    Args:
+        x: Coordenadas x, numéricas e crescentes
+        y: Valores (finitos)
+        threshold: Número de pontos desejado
+        
+    Returns:
+        np.ndarray: Índices dos pontos selecionados, em ordem crescente
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    
+    # Primeiro e último ponto fixos; os demais em threshold - 2 baldes
+    edges = (np.arange(threshold - 1) * ((n - 2) / (threshold - 2))).astype(np.int64) + 1
+    edges[-1] = n - 1
+    bounds = np.append(edges, n)
+    
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start, next_end = bounds[i + 1], bounds[i + 2]
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+        
+        # Área do triângulo (ponto anterior, candidato, média do próximo balde)
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    
+    return selected
+
+
+def _point_arrays(trace):
+    """
+    Atributos por ponto definidos no trace: nome -> np.ndarray.
+    """
+    arrays = {}
+    for name in POINT_ATTRIBUTES:
+        value = trace[name] if name in trace else None
+        if value is not None and not isinstance(value, (str, int, float)):
+            arrays[name] = np.asarray(value)
+    return arrays
+
+
+def _num_points(trace):
+    arrays = _point_arrays(trace)
+    return max((len(value) for value in arrays.values() if value.ndim), default=0)
+
+
+def _numeric_x(values):
+    """
+    x como float64 para o LTTB (datas em ns), ou None se não for numérico/crescente.
+    """
+    values = np.asarray(values)
+    if values.dtype.kind == 'M' or values.dtype == object:
+        try:
+            values = pd.to_datetime(values).asi8
+        except (TypeError, ValueError):
+            return None
+    if values.dtype.kind not in 'iuf':
+        return None
+    values = values.astype(np.float64)
+    if not (np.isfinite(values).all() and (np.diff(values) >= 0).all()):
+        return None
+    return values
+
+
+def _downsample(trace, max_points):
+    """
+    Reduz por LTTB os atributos por ponto de um trace de linha longo.
+    """
+    if trace.type not in ('scatter', 'scattergl') or trace.y is None:
+        return
+    if trace.mode is not None and 'lines' not in trace.mode:
+        return
+    
+    y = np.asarray(trace.y)
+    n = len(y)
+    if n <= max_points or y.dtype.kind not in 'iuf' or not np.isfinite(y).all():
+        return
+    
+    x = np.arange(n, dtype=np.float64) if trace.x is None else _numeric_x(trace.x)
+    if x is None or len(x) != n:
+        return
+    
+    keep = lttb_indices(x, y, max_points)
+    for name, value in _point_arrays(trace).items():
+        if value.ndim and len(value) == n:
+            trace[name] = value[keep]
+
+
+def _round_arrays(trace, digits):
+    for name, value in _point_arrays(trace).items():
+        if value.dtype.kind == 'f':
+            trace[name] = round_significant(value, digits)
+
+
+def _is_large_scatter(trace, min_points):
+    if trace.type != 'scatter' or not trace.mode or 'markers' not in trace.mode:
+        return False
+    return _num_points(trace) >= min_points
+
+
+def _to_webgl(trace):
+    """
+    Scatter -> Scattergl (mesmas propriedades; as só-SVG são descartadas).
+    """
+    spec = trace.to_plotly_json()
+    spec.pop('type', None)
+    for name in _SVG_ONLY:
+        spec.pop(name, None)
+    return go.Scattergl(spec, skip_invalid=True)
+
+
+def compact_figure(fig, digits=None, max_points=None, webgl_min_points=None):
+    """
+    Reduz o payload de uma figura antes de enviá-la ao navegador.
+    
+    1. Séries de linha com mais de `max_points` pontos (x crescente) são
+       reduzidas por LTTB, junto com os demais atributos por ponto.
+    2. Dispersões (modo com marcadores) com `webgl_min_points` pontos ou
+       mais viram Scattergl, renderizadas em WebGL no navegador.
+    3. Arrays de float são arredondados para `digits` dígitos significativos.
+    
+    Parâmetros omitidos vêm de PAYLOAD_CONFIG. A figura é alterada no lugar
+    (use `go.Figure(fig)` antes para preservar a original).
+    
+    Args:
+        fig: plotly.graph_objects.Figure
+        digits: Dígitos significativos (0 = sem arredondamento)
+        max_points: Pontos máximos por série de linha
+        webgl_min_points: Pontos a partir dos quais usar Scattergl
+        
+    Returns:
+        plotly.graph_objects.Figure: A própria `fig`
+    """
+    digits = PAYLOAD_CONFIG['digitos'] if digits is None else digits
+    max_points = PAYLOAD_CONFIG['max_pontos'] if max_points is None else max_points
+    webgl_min_points = PAYLOAD_CONFIG['webgl_min_pontos'] if webgl_min_points is None else webgl_min_points
+    
+    traces = []
+    for trace in fig.data:
+        _downsample(trace, max_points)
+        if _is_large_scatter(trace, webgl_min_points):
+            trace = _to_webgl(trace)
+        if digits:
+            _round_arrays(trace, digits)
+        traces.append(trace)
+    
+    if any(new is not old for new, old in zip(traces, fig.data)):
+        fig.data = []
+        fig.add_traces(traces)
+    return fig
+
+
+def payload_bytes(fig):
+    """
+    Tamanho (bytes) do JSON da figura, como o Streamlit envia ao navegador.
+    """
+    return len(pio.to_json(fig, validate=False).encode('utf-8'))
+
+
+def payload_report(figures):
+    """
+    Tamanho do payload de cada figura.
+    
+    Args:
+        figures: dict nome -> plotly.graph_objects.Figure
+        
+    Returns:
+        pd.DataFrame: figura | traces | pontos | webgl | bytes
+    """
+    rows = []
+    for name, fig in figures.items():
+        rows.append({
+            'figura': name,
+            'traces': len(fig.data),
+            'pontos': sum(_num_points(trace) for trace in fig.data),
+            'webgl': sum(trace.type == 'scattergl' for trace in fig.data),
+            'bytes': payload_bytes(fig),
+        })
+    return pd.DataFrame(rows, columns=['figura', 'traces', 'pontos', 'webgl', 'bytes'])
@@ -0,0 +1,114 @@
+"""
+Taxas de crescimento em lote sobre matrizes país x ano
+"""
+import numpy as np
+import pandas as pd
+
+from utils.cube import year_range_slice
+
+
+def growth_rates(matrix, years):
+    """
+    Calcula, para todas as linhas de uma matriz país x ano de uma vez,
+    três medidas de crescimento anual (%) e o número de pontos válidos de cada.
+    
+    - cagr_pontas: CAGR entre a primeira e a última coluna (ano inicial e
+      final da janela); só existe se as duas pontas têm dado.
+    - crescimento_loglinear: inclinação da regressão de ln(valor) no ano,
+      convertida em taxa anual (exp(b) - 1); usa todos os anos com dado.
+    - cagr_lacunas: CAGR entre o primeiro e o último ano com dado da linha
+      (ignora anos vazios nas pontas e no meio).
+      
+    Células <= 0 ou NaN contam como "sem dado". Medidas sem pontos
+    suficientes (menos de 2) ficam NaN, em vez de 0.
+    
+    Args:
+        matrix: Array 2D (linhas x anos)
+        years: Anos das colunas, em ordem crescente
+        
+    Returns:
+        DataFrame: Uma linha por linha da matriz, com cagr_pontas | n_pontas |
+            crescimento_loglinear | n_loglinear | cagr_lacunas | n_lacunas |
+            ano_inicial | ano_final
+    """
+    values = np.asarray(matrix, dtype=np.float64)
+    years = np.asarray(years, dtype=np.float64)
+    num_rows, num_years = values.shape
+    rows = np.arange(num_rows)
+    
+    valid = values > 0
+    n_valid = valid.sum(axis=1)
+    
+    if num_years == 0:
+        nan = np.full(num_rows, np.nan)
+        return pd.DataFrame({
+            'cagr_pontas': nan, 'n_pontas': n_valid,
+            'crescimento_loglinear': nan, 'n_loglinear': n_valid,
+            'cagr_lacunas': nan, 'n_lacunas': n_valid,
+            'ano_inicial': pd.array([pd.NA] * num_rows, dtype='Int64'),
+            'ano_final': pd.array([pd.NA] * num_rows, dtype='Int64'),
+        })
+    
+    log_values = np.log(np.where(valid, values, 1.0))
+    
+    # Pontas da janela
+    n_ends = valid[:, 0].astype(np.int64) + valid[:, -1]
+    span = years[-1] - years[0]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cagr_pontas = (np.exp((log_values[:, -1] - log_values[:, 0]) / span) - 1) * 100
+    cagr_pontas = np.where((n_ends == 2) & (span > 0), cagr_pontas, np.nan)
+    
+    # Regressão log-linear: mínimos quadrados só nos anos com dado
+    t = years - years.mean()
+    w = valid.astype(np.float64)
+    sum_t = w @ t
+    sum_tt = w @ (t * t)
+    sum_y = (w * log_values).sum(axis=1)
+    sum_ty = (w * log_values) @ t
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slope = (n_valid * sum_ty - sum_t * sum_y) / (n_valid * sum_tt - sum_t ** 2)
+    loglinear = np.where(n_valid >= 2, (np.exp(slope) - 1) * 100, np.nan)
+    
+    # Primeiro e último ano com dado de cada linha
+    first = np.argmax(valid, axis=1)
+    last = num_years - 1 - np.argmax(valid[:, ::-1], axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cagr_lacunas = (np.power(values[rows, last] / values[rows, first], 1 / (years[last] - years[first])) - 1) * 100
+    cagr_lacunas = np.where(n_valid >= 2, cagr_lacunas, np.nan)
+    
+    has_data = n_valid > 0
+    ano_inicial = pd.array(years[first].astype(np.int64), dtype='Int64')
+    ano_final = pd.array(years[last].astype(np.int64), dtype='Int64')
+    ano_inicial[~has_data] = pd.NA
+    ano_final[~has_data] = pd.NA
+    
+    return pd.DataFrame({
+        'cagr_pontas': cagr_pontas,
+        'n_pontas': n_ends,
+        'crescimento_loglinear': loglinear,
+        'n_loglinear': n_valid,
+        'cagr_lacunas': cagr_lacunas,
+        'n_lacunas': n_valid,
+        'ano_inicial': ano_inicial,
+        'ano_final': ano_final,
+    })
+
+
+def market_growth(cube, measure='valor_usd', year_start=None, year_end=None):
+    """
+    Crescimento de todos os países do cubo numa janela de anos.
+    
+    Args:
+        cube: Cubo de `utils.cube.build_trade_cube`
+        measure: 'valor_usd' ou 'quantidade_litros'
+        year_start: Ano inicial da janela (inclusivo); None = primeiro ano
+        year_end: Ano final da janela (inclusivo); None = último ano
+        
+    Returns:
+        DataFrame: <país> | pais_id | colunas de `growth_rates`
+    """
+    i, j = year_range_slice(cube, year_start, year_end)
+    rates = growth_rates(cube['valores'][measure][:, i:j], cube['anos'][i:j])
+    rates.insert(0, 'pais_id', cube['pais_ids'])
+    rates.insert(0, cube['country_col'], cube['paises'])
+    return rates
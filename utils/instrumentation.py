@@ -0,0 +1,372 @@
+"""
+Instrumentação opcional (tempo, linhas e memória por função) e painel de diagnóstico
+"""
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from utils.tracing import session_id, span, tracing_enabled
+
+
+# Variável de ambiente que liga a instrumentação desde o início do processo:
+# '1' mede tempo e linhas; 'memoria' também mede a memória alocada (tracemalloc)
+INSTRUMENTATION_ENV = 'WINE_DIAGNOSTICO'
+
+# Parâmetro de URL que mostra o painel e liga a instrumentação só da sessão: ?diagnostico=1
+DIAGNOSTICS_QUERY_PARAM = 'diagnostico'
+
+# Amostras de tempo guardadas por (sessão, função) para o p95
+MAX_SAMPLES = 2048
+
+# Sessão usada fora do Streamlit (scripts, benchmarks, ETL)
+PROCESS_SESSION = 'processo'
+
+TABLE_COLUMNS = ['funcao', 'chamadas', 'total_ms', 'medio_ms', 'p95_ms',
+                 'linhas_entrada', 'linhas_saida', 'memoria_max_mib']
+
+_state = {'ativo': False, 'memoria': False}
+_sessions = set()
+_stats = {}
+_lock = threading.Lock()
+_local = threading.local()
+
+# O pico do tracemalloc é do processo: chamadas medidas de threads diferentes
+# (sessões em paralelo) são serializadas para que um reset_peak não apague o
+# pico de outra chamada em andamento
+_memory_lock = threading.RLock()
+
+
+def enable_instrumentation(memory=False):
+    """
+    Liga a coleta (processo inteiro). Com `memory`, inicia o tracemalloc
+    para medir a memória alocada por chamada, o que deixa tudo mais lento
+    e serializa as chamadas instrumentadas entre threads.
+    
+    Args:
+        memory: Se True, mede também a memória
+    """
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    _state.update(ativo=True, memoria=memory or _state['memoria'])
+
+
+def disable_instrumentation():
+    """
+    Desliga a coleta (e o tracemalloc, se foi ligado por aqui). Os dados já coletados ficam.
+    """
+    if _state['memoria'] and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    _state.update(ativo=False, memoria=False)
+
+
+def instrumentation_enabled():
+    return _state['ativo']
+
+
+def enable_session_instrumentation(session):
+    """
+    Liga a coleta de tempo e linhas só para uma sessão do Streamlit
+    (as demais sessões continuam sem custo). A memória só é medida com a
+    coleta ligada no processo inteiro (INSTRUMENTATION_ENV=memoria).
+    
+    Args:
+        session: Id da sessão (`utils.tracing.session_id`)
+    """
+    with _lock:
+        _sessions.add(session)
+
+
+def disable_session_instrumentation(session):
+    """
+    Desliga a coleta da sessão (os dados já coletados ficam).
+    """
+    with _lock:
+        _sessions.discard(session)
+
+
+def _recording():
+    # Coleta ligada para a chamada atual: processo inteiro ou sessão habilitada
+    return _state['ativo'] or (bool(_sessions) and session_id(PROCESS_SESSION) in _sessions)
+
+
+def _rows(value):
+    if isinstance(value, (pd.DataFrame, pd.Series, np.ndarray)):
+        return len(value)
+    if isinstance(value, (tuple, list)):
+        return sum(_rows(item) for item in value)
+    return 0
+
+
+def _memory_enter():
+    """
+    Abre um quadro de memória. O pico do tracemalloc é global: antes de
+    zerá-lo, ele é repassado aos quadros abertos (chamadas instrumentadas
+    aninhadas), para que cada um guarde o pico do seu próprio intervalo.
+    """
+    stack = getattr(_local, 'frames', None)
+    if stack is None:
+        stack = _local.frames = []
+    current, peak = tracemalloc.get_traced_memory()
+    for frame in stack:
+        frame['pico'] = max(frame['pico'], peak)
+    tracemalloc.reset_peak()
+    frame = {'inicio': current, 'pico': current}
+    stack.append(frame)
+    return frame
+
+
+def _memory_exit(frame):
+    _, peak = tracemalloc.get_traced_memory()
+    _local.frames.remove(frame)
+    for open_frame in _local.frames:
+        open_frame['pico'] = max(open_frame['pico'], peak)
+    return max(frame['pico'], peak) - frame['inicio']
+
+
+def _record(session, name, elapsed, rows_in, rows_out, allocated):
+    with _lock:
+        stats = _stats.get((session, name))
+        if stats is None:
+            stats = _stats[(session, name)] = {
+                'chamadas': 0, 'total_s': 0.0, 'amostras': deque(maxlen=MAX_SAMPLES),
+                'linhas_entrada': 0, 'linhas_saida': 0, 'memoria_max': None,
+            }
+        stats['chamadas'] += 1
+        stats['total_s'] += elapsed
+        stats['amostras'].append(elapsed)
+        stats['linhas_entrada'] += rows_in
+        stats['linhas_saida'] += rows_out
+        if allocated is not None:
+            stats['memoria_max'] = max(stats['memoria_max'] or 0, allocated)
+
+
+def instrumented(func=None, *, name=None):
+    """
+    Decorator: registra chamadas, tempo, linhas de entrada/saída (DataFrames,
+    Series e arrays nos argumentos e no retorno) e, se ligado, a memória
+    alocada, agregados por sessão do Streamlit.
+    
+    Desligado (padrão), o custo é uma verificação por chamada. Liga no
+    processo com a variável de ambiente INSTRUMENTATION_ENV ou com
+    `enable_instrumentation()`, ou só numa sessão com ?diagnostico=1 na
+    URL (ver `diagnostics_panel`).
+    Com o tracer ligado (`utils.tracing`), cada chamada também vira um span.
+    
+    Uso: `@instrumented` ou `@instrumented(name='consulta')`.
+    
+    Args:
+        func: Função decorada
+        name: Nome exibido (padrão: módulo.função)
+        
+    Returns:
+        Função decorada
+    """
+    if func is None:
+        return functools.partial(instrumented, name=name)
+    
+    label = name or f"{func.__module__.removeprefix('utils.')}.{func.__qualname__}"
+    
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _recording():
+            if not tracing_enabled():
+                return func(*args, **kwargs)
+            with span(label):
+                return func(*args, **kwargs)
+        
+        with span(label):
+            return _measured(func, label, args, kwargs)
+    
+    return wrapper
+
+
+def _measured(func, label, args, kwargs):
+    if _state['memoria'] and tracemalloc.is_tracing():
+        # Alocações de threads fora de chamadas instrumentadas ainda entram no pico
+        with _memory_lock:
+            frame = _memory_enter()
+            start = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                allocated = _memory_exit(frame)
+    else:
+        start = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+        allocated = None
+    
+    rows_in = sum(_rows(value) for value in args) + sum(_rows(value) for value in kwargs.values())
+    _record(session_id(PROCESS_SESSION), label, elapsed, rows_in, _rows(result), allocated)
+    return result
+
+
+def instrumentation_table(session=None):
+    """
+    Estatísticas agregadas por função.
+    
+    Args:
+        session: Id da sessão do Streamlit; None agrega o processo inteiro
+        
+    Returns:
+        pd.DataFrame: funcao | chamadas | total_ms | medio_ms | p95_ms |
+            linhas_entrada | linhas_saida | memoria_max_mib (ordenado por total_ms)
+    """
+    merged = {}
+    with _lock:
+        for (stats_session, name), stats in _stats.items():
+            if session is not None and stats_session != session:
+                continue
+            row = merged.setdefault(name, {'chamadas': 0, 'total_s': 0.0, 'amostras': [],
+                                           'linhas_entrada': 0, 'linhas_saida': 0, 'memoria_max': None})
+            row['chamadas'] += stats['chamadas']
+            row['total_s'] += stats['total_s']
+            row['amostras'].extend(stats['amostras'])
+            row['linhas_entrada'] += stats['linhas_entrada']
+            row['linhas_saida'] += stats['linhas_saida']
+            if stats['memoria_max'] is not None:
+                row['memoria_max'] = max(row['memoria_max'] or 0, stats['memoria_max'])
+    
+    rows = [{
+        'funcao': name,
+        'chamadas': row['chamadas'],
+        'total_ms': row['total_s'] * 1000,
+        'medio_ms': row['total_s'] * 1000 / row['chamadas'],
+        'p95_ms': float(np.percentile(row['amostras'], 95)) * 1000,
+        'linhas_entrada': row['linhas_entrada'],
+        'linhas_saida': row['linhas_saida'],
+        'memoria_max_mib': None if row['memoria_max'] is None else row['memoria_max'] / 1024 / 1024,
+    } for name, row in merged.items()]
+    
+    table = pd.DataFrame(rows, columns=TABLE_COLUMNS)
+    return table.sort_values('total_ms', ascending=False, ignore_index=True)
+
+
+def export_jsonl(path=None, session=None):
+    """
+    Exporta a tabela de `instrumentation_table` em JSON Lines (uma função por linha).
+    
+    Args:
+        path: Arquivo de saída (acrescenta ao final); None só retorna o texto
+        session: Como em `instrumentation_table`
+        
+    Returns:
+        str: Conteúdo JSONL
+    """
+    timestamp = datetime.now().isoformat(timespec='seconds')
+    scope = session or PROCESS_SESSION
+    lines = []
+    for record in instrumentation_table(session).to_dict(orient='records'):
+        record = {key: (None if isinstance(value, float) and np.isnan(value) else value)
+                  for key, value in record.items()}
+        lines.append(json.dumps({'timestamp': timestamp, 'escopo': scope, **record}, ensure_ascii=False))
+    text = ''.join(f"{line}\n" for line in lines)
+    
+    if path is not None:
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(text)
+    return text
+
+
+def reset_instrumentation(session=None):
+    """
+    Descarta as estatísticas de uma sessão (ou de todas, com None).
+    """
+    with _lock:
+        for key in [key for key in _stats if session is None or key[0] == session]:
+            del _stats[key]
+
+
+def cache_table():
+    """
+    Estatísticas dos caches de processo do dashboard, uma linha por cache.
+    
+    Returns:
+        pd.DataFrame: cache | hits | misses | tamanho | maximo (e 'arquivo',
+            figuras lidas do JSON pré-gerado)
+    """
+    # Imports locais: as camadas de consultas e de figuras também são instrumentadas
+    from utils.figure_cache import figure_cache_info
+    from utils.query import query_cache_info
+    
+    caches = {'consultas': query_cache_info(), 'figuras': figure_cache_info()}
+    return pd.DataFrame([{'cache': name, **info} for name, info in caches.items()]).convert_dtypes()
+
+
+def diagnostics_panel():
+    """
+    Painel de diagnóstico na sidebar, oculto por padrão.
+    
+    Aparece com ?diagnostico=1 na URL, que liga a instrumentação só desta
+    sessão (tirar o parâmetro desliga), ou com a variável de ambiente
+    INSTRUMENTATION_ENV, que a liga no processo inteiro. A memória por
+    chamada só é medida com INSTRUMENTATION_ENV=memoria: o tracemalloc
+    deixa todas as sessões mais lentas. Mostra a tabela da sessão ou do processo, atualizada a cada
+    poucos segundos, as estatísticas dos caches (`cache_table`) e, sob
+    demanda, o payload das figuras do dashboard; permite baixar os dados
+    em JSONL. Chame no fim da página, para que a tabela já inclua o rerun
+    atual.
+    """
+    import streamlit as st
+    
+    session = session_id(PROCESS_SESSION)
+    requested = st.query_params.get(DIAGNOSTICS_QUERY_PARAM, '0') != '0'
+    if requested:
+        enable_session_instrumentation(session)
+    else:
+        disable_session_instrumentation(session)
+    
+    if not (requested or instrumentation_enabled()):
+        return
+    
+    @st.fragment(run_every=5)
+    def live_table():
+        scope = st.radio("Escopo", ['Sessão', 'Processo'], horizontal=True, key='_diagnostico_escopo')
+        selected = session if scope == 'Sessão' else None
+        
+        table = instrumentation_table(selected)
+        if table.empty:
+            st.caption("Nenhuma chamada instrumentada ainda — interaja com a página.")
+        else:
+            st.dataframe(table, hide_index=True, use_container_width=True)
+        if not _state['memoria']:
+            st.caption(f"Memória por chamada: inicie o app com {INSTRUMENTATION_ENV}=memoria.")
+        
+        st.download_button(
+            "⬇️ Exportar JSONL",
+            data=export_jsonl(session=selected),
+            file_name=f"diagnostico-{datetime.now():%Y%m%d-%H%M%S}.jsonl",
+            mime='application/x-ndjson',
+            key='_diagnostico_jsonl'
+        )
+        
+        st.caption("Caches (processo)")
+        st.dataframe(cache_table(), hide_index=True, use_container_width=True)
+    
+    with st.sidebar:
+        with st.expander("🩺 Diagnóstico", expanded=True):
+            live_table()
+            
+            # Fora do fragmento: serializa todas as figuras, só quando pedido
+            if st.toggle("📦 Payload das figuras", key='_diagnostico_payload'):
+                from utils.figure_cache import dashboard_payload_report
+                
+                report = dashboard_payload_report()
+                st.dataframe(report, hide_index=True, use_container_width=True)
+                st.caption(f"Total: {report['bytes'].sum() / 1024:.1f} KiB em {len(report)} figuras")
+
+
+# Ligada pelo ambiente desde o import (ex.: WINE_DIAGNOSTICO=1 streamlit run Home.py)
+if os.environ.get(INSTRUMENTATION_ENV, '0') != '0':
+    enable_instrumentation(memory=os.environ[INSTRUMENTATION_ENV] == 'memoria')
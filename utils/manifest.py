@@ -0,0 +1,160 @@
+"""
+Manifesto de hashes para o ETL incremental do projeto Wine Export Analysis
+"""
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+
+
+MANIFEST_FILE = 'manifest.json'
+
+# Incrementar quando a lógica de processamento mudar (força reprocessamento total)
+PIPELINE_VERSION = 4
+
+
+def load_manifest(output_path):
+    """
+    Lê o manifesto do diretório de saída.
+    
+    Args:
+        output_path: Diretório dos dados processados
+        
+    Returns:
+        dict: Manifesto (vazio se inexistente, corrompido ou de outra versão)
+    """
+    path = Path(output_path) / MANIFEST_FILE
+    
+    try:
+        with open(path, encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        manifest = {}
+    
+    if manifest.get('versao') != PIPELINE_VERSION:
+        manifest = {'versao': PIPELINE_VERSION, 'tabelas': {}}
+    
+    return manifest
+
+
+def save_manifest(manifest, output_path):
+    """
+    Grava o manifesto de forma atômica (arquivo temporário + rename).
+    
+    Args:
+        manifest: Manifesto a gravar
+        output_path: Diretório dos dados processados
+    """
+    path = Path(output_path) / MANIFEST_FILE
+    tmp_path = path.with_suffix('.json.tmp')
+    
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False, sort_keys=True)
+    
+    os.replace(tmp_path, path)
+
+
+def file_fingerprint(path, previous=None):
+    """
+    Calcula a impressão digital (sha256, tamanho, mtime) de um arquivo.
+    
+    Se tamanho e mtime coincidem com a entrada anterior, o hash gravado é
+    reaproveitado sem ler o arquivo — execuções sem mudanças ficam em O(stat).
+    
+    Args:
+        path: Caminho do arquivo
+        previous: Entrada anterior do manifesto para este arquivo (opcional)
+        
+    Returns:
+        dict: {'sha256', 'size', 'mtime_ns'} ou None se o arquivo não existe
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    
+    if (previous is not None
+            and previous.get('size') == stat.st_size
+            and previous.get('mtime_ns') == stat.st_mtime_ns):
+        return dict(previous)
+    
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    
+    return {
+        'sha256': digest.hexdigest(),
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns
+    }
+
+
+def _fingerprints(paths, previous_entries):
+    return {
+        Path(path).name: file_fingerprint(path, previous_entries.get(Path(path).name))
+        for path in paths
+    }
+
+
+def _same_content(current, recorded):
+    if set(current) != set(recorded):
+        return False
+    return all(
+        fp is not None and fp['sha256'] == recorded[name]['sha256']
+        for name, fp in current.items()
+    )
+
+
+def is_stale(manifest, table, inputs, outputs):
+    """
+    Verifica se uma tabela derivada precisa ser reconstruída.
+    
+    Uma tabela está desatualizada se algum input mudou de conteúdo, se algum
+    output sumiu/foi alterado, ou se ela não consta no manifesto. Quando o
+    conteúdo não mudou, tamanho/mtime da entrada são atualizados para que a
+    próxima execução use o caminho rápido (ex.: após um `git checkout`).
+    
+    Args:
+        manifest: Manifesto carregado por `load_manifest`
+        table: Nome da tabela derivada
+        inputs: Caminhos dos arquivos de entrada
+        outputs: Caminhos dos arquivos de saída
+        
+    Returns:
+        bool: True se precisa reprocessar
+    """
+    entry = manifest['tabelas'].get(table)
+    if entry is None:
+        return True
+    
+    current_inputs = _fingerprints(inputs, entry['inputs'])
+    current_outputs = _fingerprints(outputs, entry['outputs'])
+    
+    if not (_same_content(current_inputs, entry['inputs'])
+            and _same_content(current_outputs, entry['outputs'])):
+        return True
+    
+    entry['inputs'] = current_inputs
+    entry['outputs'] = current_outputs
+    return False
+
+
+def record_table(manifest, table, inputs, outputs):
+    """
+    Registra no manifesto os hashes atuais de inputs e outputs de uma tabela.
+    
+    Args:
+        manifest: Manifesto carregado por `load_manifest`
+        table: Nome da tabela derivada
+        inputs: Caminhos dos arquivos de entrada
+        outputs: Caminhos dos arquivos de saída
+    """
+    previous = manifest['tabelas'].get(table, {'inputs': {}, 'outputs': {}})
+    
+    manifest['tabelas'][table] = {
+        'inputs': _fingerprints(inputs, previous['inputs']),
+        'outputs': _fingerprints(outputs, previous['outputs']),
+        'atualizado_em': datetime.now(timezone.utc).isoformat(timespec='seconds')
+    }
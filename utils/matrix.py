@@ -0,0 +1,260 @@
+"""
+Matriz país x ano (um plano por medida), densa ou esparsa conforme o preenchimento
+"""
+import numpy as np
+import pandas as pd
+
+
+# Medidas guardadas em cada célula; 'registros' conta as linhas da tabela long
+MATRIX_MEASURES = ['quantidade_litros', 'valor_usd']
+
+# Abaixo desta fração de células preenchidas os planos são guardados esparsos
+SPARSE_FILL_THRESHOLD = 0.25
+
+
+def sparse_available():
+    """
+    Indica se o scipy está instalado (necessário para o armazenamento esparso).
+    """
+    try:
+        import scipy.sparse  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _check_country_keys(names, first_row, pais_idx, num_paises):
+    """
+    Cada pais_id tem um único nome e cada nome um único pais_id.
+    """
+    if isinstance(names.dtype, pd.CategoricalDtype):
+        codes = names.cat.codes.to_numpy()
+    else:
+        codes = pd.factorize(names)[0]
+    first_codes = codes[first_row]
+    
+    if (codes != first_codes[pais_idx]).any() or len(np.unique(first_codes)) != num_paises:
+        raise ValueError(
+            f"'pais_id' e '{names.name}' não correspondem 1:1; reprocesse os dados "
+            "com a dimensão de países atual (utils.countries)"
+        )
+
+
+class CountryYearMatrix:
+    """
+    Container país x ano com um plano (matriz 2D) por medida.
+    
+    As linhas seguem `pais_ids` (ordem crescente) e as colunas seguem `anos`
+    (todos os anos do intervalo, inclusive os sem dados). Os planos são
+    arrays NumPy (denso) ou `scipy.sparse.csr_array` (esparso); a escolha é
+    feita pela fração de células preenchidas.
+    
+    Trate como somente leitura: os recortes por ano de uma matriz densa são
+    views dos planos originais.
+    """
+    
+    def __init__(self, planes, pais_ids, anos, paises, country_col='pais_destino'):
+        self.planes = planes
+        self.pais_ids = np.asarray(pais_ids)
+        self.anos = np.asarray(anos)
+        self.paises = np.asarray(paises, dtype=object)
+        self.country_col = country_col
+    
+    @classmethod
+    def from_long(cls, df, country_col='pais_destino', measures=MATRIX_MEASURES, sparse=None):
+        """
+        Monta a matriz a partir da tabela long processada (uma passada).
+        
+        Args:
+            df: DataFrame de exportação/importação (pais_id | ano | medidas)
+            country_col: Coluna com o nome do país
+            measures: Medidas a somar em cada célula
+            sparse: True/False força o formato; None escolhe pelo preenchimento
+            
+        Returns:
+            CountryYearMatrix
+            
+        Raises:
+            ValueError: Se `pais_id` e o nome do país não correspondem 1:1
+                (as linhas da matriz não bateriam com um groupby pelo nome)
+        """
+        pais_ids, first_row, pais_idx = np.unique(
+            df['pais_id'].to_numpy(), return_index=True, return_inverse=True
+        )
+        _check_country_keys(df[country_col], first_row, pais_idx, len(pais_ids))
+        ano = df['ano'].to_numpy().astype(np.int64)
+        anos = np.arange(ano.min(), ano.max() + 1) if len(df) else np.array([], dtype=np.int64)
+        shape = (len(pais_ids), len(anos))
+        year_idx = ano - (anos[0] if len(anos) else 0)
+        
+        # Índice plano da célula de cada registro
+        cell = pais_idx * shape[1] + year_idx
+        size = shape[0] * shape[1]
+        
+        planes = {}
+        for measure in measures:
+            values = df[measure].to_numpy()
+            plane = np.bincount(cell, weights=values, minlength=size).reshape(shape)
+            if np.issubdtype(values.dtype, np.integer):
+                plane = plane.astype(np.int64)
+            planes[measure] = plane
+        planes['registros'] = np.bincount(cell, minlength=size).reshape(shape)
+        
+        paises = df[country_col].to_numpy()[first_row]
+        matrix = cls(planes, pais_ids, anos, paises, country_col)
+        
+        if sparse is None:
+            sparse = matrix.fill_ratio < SPARSE_FILL_THRESHOLD and sparse_available()
+        return matrix.to_sparse() if sparse else matrix
+    
+    @property
+    def shape(self):
+        return (len(self.pais_ids), len(self.anos))
+    
+    @property
+    def is_sparse(self):
+        return not isinstance(self.planes['registros'], np.ndarray)
+    
+    @property
+    def fill_ratio(self):
+        """
+        Fração de células país x ano com pelo menos um registro.
+        """
+        size = self.shape[0] * self.shape[1]
+        if size == 0:
+            return 0.0
+        registros = self.planes['registros']
+        filled = registros.count_nonzero() if self.is_sparse else np.count_nonzero(registros)
+        return filled / size
+    
+    @property
+    def measures(self):
+        return [name for name in self.planes if name != 'registros']
+    
+    def to_sparse(self):
+        """
+        Cópia com os planos em CSR (scipy.sparse).
+        """
+        if self.is_sparse:
+            return self
+        from scipy.sparse import csr_array
+        
+        planes = {name: csr_array(plane) for name, plane in self.planes.items()}
+        return CountryYearMatrix(planes, self.pais_ids, self.anos, self.paises, self.country_col)
+    
+    def to_dense(self):
+        """
+        Versão com os planos como arrays NumPy.
+        """
+        if not self.is_sparse:
+            return self
+        planes = {name: plane.toarray() for name, plane in self.planes.items()}
+        return CountryYearMatrix(planes, self.pais_ids, self.anos, self.paises, self.country_col)
+    
+    def dense(self, measure):
+        """
+        Plano de uma medida como array NumPy 2D.
+        """
+        plane = self.planes[measure]
+        return plane.toarray() if self.is_sparse else plane
+    
+    def presence(self):
+        """
+        Máscara booleana (países x anos) das células com registros.
+        """
+        return self.dense('registros') > 0
+    
+    def year_slice(self, year_start=None, year_end=None):
+        """
+        Posições [i, j) das colunas de um intervalo de anos (inclusivo).
+        """
+        i = 0 if year_start is None else int(np.searchsorted(self.anos, year_start, side='left'))
+        j = len(self.anos) if year_end is None else int(np.searchsorted(self.anos, year_end, side='right'))
+        return i, max(i, j)
+    
+    def select_years(self, year_start=None, year_end=None):
+        """
+        Recorte por intervalo de anos (colunas contíguas).
+        
+        Na matriz densa os planos do recorte são views (sem cópia); o
+        intervalo completo devolve a própria matriz.
+        """
+        i, j = self.year_slice(year_start, year_end)
+        if (i, j) == (0, len(self.anos)):
+            return self
+        planes = {name: plane[:, i:j] for name, plane in self.planes.items()}
+        return CountryYearMatrix(planes, self.pais_ids, self.anos[i:j], self.paises, self.country_col)
+    
+    def select_countries(self, pais_ids):
+        """
+        Recorte por países (linhas), na ordem de `pais_ids`.
+        
+        Raises:
+            KeyError: Se algum pais_id não está na matriz
+        """
+        pais_ids = np.asarray(pais_ids)
+        rows = np.minimum(np.searchsorted(self.pais_ids, pais_ids), len(self.pais_ids) - 1)
+        missing = pais_ids if len(self.pais_ids) == 0 else pais_ids[self.pais_ids[rows] != pais_ids]
+        if len(missing):
+            raise KeyError(f"pais_id fora da matriz: {missing.tolist()}")
+        
+        planes = {name: plane[rows] for name, plane in self.planes.items()}
+        return CountryYearMatrix(planes, pais_ids, self.anos, self.paises[rows], self.country_col)
+    
+    def row(self, pais_id):
+        """
+        Série anual de um país.
+        
+        Returns:
+            DataFrame: ano | medidas (anos sem registro com 0)
+        """
+        sub = self.select_countries([pais_id])
+        data = {'ano': self.anos}
+        for measure in self.measures:
+            data[measure] = sub.dense(measure)[0]
+        return pd.DataFrame(data)
+    
+    def column(self, ano):
+        """
+        Valores de todos os países em um ano.
+        
+        Returns:
+            DataFrame: <país> | pais_id | medidas (países sem registro com 0)
+        """
+        i, j = self.year_slice(ano, ano)
+        if i == j:
+            raise KeyError(f"Ano fora da matriz: {ano}")
+        data = {self.country_col: self.paises, 'pais_id': self.pais_ids}
+        for measure in self.measures:
+            data[measure] = self.dense(measure)[:, i]
+        return pd.DataFrame(data)
+    
+    def sum(self, measure, axis):
+        """
+        Soma marginal de uma medida.
+        
+        Args:
+            measure: Nome da medida (ou 'registros')
+            axis: 1 = por país (linhas), 0 = por ano (colunas)
+            
+        Returns:
+            ndarray: Um valor por país (axis=1) ou por ano (axis=0)
+        """
+        return np.asarray(self.planes[measure].sum(axis=axis)).ravel()
+    
+    def to_long(self):
+        """
+        Converte de volta para a tabela long (uma linha por célula com registros).
+        
+        Returns:
+            DataFrame: <país> | pais_id | ano | medidas, ordenado por país e ano
+        """
+        rows, cols = np.nonzero(self.presence())
+        data = {
+            self.country_col: self.paises[rows],
+            'pais_id': self.pais_ids[rows],
+            'ano': self.anos[cols],
+        }
+        for measure in self.measures:
+            data[measure] = self.dense(measure)[rows, cols]
+        return pd.DataFrame(data)
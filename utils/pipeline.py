@@ -0,0 +1,259 @@
+"""
+Runner do pipeline de processamento: estágios com dependências, executados em paralelo
+"""
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+
+from utils.data_processing import (
+    TRADE_TABLES,
+    create_comparison_table,
+    process_domestic_data,
+    process_export_data,
+    process_import_data,
+    process_trade_data_chunked,
+    sort_trade_table,
+    yearly_totals_chunked
+)
+from utils.countries import country_dimension_path, report_unmatched_countries
+from utils.manifest import is_stale, load_manifest, record_table, save_manifest
+from utils.processed_store import columnar_available, processed_files, write_processed_table
+from utils.raw_data import RAW_SCHEMAS, read_raw_dataset
+
+
+DOMESTIC_TABLES = ['producao', 'processamento', 'comercializacao']
+
+
+def build_trade_table(table, data_path, output_path, chunksize=None):
+    """
+    Estágio: exportação ou importação (em memória ou em streaming), com a
+    dimensão de países de `country_dimension_path(data_path)`, gravada
+    ordenada por ano (`sort_trade_table`).
+    
+    Returns:
+        int: Número de registros gravados
+    """
+    if chunksize:
+        return process_trade_data_chunked(table, data_path, output_path, chunksize)
+    
+    dataset, _ = TRADE_TABLES[table]
+    process = process_export_data if table == 'export' else process_import_data
+    df = process(read_raw_dataset(dataset, data_path), country_path=country_dimension_path(data_path))
+    report_unmatched_countries(table, df.attrs['paises_sem_id'])
+    write_processed_table(sort_trade_table(df), table, output_path)
+    return len(df)
+
+
+def build_domestic_table(dataset, data_path, output_path):
+    """
+    Estágio: produção, processamento ou comercialização.
+    
+    Returns:
+        int: Número de registros gravados
+    """
+    df = process_domestic_data(read_raw_dataset(dataset, data_path), dataset)
+    write_processed_table(df, dataset, output_path)
+    return len(df)
+
+
+def build_comparison_table(output_path, chunksize=None):
+    """
+    Estágio: comparação anual exportação x importação, a partir dos CSVs processados.
+    
+    Returns:
+        int: Número de registros gravados
+    """
+    chunksize = chunksize or 100_000
+    df_export = yearly_totals_chunked(processed_files('export', output_path)[0], chunksize)
+    df_import = yearly_totals_chunked(processed_files('import', output_path)[0], chunksize)
+    df = create_comparison_table(df_export, df_import)
+    write_processed_table(df, 'comparacao', output_path)
+    return len(df)
+
+
+def build_stages(data_path, output_path, chunksize=None):
+    """
+    Descreve cada tabela derivada como um estágio do pipeline.
+    
+    Args:
+        data_path: Caminho dos dados brutos
+        output_path: Caminho dos dados processados
+        chunksize: Modo streaming para exportação/importação
+        
+    Returns:
+        dict: nome -> {'func', 'args', 'deps', 'inputs', 'outputs'}
+    """
+    data_path = Path(data_path)
+    output_path = Path(output_path)
+    stages = {}
+    
+    for table, (dataset, _) in TRADE_TABLES.items():
+        stages[table] = {
+            'func': build_trade_table,
+            'args': (table, data_path, output_path, chunksize),
+            'deps': [],
+            'inputs': [data_path / RAW_SCHEMAS[dataset]['arquivo'], country_dimension_path(data_path)],
+            'outputs': processed_files(table, output_path),
+        }
+    
+    for dataset in DOMESTIC_TABLES:
+        stages[dataset] = {
+            'func': build_domestic_table,
+            'args': (dataset, data_path, output_path),
+            'deps': [],
+            'inputs': [data_path / RAW_SCHEMAS[dataset]['arquivo']],
+            'outputs': processed_files(dataset, output_path),
+        }
+    
+    # A comparação depende só dos CSVs processados, não dos brutos
+    stages['comparacao'] = {
+        'func': build_comparison_table,
+        'args': (output_path, chunksize),
+        'deps': ['export', 'import'],
+        'inputs': [processed_files('export', output_path)[0], processed_files('import', output_path)[0]],
+        'outputs': processed_files('comparacao', output_path),
+    }
+    
+    return stages
+
+
+def _timed_call(func, args):
+    start = time.perf_counter()
+    num_rows = func(*args)
+    return num_rows, time.perf_counter() - start
+
+
+def critical_path(stages, durations):
+    """
+    Calcula o caminho crítico (sequência de dependências mais longa).
+    
+    Args:
+        stages: Estágios de `build_stages`
+        durations: dict nome -> duração em segundos (0 para estágios pulados)
+        
+    Returns:
+        tuple: (lista de estágios do caminho, duração total em segundos)
+    """
+    finish = {}
+    previous = {}
+    
+    def longest(name):
+        if name not in finish:
+            deps = stages[name]['deps']
+            best = max(deps, key=longest) if deps else None
+            previous[name] = best
+            finish[name] = durations.get(name, 0.0) + (finish[best] if best else 0.0)
+        return finish[name]
+    
+    end = max(stages, key=longest)
+    path = []
+    while end is not None:
+        path.append(end)
+        end = previous[end]
+    
+    return path[::-1], finish[path[0]]
+
+
+def run_pipeline(data_path='data/raw', output_path='data/processed', force=False,
+                 chunksize=None, max_workers=None):
+    """
+    Executa o pipeline: estágios independentes rodam em paralelo num pool de
+    processos e cada estágio só é agendado após suas dependências.
+    
+    Estágios cujos inputs e outputs não mudaram (segundo o manifesto) são
+    pulados. Ao final imprime o tempo de cada estágio e o caminho crítico.
+    
+    Args:
+        data_path: Caminho dos dados brutos
+        output_path: Caminho para salvar dados processados
+        force: Se True, ignora o manifesto e reprocessa tudo
+        chunksize: Se informado, processa exportação/importação em streaming
+        max_workers: Processos do pool (1 = sequencial, sem pool)
+        
+    Returns:
+        dict: nome -> {'status', 'registros', 'segundos'}
+    """
+    output_path = Path(output_path)
+    output_path.mkdir(parents=True, exist_ok=True)
+    
+    stages = build_stages(data_path, output_path, chunksize)
+    manifest = load_manifest(output_path)
+    results = {}
+    pending = dict(stages)
+    running = {}
+    
+    if max_workers is None:
+        max_workers = min(len(stages), os.cpu_count() or 1)
+    executor = ProcessPoolExecutor(max_workers=max_workers) if max_workers > 1 else None
+    
+    start = time.perf_counter()
+    
+    def finish(name, num_rows, elapsed):
+        record_table(manifest, name, stages[name]['inputs'], stages[name]['outputs'])
+        results[name] = {'status': 'processado', 'registros': num_rows, 'segundos': elapsed}
+    
+    try:
+        while pending or running:
+            ready = [
+                name for name, stage in pending.items()
+                if all(dep in results for dep in stage['deps'])
+            ]
+            
+            for name in ready:
+                stage = pending.pop(name)
+                
+                # Dependências já concluídas: os inputs deste estágio estão estáveis
+                if not force and not is_stale(manifest, name, stage['inputs'], stage['outputs']):
+                    results[name] = {'status': 'sem alterações', 'registros': None, 'segundos': 0.0}
+                elif executor is None:
+                    finish(name, *_timed_call(stage['func'], stage['args']))
+                else:
+                    running[executor.submit(_timed_call, stage['func'], stage['args'])] = name
+            
+            # Estágios pulados podem liberar dependentes sem esperar o pool
+            if any(all(dep in results for dep in stage['deps']) for stage in pending.values()):
+                continue
+            
+            if running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    finish(running.pop(future), *future.result())
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+            # Estágios que terminaram enquanto outro falhava também entram no manifesto
+            for future, name in running.items():
+                if not future.cancelled() and future.exception() is None:
+                    finish(name, *future.result())
+        
+        # Salvo mesmo se um estágio falhar: os concluídos não são refeitos na próxima execução
+        save_manifest(manifest, output_path)
+    
+    total = time.perf_counter() - start
+    
+    _print_report(stages, results, total, output_path)
+    
+    return results
+
+
+def _print_report(stages, results, total, output_path):
+    processed = {name: r for name, r in results.items() if r['status'] == 'processado'}
+    
+    if not processed:
+        print(f"✅ Nenhuma alteração nos dados brutos; {output_path}/ já está atualizado")
+        return
+    
+    formats = 'csv + feather' if columnar_available() else 'csv'
+    print(f"✅ Dados processados salvos em {output_path}/ ({formats})")
+    for name in stages:
+        result = results[name]
+        if result['status'] == 'processado':
+            print(f"   - {name:<16} {result['registros']:>8} registros  {result['segundos'] * 1000:8.1f} ms")
+        else:
+            print(f"   - {name:<16} {'sem alterações':>28}")
+    
+    durations = {name: r['segundos'] for name, r in results.items()}
+    path, path_seconds = critical_path(stages, durations)
+    print(f"⏱️  Tempo total: {total * 1000:.1f} ms | soma dos estágios: {sum(durations.values()) * 1000:.1f} ms")
+    print(f"🧭 Caminho crítico: {' → '.join(path)} ({path_seconds * 1000:.1f} ms)")
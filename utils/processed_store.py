@@ -0,0 +1,285 @@
+"""
+Armazenamento colunar (Arrow/Feather) das tabelas processadas, com CSV como fallback
+"""
+import os
+from pathlib import Path
+
+import pandas as pd
+
+from utils.manifest import file_fingerprint, load_manifest
+from utils.schema import apply_schema
+
+
+PROCESSED_DATA_PATH = Path(__file__).parent.parent / 'data' / 'processed'
+
+# Tabelas processadas: nome do arquivo (sem extensão); tipos em utils.schema
+PROCESSED_TABLES = {
+    'export': {'arquivo': 'export_processed'},
+    'import': {'arquivo': 'import_processed'},
+    'comparacao': {'arquivo': 'comparacao_exp_imp'},
+    'producao': {'arquivo': 'producao_processed'},
+    'processamento': {'arquivo': 'processamento_processed'},
+    'comercializacao': {'arquivo': 'comercializacao_processed'},
+}
+
+# Última impressão digital vista de cada arquivo processado (evita reler o conteúdo)
+_fingerprints = {}
+
+
+def columnar_available():
+    """
+    Indica se o pyarrow está instalado (necessário para o formato colunar).
+    """
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def processed_files(name, output_path=PROCESSED_DATA_PATH):
+    """
+    Lista os arquivos gerados para uma tabela processada.
+    
+    Args:
+        name: Chave em PROCESSED_TABLES
+        output_path: Diretório dos dados processados
+        
+    Returns:
+        list: [caminho CSV] ou [caminho CSV, caminho Feather]
+    """
+    stem = Path(output_path) / PROCESSED_TABLES[name]['arquivo']
+    files = [stem.with_suffix('.csv')]
+    if columnar_available():
+        files.append(stem.with_suffix('.feather'))
+    return files
+
+
+def _arrow_schema(df):
+    import pyarrow as pa
+    
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    
+    # Índice de dicionário fixo (int32): o número de categorias cresce entre blocos
+    for i, field in enumerate(schema):
+        if pa.types.is_dictionary(field.type):
+            schema = schema.set(i, field.with_type(pa.dictionary(pa.int32(), field.type.value_type)))
+    
+    return schema
+
+
+def write_processed_chunks(chunks, name, output_path=PROCESSED_DATA_PATH):
+    """
+    Salva uma tabela processada a partir de blocos, sem materializá-la inteira.
+    
+    Cada bloco é acrescentado ao CSV (schema completo, compatível com
+    versões anteriores) e gravado como um record batch no Feather, já com os
+    tipos compactos de `utils.schema` e deltas de dicionário para as colunas
+    categóricas. O resultado é idêntico ao de gravar a tabela completa de
+    uma vez.
+    
+    Os arquivos são escritos em temporários e renomeados ao final: um
+    processo que ainda tenha a versão anterior mapeada continua lendo o
+    inode antigo.
+    
+    Args:
+        chunks: Iterável de DataFrames com o mesmo schema
+        name: Chave em PROCESSED_TABLES
+        output_path: Diretório dos dados processados
+        
+    Returns:
+        int: Número total de registros gravados
+    """
+    files = processed_files(name, output_path)
+    tmp_files = [path.with_suffix(path.suffix + '.tmp') for path in files]
+    columnar = len(files) > 1
+    
+    categories = {}
+    writer = None
+    num_rows = 0
+    first = True
+    
+    try:
+        with open(tmp_files[0], 'w', encoding='utf-8', newline='') as csv_file:
+            for chunk in chunks:
+                chunk.to_csv(csv_file, index=False, header=first)
+                num_rows += len(chunk)
+                first = False
+                
+                if columnar:
+                    import pyarrow as pa
+                    import pyarrow.ipc as ipc
+                    
+                    batch_df = apply_schema(chunk, name, categories)
+                    if writer is None:
+                        schema = _arrow_schema(batch_df)
+                        writer = ipc.new_file(
+                            tmp_files[1], schema,
+                            options=ipc.IpcWriteOptions(emit_dictionary_deltas=True)
+                        )
+                    writer.write_batch(pa.RecordBatch.from_pandas(
+                        batch_df, schema=schema, preserve_index=False
+                    ))
+    finally:
+        if writer is not None:
+            writer.close()
+    
+    if first:
+        raise ValueError(f"Nenhum bloco recebido para a tabela '{name}'")
+    
+    for tmp_path, path in zip(tmp_files, files):
+        os.replace(tmp_path, path)
+    
+    return num_rows
+
+
+def write_processed_table(df, name, output_path=PROCESSED_DATA_PATH):
+    """
+    Salva uma tabela processada em CSV e, se possível, em Feather.
+    
+    O Feather é gravado sem compressão para poder ser lido via memory-map.
+    
+    Args:
+        df: DataFrame processado
+        name: Chave em PROCESSED_TABLES
+        output_path: Diretório dos dados processados
+        
+    Returns:
+        list: Arquivos gravados
+    """
+    write_processed_chunks([df], name, output_path)
+    return processed_files(name, output_path)
+
+
+def read_processed_table(name, data_path=PROCESSED_DATA_PATH):
+    """
+    Lê uma tabela processada, preferindo o formato colunar.
+    
+    O Feather é aberto via memory-map; colunas numéricas sem nulos são
+    convertidas para pandas sem cópia. Se o pyarrow não estiver instalado
+    ou o arquivo colunar não existir, lê o CSV e aplica o schema compacto —
+    nos dois casos o DataFrame tem os mesmos tipos.
+    
+    Args:
+        name: Chave em PROCESSED_TABLES
+        data_path: Diretório dos dados processados
+        
+    Returns:
+        DataFrame: Tabela processada
+    """
+    stem = Path(data_path) / PROCESSED_TABLES[name]['arquivo']
+    feather_path = stem.with_suffix('.feather')
+    
+    if columnar_available() and feather_path.exists():
+        import pyarrow.feather as feather
+        
+        table = feather.read_table(feather_path, memory_map=True)
+        return table.to_pandas(split_blocks=True)
+    
+    return apply_schema(pd.read_csv(stem.with_suffix('.csv')), name)
+
+
+class FrozenFrame(pd.DataFrame):
+    """
+    DataFrame compartilhado (cache de processo) que recusa mudanças de estrutura.
+    
+    Bloqueia incluir, substituir ou remover colunas (`df['x'] = ...`,
+    `insert`, `del`, `pop`), operações com `inplace=True` e a troca de
+    `index`/`columns`, levantando ValueError como os arrays não graváveis
+    de `freeze_frame`. Os resultados de filtros, agregações e `.copy()`
+    são DataFrames comuns.
+    """
+    
+    @property
+    def _constructor(self):
+        return pd.DataFrame
+    
+    def _frozen(self, *args, **kwargs):
+        raise ValueError("DataFrame compartilhado é somente leitura: use .copy() antes de modificar")
+    
+    __setitem__ = __delitem__ = insert = _update_inplace = _frozen
+    
+    def __setattr__(self, name, value):
+        if name in ('index', 'columns'):
+            self._frozen()
+        super().__setattr__(name, value)
+
+
+def freeze_frame(df):
+    """
+    Versão somente leitura de um DataFrame, sem copiar os dados.
+    
+    Os arrays de cada coluna são marcados como não graváveis: atribuições
+    (`df.loc[...] = ...`, operações in-place) levantam ValueError em vez de
+    alterar uma tabela compartilhada. O resultado é um `FrozenFrame`, que
+    também recusa incluir ou remover colunas. Filtros, agregações e
+    `.copy()` continuam devolvendo DataFrames comuns.
+    
+    Args:
+        df: DataFrame
+        
+    Returns:
+        FrozenFrame: Mesmos dados e índice, somente leitura
+    """
+    columns = {}
+    for column in df.columns:
+        series = df[column]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # `.codes` já é uma view não gravável
+            values = pd.Categorical.from_codes(series.array.codes, dtype=series.dtype, validate=False)
+        else:
+            values = series.to_numpy()
+            values.flags.writeable = False
+        columns[column] = values
+    
+    return FrozenFrame(columns, index=df.index, copy=False)
+
+
+def _recorded_fingerprints(data_path):
+    """
+    Impressões digitais dos arquivos processados gravadas no manifesto do ETL.
+    """
+    manifest = load_manifest(data_path)
+    return {
+        name: fingerprint
+        for entry in manifest['tabelas'].values()
+        for name, fingerprint in entry['outputs'].items()
+        if fingerprint is not None
+    }
+
+
+def get_data_version(data_path=PROCESSED_DATA_PATH):
+    """
+    Identifica a versão atual dos dados processados.
+    
+    Combina nome e sha256 (`utils.manifest.file_fingerprint`) de cada
+    arquivo processado: só muda quando o conteúdo muda, então um `touch`,
+    um `git checkout` ou um ETL que regrava os mesmos bytes mantém os
+    caches derivados (cubo, consultas, figuras, cache em disco). O hash
+    só é recalculado quando tamanho ou mtime mudam; o manifesto do ETL
+    fornece os hashes já conhecidos na primeira chamada do processo.
+    
+    Args:
+        data_path: Diretório dos dados processados
+        
+    Returns:
+        str: Hash curto da versão
+    """
+    import hashlib
+    
+    recorded = None
+    digest = hashlib.sha256()
+    for name in PROCESSED_TABLES:
+        for path in processed_files(name, data_path):
+            previous = _fingerprints.get(path)
+            if previous is None:
+                if recorded is None:
+                    recorded = _recorded_fingerprints(data_path)
+                previous = recorded.get(path.name)
+            
+            fingerprint = file_fingerprint(path, previous)
+            if fingerprint is not None:
+                _fingerprints[path] = fingerprint
+                digest.update(f"{path.name}:{fingerprint['sha256']};".encode())
+    
+    return digest.hexdigest()[:16]
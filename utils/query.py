@@ -0,0 +1,149 @@
+"""
+Camada de consultas agregadas do dashboard, com cache LRU por versão dos dados
+"""
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from utils.cube import country_totals, year_totals
+from utils.disk_cache import disk_cached
+from utils.instrumentation import instrumented
+from utils.processed_store import PROCESSED_DATA_PATH, get_data_version
+from utils.topk import top_k
+
+
+# Agrupamentos aceitos: None = total geral
+GROUP_BY_OPTIONS = ['pais', 'ano', None]
+
+# Métricas disponíveis; as derivadas são calculadas sobre as somas do grupo
+METRICS = ['quantidade_litros', 'valor_usd', 'preco_medio', 'participacao_pct', 'anos_dados', 'num_paises']
+
+QUERY_CACHE_SIZE = 256
+
+_cache = OrderedDict()
+_stats = {'hits': 0, 'misses': 0}
+_lock = threading.Lock()
+
+
+@instrumented
+def query(flow, group_by='pais', metrics=('quantidade_litros', 'valor_usd'), year_range=None,
+          top_n=None, sort=None):
+    """
+    Agrega exportação ou importação a partir do cubo país x ano.
+    
+    O resultado fica em um cache LRU de processo (compartilhado por todas as
+    páginas e sessões), com chave nos argumentos mais a versão dos dados
+    processados: uma mesma consulta é calculada uma vez por versão. Abaixo
+    dele, o cache em disco (`utils.disk_cache`) preserva os resultados entre
+    reinícios do app.
+    
+    Args:
+        flow: 'export' ou 'import'
+        group_by: 'pais', 'ano' ou None (uma linha com o total)
+        metrics: Métricas de METRICS, na ordem das colunas do resultado
+            ('participacao_pct' é o % do valor em USD no intervalo;
+            'anos_dados' só existe por país e 'num_paises' por ano ou no total)
+        year_range: (ano_inicial, ano_final) inclusivo; None = todos os anos
+        top_n: Mantém só as N primeiras linhas após ordenar
+        sort: Coluna para ordenar; prefixo '-' ordena de forma decrescente
+            (ex.: '-valor_usd')
+            
+    Returns:
+        DataFrame: Colunas-chave (país e pais_id, ou ano) seguidas das métricas.
+            É uma cópia: pode ser modificada sem afetar o cache.
+    """
+    if group_by not in GROUP_BY_OPTIONS:
+        raise ValueError(f"group_by inválido: {group_by!r} (use {GROUP_BY_OPTIONS})")
+    
+    unknown = [metric for metric in metrics if metric not in METRICS]
+    if unknown:
+        raise ValueError(f"Métricas desconhecidas: {unknown} (disponíveis: {METRICS})")
+    
+    key = (
+        get_data_version(PROCESSED_DATA_PATH), flow, group_by, tuple(metrics),
+        tuple(year_range) if year_range is not None else None, top_n, sort
+    )
+    
+    with _lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            _stats['hits'] += 1
+            return _cache[key].copy()
+        _stats['misses'] += 1
+    
+    result = _run_query(flow, group_by, list(metrics), year_range, top_n, sort)
+    
+    with _lock:
+        _cache[key] = result
+        _cache.move_to_end(key)
+        while len(_cache) > QUERY_CACHE_SIZE:
+            _cache.popitem(last=False)
+    
+    return result.copy()
+
+
+@disk_cached
+def _run_query(flow, group_by, metrics, year_range, top_n, sort):
+    # Import local: data_loader depende do Streamlit
+    from utils.data_loader import get_trade_cube
+    
+    cube = get_trade_cube(flow)
+    year_start, year_end = year_range if year_range is not None else (None, None)
+    
+    if group_by == 'pais':
+        df = country_totals(cube, year_start, year_end)
+        keys = [cube['country_col'], 'pais_id']
+    elif group_by == 'ano':
+        df = year_totals(cube, year_start, year_end)
+        keys = ['ano']
+    else:
+        by_year = year_totals(cube, year_start, year_end)
+        df = pd.DataFrame({
+            'quantidade_litros': [by_year['quantidade_litros'].sum()],
+            'valor_usd': [by_year['valor_usd'].sum()],
+            'num_paises': [len(country_totals(cube, year_start, year_end))],
+        })
+        keys = []
+    
+    df = df.copy()
+    if 'preco_medio' in metrics:
+        df['preco_medio'] = df['valor_usd'] / df['quantidade_litros']
+    if 'participacao_pct' in metrics:
+        df['participacao_pct'] = df['valor_usd'] / df['valor_usd'].sum() * 100
+    
+    missing = [metric for metric in metrics if metric not in df.columns]
+    if missing:
+        raise ValueError(f"Métricas {missing} não disponíveis com group_by={group_by!r}")
+    
+    if sort is not None:
+        column = sort.lstrip('-')
+        ascending = not sort.startswith('-')
+        if top_n is not None:
+            df = top_k(df, top_n, column, ascending)
+        else:
+            df = df.sort_values(column, ascending=ascending, kind='stable')
+    elif top_n is not None:
+        df = df.head(top_n)
+    
+    return df[keys + metrics].reset_index(drop=True)
+
+
+def query_cache_info():
+    """
+    Estatísticas do cache de consultas.
+    
+    Returns:
+        dict: hits, misses, tamanho atual e tamanho máximo
+    """
+    with _lock:
+        return {**_stats, 'tamanho': len(_cache), 'maximo': QUERY_CACHE_SIZE}
+
+
+def clear_query_cache():
+    """
+    Esvazia o cache de consultas e zera os contadores.
+    """
+    with _lock:
+        _cache.clear()
+        _stats.update(hits=0, misses=0)
@@ -0,0 +1,189 @@
+"""
+Schemas e leitura tipada dos CSVs brutos da Embrapa Vitibrasil
+"""
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+RAW_DATA_PATH = Path(__file__).parent.parent / 'data' / 'raw'
+
+# Marcadores de valor ausente usados pela Embrapa
+MISSING_MARKERS = ['nd', '*', '']
+
+# Um schema por dataset bruto.
+#   layout 'pareado': Id | País | YYYY (kg) | YYYY (USD) ... -> colunas YYYY / YYYY.1
+#   layout 'hierarquico': id | control | produto | YYYY ...
+RAW_SCHEMAS = {
+    'exportacao': {
+        'arquivo': 'Exportacao.csv',
+        'sep': ';',
+        'layout': 'pareado',
+        'id_col': 'Id',
+        'control_col': None,
+        'label_col': 'País',
+        'na_values': MISSING_MARKERS,
+        'decimal': ',',
+    },
+    'importacao': {
+        'arquivo': 'Importacao.csv',
+        'sep': ';',
+        'layout': 'pareado',
+        'id_col': 'Id',
+        'control_col': None,
+        'label_col': 'País',
+        'na_values': MISSING_MARKERS,
+        'decimal': ',',
+    },
+    'producao': {
+        'arquivo': 'Producao.csv',
+        'sep': ';',
+        'layout': 'hierarquico',
+        'id_col': 'id',
+        'control_col': 'control',
+        'label_col': 'produto',
+        'na_values': MISSING_MARKERS,
+        'decimal': ',',
+    },
+    'processamento': {
+        'arquivo': 'Processamento.csv',
+        'sep': ';',
+        'layout': 'hierarquico',
+        'id_col': 'id',
+        'control_col': 'control',
+        'label_col': 'cultivar',
+        'na_values': MISSING_MARKERS,
+        'decimal': ',',
+    },
+    'comercializacao': {
+        'arquivo': 'Comercializacao.csv',
+        'sep': ';',
+        'layout': 'hierarquico',
+        'id_col': 'id',
+        'control_col': 'control',
+        'label_col': 'Produto',
+        'na_values': MISSING_MARKERS,
+        'decimal': ',',
+    },
+}
+
+
+def get_csv_engine():
+    """
+    Retorna o engine de CSV mais rápido disponível ('pyarrow' ou 'c').
+    """
+    try:
+        import pyarrow  # noqa: F401
+        return 'pyarrow'
+    except ImportError:
+        return 'c'
+
+
+def build_column_names(header, schema):
+    """
+    Monta os nomes das colunas a partir do cabeçalho bruto.
+    
+    No layout pareado cada ano aparece duas vezes (kg e USD); a segunda
+    ocorrência recebe o sufixo `.1`, como no `read_csv` padrão do pandas.
+    
+    Args:
+        header: Lista com os campos do cabeçalho
+        schema: Schema do dataset
+        
+    Returns:
+        tuple: (nomes das colunas, colunas de ano)
+    """
+    names = []
+    seen = set()
+    
+    for field in header:
+        name = field.strip()
+        if schema['layout'] == 'pareado' and name in seen:
+            name = f"{name}.1"
+        seen.add(name)
+        names.append(name)
+    
+    text_cols = {schema['id_col'], schema['control_col'], schema['label_col']}
+    year_cols = [name for name in names if name not in text_cols]
+    
+    return names, year_cols
+
+
+def read_raw_dataset(name, data_path=RAW_DATA_PATH, engine=None, **read_kwargs):
+    """
+    Lê um dataset bruto em uma única passada, já com tipos numéricos.
+    
+    Colunas de ano viram float64 (NaN para 'nd', '*' e vazios, vírgula
+    como separador decimal); id vira int64 e as colunas de texto ficam como object.
+    
+    Args:
+        name: Chave em RAW_SCHEMAS
+        data_path: Diretório dos CSVs brutos
+        engine: Engine do pandas ('pyarrow' ou 'c'); padrão: o mais rápido disponível
+        **read_kwargs: Argumentos extras para `pd.read_csv` (ex.: chunksize)
+        
+    Returns:
+        DataFrame: Dataset tipado
+    """
+    schema = RAW_SCHEMAS[name]
+    path = Path(data_path) / schema['arquivo']
+    
+    with open(path, encoding='utf-8') as f:
+        header = f.readline().rstrip('\r\n').split(schema['sep'])
+    
+    names, year_cols = build_column_names(header, schema)
+    
+    dtype = {col: np.float64 for col in year_cols}
+    dtype[schema['id_col']] = np.int64
+    
+    if engine is None:
+        engine = 'c' if read_kwargs else get_csv_engine()
+    
+    return pd.read_csv(
+        path,
+        sep=schema['sep'],
+        header=None,
+        skiprows=1,
+        names=names,
+        dtype=dtype,
+        na_values=schema['na_values'],
+        keep_default_na=False,
+        decimal=schema['decimal'],
+        encoding='utf-8',
+        engine=engine,
+        **read_kwargs
+    )
+
+
+def load_raw_datasets(data_path=RAW_DATA_PATH, report=False):
+    """
+    Carrega os cinco datasets brutos declarados em RAW_SCHEMAS.
+    
+    Args:
+        data_path: Diretório dos CSVs brutos
+        report: Se True, imprime tempo de carga e memória por dataset
+        
+    Returns:
+        dict: Dicionário com os 5 dataframes
+    """
+    engine = get_csv_engine()
+    datasets = {}
+    
+    for name in RAW_SCHEMAS:
+        start = time.perf_counter()
+        datasets[name] = read_raw_dataset(name, data_path, engine=engine)
+        elapsed = time.perf_counter() - start
+        
+        if report:
+            df = datasets[name]
+            memory_kb = df.memory_usage(deep=True).sum() / 1024
+            print(f"📥 {name:<16} {df.shape[0]:>5} x {df.shape[1]:<4} "
+                  f"{elapsed * 1000:7.1f} ms  {memory_kb:8.1f} KB  (engine={engine})")
+    
+    return datasets
+
+
+if __name__ == '__main__':
+    load_raw_datasets(report=True)
@@ -0,0 +1,138 @@
+"""
+Registro central de tipos (dtypes) das tabelas processadas
+"""
+import numpy as np
+import pandas as pd
+
+
+# Tipos em memória de cada tabela processada. Colunas fora do schema são
+# mantidas como estão; inteiros que não cabem no tipo declarado geram erro.
+FRAME_SCHEMAS = {
+    'export': {
+        'pais_destino': 'category',
+        'pais_id': 'int64',  # Negativo para países fora da dimensão (hash do nome)
+        'ano': 'int16',
+        'valor_usd': 'float64',
+        'quantidade_litros': 'int32',
+        'preco_medio_usd_litro': 'float32',
+    },
+    'import': {
+        'pais_origem': 'category',
+        'pais_id': 'int64',  # Negativo para países fora da dimensão (hash do nome)
+        'ano': 'int16',
+        'valor_usd': 'float64',
+        'quantidade_litros': 'int32',
+        'preco_medio_usd_litro': 'float32',
+    },
+    'comparacao': {
+        'ano': 'int16',
+    },
+    'producao': {
+        'categoria': 'category',
+        'produto': 'category',
+        'total_categoria': 'bool',
+        'ano': 'int16',
+        'quantidade': 'float64',
+    },
+    'processamento': {
+        'categoria': 'category',
+        'produto': 'category',
+        'total_categoria': 'bool',
+        'ano': 'int16',
+        'quantidade': 'float64',
+    },
+    'comercializacao': {
+        'categoria': 'category',
+        'produto': 'category',
+        'total_categoria': 'bool',
+        'ano': 'int16',
+        'quantidade': 'float64',
+    },
+}
+
+# Colunas redundantes: não são guardadas, e sim lidas da coluna de origem
+# (1 kg = 1 litro conforme enunciado)
+COLUMN_ALIASES = {
+    'quantidade_kg': 'quantidade_litros',
+}
+
+
+def apply_schema(df, name, categories=None):
+    """
+    Converte um DataFrame processado para os tipos compactos do registro.
+    
+    - Colunas de texto viram categóricas, com categorias na ordem de
+      primeira aparição. Ao converter blocos sucessivos com o mesmo
+      `categories`, a lista só cresce no final (permite deltas de
+      dicionário no Arrow).
+    - Colunas em COLUMN_ALIASES são removidas quando a coluna de origem
+      existe; leia a coluna de origem (ex.: 'quantidade_litros').
+      
+    Args:
+        df: DataFrame processado (ou um bloco dele)
+        name: Chave em FRAME_SCHEMAS
+        categories: Dict coluna -> Index das categorias já vistas (atualizado in-place)
+        
+    Returns:
+        DataFrame: Cópia com tipos compactos
+    """
+    schema = FRAME_SCHEMAS[name]
+    if categories is None:
+        categories = {}
+    
+    redundant = [
+        col for col, source in COLUMN_ALIASES.items()
+        if col in df.columns and source in df.columns
+    ]
+    df = df.drop(columns=redundant).reset_index(drop=True)
+    
+    for col, dtype in schema.items():
+        if col not in df.columns:
+            continue
+        
+        if dtype == 'category':
+            values = df[col].astype(object) if isinstance(df[col].dtype, pd.CategoricalDtype) else df[col]
+            known = categories.get(col, pd.Index([], dtype=object))
+            new_values = pd.Index(pd.unique(values)).difference(known, sort=False)
+            categories[col] = known = known.append(new_values)
+            df[col] = pd.Categorical(values, categories=known)
+        
+        elif np.issubdtype(np.dtype(dtype), np.integer):
+            info = np.iinfo(dtype)
+            if len(df) and (df[col].min() < info.min or df[col].max() > info.max):
+                raise ValueError(
+                    f"Coluna '{col}' da tabela '{name}' não cabe em {dtype} "
+                    f"(min={df[col].min()}, max={df[col].max()})"
+                )
+            df[col] = df[col].astype(dtype)
+        
+        else:
+            df[col] = df[col].astype(dtype)
+    
+    return df
+
+
+def memory_report(frames_before, frames_after):
+    """
+    Compara o uso de memória (deep) de cada tabela antes e depois do schema.
+    
+    Args:
+        frames_before: dict nome -> DataFrame original
+        frames_after: dict nome -> DataFrame com schema aplicado
+        
+    Returns:
+        DataFrame: tabela | antes_kb | depois_kb | reducao_pct
+    """
+    rows = []
+    for name, before in frames_before.items():
+        before_kb = before.memory_usage(deep=True).sum() / 1024
+        after_kb = frames_after[name].memory_usage(deep=True).sum() / 1024
+        rows.append({
+            'tabela': name,
+            'antes_kb': round(before_kb, 1),
+            'depois_kb': round(after_kb, 1),
+            'reducao_pct': round((1 - after_kb / before_kb) * 100, 1),
+        })
+    
+    return pd.DataFrame(rows)
+
@@ -0,0 +1,327 @@
+"""
+Gerador de dados sintéticos nos layouts brutos da Embrapa (testes de carga e benchmarks)
+"""
+import string
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Adicionar path para imports (permite `python utils/synthetic_data.py`)
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.countries import COUNTRY_DIMENSION_PATH, load_country_dimension, normalize_country_name
+from utils.raw_data import RAW_SCHEMAS
+
+
+# Parâmetros padrão (aproximam o tamanho e a forma dos arquivos reais)
+SYNTHETIC_DEFAULTS = {
+    'paises': 137,          # Linhas de exportação/importação
+    'ano_inicial': 1970,
+    'ano_final': 2023,
+    'produtos': 60,         # Itens por dataset hierárquico
+    'categorias': 4,        # Totais de categoria por dataset hierárquico
+    'esparsidade': 0.75,    # Fração de células zeradas
+    'cauda': 1.4,           # Expoente da lei de potência do tamanho (maior = mais concentrado)
+    'marcadores': 0.0,      # Fração de células com 'nd' / '*'
+    'seed': 42,
+}
+
+# Volume anual total (kg ou litros) distribuído entre as linhas de cada dataset
+_TOTAL_VOLUME = {
+    'exportacao': 20e6,
+    'importacao': 100e6,
+    'producao': 400e6,
+    'processamento': 600e6,
+    'comercializacao': 300e6,
+}
+
+# Preço médio (USD/kg) do layout pareado: mediana e dispersão entre países
+_PRICE_MEDIAN = 2.2
+_PRICE_SIGMA = 0.6
+
+_MARKERS = np.array(['nd', '*'], dtype=object)
+
+
+def _rng(seed, dataset):
+    # Um gerador por dataset: mudar um dataset não altera os demais
+    return np.random.default_rng([seed, list(RAW_SCHEMAS).index(dataset)])
+
+
+def _long_tail_weights(n, tail, rng):
+    """
+    Pesos de lei de potência (rank^-cauda) em ordem aleatória: poucas linhas
+    concentram a maior parte do volume, como Paraguai/Estados Unidos na exportação.
+    """
+    weights = np.arange(1, n + 1, dtype=np.float64) ** -tail
+    return rng.permutation(weights / weights.sum())
+
+
+def _yearly_values(weights, num_years, total, sparsity, rng):
+    """
+    Matriz linhas x anos de volumes inteiros: peso da linha, tendência própria,
+    ruído lognormal e células zeradas com probabilidade `sparsity`.
+    
+    Linhas grandes ficam zeradas com menos frequência (relações comerciais
+    estáveis); a fração média de zeros continua sendo `sparsity`.
+    """
+    n = len(weights)
+    trend = rng.normal(0.0, 0.02, size=(n, 1)) * np.arange(num_years)
+    noise = rng.lognormal(0.0, 0.4, size=(n, num_years))
+    values = total * weights[:, None] * np.exp(trend) * noise
+    
+    # Probabilidade de zero por linha: menor para as linhas de maior peso
+    rank = np.argsort(np.argsort(-weights)) / max(n - 1, 1)
+    spread = 2 * min(sparsity, 1 - sparsity)
+    p_zero = sparsity + spread * (rank - 0.5)
+    values[rng.random((n, num_years)) < p_zero[:, None]] = 0
+    
+    return np.round(values).astype(np.int64)
+
+
+def _with_markers(values, fraction, rng):
+    """
+    Converte a matriz para texto com 'nd'/'*' em uma fração das células.
+    """
+    if not fraction:
+        return values
+    cells = values.astype(object)
+    mask = rng.random(values.shape) < fraction
+    cells[mask] = rng.choice(_MARKERS, size=int(mask.sum()))
+    return cells
+
+
+def synthetic_country_dimension(n):
+    """
+    Dimensão de países para `n` linhas de exportação/importação.
+    
+    Até o tamanho da dimensão real, é a própria dimensão; além disso,
+    acrescenta países sintéticos ('País Sintético NNNNN', sem ISO3) com
+    `pais_id` novos, para que cada linha gerada seja um país distinto e
+    resolvido pelo ETL. `generate_raw_datasets` grava esta tabela ao lado
+    dos CSVs (ver `utils.countries.country_dimension_path`).
+    
+    Args:
+        n: Número de países
+        
+    Returns:
+        DataFrame: pais_id | nome | iso3 | aliases
+    """
+    dim = load_country_dimension()[['pais_id', 'nome', 'iso3', 'aliases']]
+    extra = n - len(dim)
+    if extra <= 0:
+        return dim.reset_index(drop=True)
+    
+    # A dimensão guarda pais_id como int16
+    first_id = int(dim['pais_id'].max()) + 1
+    limit = len(dim) + np.iinfo(np.int16).max - first_id + 1
+    if n > limit:
+        raise ValueError(f"No máximo {limit} países (pais_id da dimensão é int16)")
+    
+    synthetic = pd.DataFrame({
+        'pais_id': np.arange(first_id, first_id + extra),
+        'nome': [f"País Sintético {i:05d}" for i in range(len(dim) + 1, n + 1)],
+        'iso3': '',
+        'aliases': '',
+    })
+    return pd.concat([dim, synthetic], ignore_index=True)
+
+
+def _country_names(n):
+    """
+    Nomes da dimensão de `synthetic_country_dimension` (os reais em ordem
+    alfabética, como nos arquivos reais, seguidos dos sintéticos).
+    """
+    dim = synthetic_country_dimension(n)
+    real = load_country_dimension()
+    names = sorted(real['nome'], key=normalize_country_name)
+    return (names + dim['nome'].iloc[len(real):].tolist())[:n]
+
+
+def synthetic_trade_dataset(dataset='exportacao', **params):
+    """
+    Dataset no layout pareado: Id | País | YYYY (kg) | YYYY (USD) ...
+    
+    Args:
+        dataset: 'exportacao' ou 'importacao'
+        **params: Sobrepõem SYNTHETIC_DEFAULTS
+        
+    Returns:
+        tuple: (cabeçalho, DataFrame com as linhas na ordem do cabeçalho)
+    """
+    cfg = {**SYNTHETIC_DEFAULTS, **params}
+    rng = _rng(cfg['seed'], dataset)
+    years = [str(year) for year in range(cfg['ano_inicial'], cfg['ano_final'] + 1)]
+    
+    weights = _long_tail_weights(cfg['paises'], cfg['cauda'], rng)
+    kg = _yearly_values(weights, len(years), _TOTAL_VOLUME[dataset], cfg['esparsidade'], rng)
+    
+    # Preço por país (lognormal) com variação anual; USD zerado junto com kg
+    price = np.exp(np.log(_PRICE_MEDIAN) + rng.normal(0, _PRICE_SIGMA, size=(len(weights), 1)))
+    price = price * rng.lognormal(0, 0.1, size=kg.shape)
+    usd = np.round(kg * price).astype(np.int64)
+    
+    # Colunas intercaladas: kg e USD de cada ano
+    paired = np.empty((len(weights), 2 * len(years)), dtype=np.int64)
+    paired[:, 0::2], paired[:, 1::2] = kg, usd
+    
+    schema = RAW_SCHEMAS[dataset]
+    header = [schema['id_col'], schema['label_col']] + [year for year in years for _ in range(2)]
+    df = pd.DataFrame(_with_markers(paired, cfg['marcadores'], rng))
+    df.insert(0, 'label', _country_names(len(weights)))
+    df.insert(0, 'id', np.arange(1, len(weights) + 1))
+    return header, df
+
+
+def _category_prefix(index):
+    # Prefixo de duas letras minúsculas dos itens ('aa_', 'ab_' ...), como 'vm_' / 'ti_'
+    letters = string.ascii_lowercase
+    return letters[index // 26 % 26] + letters[index % 26]
+
+
+def synthetic_hierarchical_dataset(dataset='producao', **params):
+    """
+    Dataset no layout hierárquico: id | control | produto | YYYY ...
+    
+    Cada categoria tem uma linha de total (`control` igual ao rótulo, em
+    maiúsculas) seguida dos itens (`control` = prefixo_nome); o total é a
+    soma numérica dos itens.
+    
+    Args:
+        dataset: 'producao', 'processamento' ou 'comercializacao'
+        **params: Sobrepõem SYNTHETIC_DEFAULTS
+        
+    Returns:
+        tuple: (cabeçalho, DataFrame com as linhas na ordem do cabeçalho)
+    """
+    cfg = {**SYNTHETIC_DEFAULTS, **params}
+    rng = _rng(cfg['seed'], dataset)
+    years = [str(year) for year in range(cfg['ano_inicial'], cfg['ano_final'] + 1)]
+    num_categories = max(1, min(cfg['categorias'], cfg['produtos']))
+    
+    weights = _long_tail_weights(cfg['produtos'], cfg['cauda'], rng)
+    items = _yearly_values(weights, len(years), _TOTAL_VOLUME[dataset], cfg['esparsidade'], rng)
+    # Cada categoria recebe ao menos um item; os demais são sorteados
+    category_of = np.sort(np.concatenate([
+        np.arange(num_categories),
+        rng.integers(0, num_categories, size=len(weights) - num_categories)
+    ]))
+    
+    # Comercialização indenta os itens com dois espaços, como no arquivo real
+    indent = '  ' if dataset == 'comercializacao' else ''
+    controls, labels, blocks = [], [], []
+    for category in range(num_categories):
+        members = np.flatnonzero(category_of == category)
+        name = f"CATEGORIA {category + 1:02d}"
+        controls.append(name)
+        labels.append(name)
+        blocks.append(items[members].sum(axis=0, keepdims=True))
+        for member in members:
+            item = f"Produto {member + 1:04d}"
+            controls.append(f"{_category_prefix(category)}_{item}")
+            labels.append(indent + item)
+        blocks.append(items[members])
+    
+    schema = RAW_SCHEMAS[dataset]
+    header = [schema['id_col'], schema['control_col'], schema['label_col']] + years
+    df = pd.DataFrame(_with_markers(np.vstack(blocks), cfg['marcadores'], rng))
+    df.insert(0, 'label', labels)
+    df.insert(0, 'control', controls)
+    df.insert(0, 'id', np.arange(1, len(labels) + 1))
+    return header, df
+
+
+def write_country_dimension(output_path, n):
+    """
+    Grava a dimensão de `synthetic_country_dimension` em
+    `output_path/paises.csv`, no formato de `utils.countries`.
+    
+    Returns:
+        Path: Arquivo gravado
+    """
+    path = Path(output_path) / COUNTRY_DIMENSION_PATH.name
+    synthetic_country_dimension(n).to_csv(path, sep=';', index=False, encoding='utf-8', lineterminator='\n')
+    return path
+
+
+def generate_raw_datasets(output_path, datasets=None, **params):
+    """
+    Grava os CSVs brutos sintéticos com os nomes e layouts de RAW_SCHEMAS,
+    prontos para `read_raw_dataset(..., data_path=output_path)` e para
+    `process_all_data(data_path=output_path)`. Com exportação/importação,
+    grava também a dimensão de países (`write_country_dimension`), usada
+    pelo ETL no lugar da real: os `paises` gerados são países distintos,
+    todos com `pais_id`.
+    
+    A mesma seed gera sempre os mesmos arquivos.
+    
+    Args:
+        output_path: Diretório de saída
+        datasets: Datasets a gerar (padrão: todos de RAW_SCHEMAS)
+        **params: Sobrepõem SYNTHETIC_DEFAULTS (paises, ano_inicial, ano_final,
+            produtos, categorias, esparsidade, cauda, marcadores, seed)
+            
+    Returns:
+        dict: dataset (e 'paises') -> caminho do arquivo gravado
+    """
+    unknown = set(params) - set(SYNTHETIC_DEFAULTS)
+    if unknown:
+        raise ValueError(f"Parâmetros desconhecidos: {sorted(unknown)} (use {list(SYNTHETIC_DEFAULTS)})")
+    
+    output_path = Path(output_path)
+    output_path.mkdir(parents=True, exist_ok=True)
+    
+    paths = {}
+    num_countries = None
+    for dataset in datasets or RAW_SCHEMAS:
+        schema = RAW_SCHEMAS[dataset]
+        if schema['layout'] == 'pareado':
+            header, df = synthetic_trade_dataset(dataset, **params)
+            num_countries = len(df)
+        else:
+            header, df = synthetic_hierarchical_dataset(dataset, **params)
+        
+        path = output_path / schema['arquivo']
+        df.to_csv(path, sep=schema['sep'], header=header, index=False, encoding='utf-8', lineterminator='\n')
+        paths[dataset] = path
+        print(f"🧪 {schema['arquivo']:<20} {len(df):>8} linhas x {len(header):>4} colunas")
+    
+    if num_countries is not None:
+        paths['paises'] = write_country_dimension(output_path, num_countries)
+        print(f"🌎 {paths['paises'].name:<20} {num_countries:>8} países")
+    
+    return paths
+
+
+if __name__ == '__main__':
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Gera CSVs sintéticos no formato bruto da Embrapa')
+    parser.add_argument('--saida', default='data/synthetic', help='Diretório de saída')
+    parser.add_argument('--paises', type=int, default=SYNTHETIC_DEFAULTS['paises'])
+    parser.add_argument('--anos', type=int, nargs=2, metavar=('INICIAL', 'FINAL'),
+                        default=[SYNTHETIC_DEFAULTS['ano_inicial'], SYNTHETIC_DEFAULTS['ano_final']])
+    parser.add_argument('--produtos', type=int, default=SYNTHETIC_DEFAULTS['produtos'])
+    parser.add_argument('--categorias', type=int, default=SYNTHETIC_DEFAULTS['categorias'])
+    parser.add_argument('--esparsidade', type=float, default=SYNTHETIC_DEFAULTS['esparsidade'],
+                        help='Fração de células zeradas (0 a 1)')
+    parser.add_argument('--cauda', type=float, default=SYNTHETIC_DEFAULTS['cauda'],
+                        help='Expoente da lei de potência dos volumes')
+    parser.add_argument('--marcadores', type=float, default=SYNTHETIC_DEFAULTS['marcadores'],
+                        help="Fração de células com 'nd' / '*'")
+    parser.add_argument('--seed', type=int, default=SYNTHETIC_DEFAULTS['seed'])
+    args = parser.parse_args()
+    
+    generate_raw_datasets(
+        args.saida,
+        paises=args.paises,
+        ano_inicial=args.anos[0],
+        ano_final=args.anos[1],
+        produtos=args.produtos,
+        categorias=args.categorias,
+        esparsidade=args.esparsidade,
+        cauda=args.cauda,
+        marcadores=args.marcadores,
+        seed=args.seed,
+    )
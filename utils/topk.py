@@ -0,0 +1,113 @@
+"""
+Seleção dos k maiores (ou menores) sem ordenar todos os grupos
+"""
+import heapq
+
+import numpy as np
+import pandas as pd
+
+
+def top_k_indices(values, k, largest=True):
+    """
+    Posições dos k maiores valores, em ordem, por seleção parcial.
+    
+    `np.partition` encontra o k-ésimo valor em O(n); só os candidatos
+    (no máximo k posições) são ordenados. Empates são resolvidos pela
+    posição original (o primeiro vem antes), como `nlargest(keep='first')`.
+    NaN nunca é selecionado.
+    
+    Args:
+        values: Array 1D
+        k: Número de posições
+        largest: True = maiores; False = menores
+        
+    Returns:
+        ndarray: Até k posições, do melhor para o pior
+    """
+    keys = np.asarray(values, dtype=np.float64)
+    keys = -keys if largest else keys
+    positions = np.flatnonzero(~np.isnan(keys))
+    keys = keys[positions]
+    
+    k = min(max(int(k), 0), len(keys))
+    if k == 0:
+        return positions[:0]
+    
+    if k < len(keys):
+        kth = np.partition(keys, k - 1)[k - 1]
+        better = np.flatnonzero(keys < kth)
+        tied = np.flatnonzero(keys == kth)[:k - len(better)]
+        candidates = np.concatenate([better, tied])
+    else:
+        candidates = np.arange(len(keys))
+    
+    # Ordenação estável: candidatos empatados já estão em ordem de posição
+    candidates = candidates[np.argsort(keys[candidates], kind='stable')]
+    return positions[candidates]
+
+
+def top_k(df, k, column, ascending=False):
+    """
+    Equivalente a `df.nlargest(k, column)` (ou `nsmallest`, com
+    `ascending=True`) por seleção parcial, com desempate estável.
+    
+    Args:
+        df: DataFrame
+        k: Número de linhas
+        column: Coluna de ordenação
+        ascending: False = maiores primeiro; True = menores primeiro
+        
+    Returns:
+        DataFrame: Até k linhas de `df`, ordenadas
+    """
+    return df.iloc[top_k_indices(df[column].to_numpy(), k, largest=not ascending)]
+
+
+def streaming_top_k(chunks, k, column, ascending=False):
+    """
+    Top-k sobre blocos de DataFrame, sem materializar todos os grupos.
+    
+    Cada bloco é reduzido aos seus k melhores com `top_k_indices` e os
+    candidatos entram num heap de tamanho k; a memória é O(k) além do
+    bloco corrente. Empates ficam com a linha que chegou primeiro.
+    
+    Cada linha deve ser um grupo completo (ex.: blocos já agregados, ou
+    blocos do arquivo bruto, em que cada linha é um país): o mesmo grupo
+    espalhado em vários blocos não é somado.
+    
+    Args:
+        chunks: Iterável de DataFrames com o mesmo schema
+        k: Número de linhas
+        column: Coluna de ordenação
+        ascending: False = maiores primeiro; True = menores primeiro
+        
+    Returns:
+        DataFrame: Até k linhas, ordenadas (índice reiniciado)
+    """
+    heap = []
+    sequence = 0
+    dtypes = pd.Series(dtype=object)
+    
+    for chunk in chunks:
+        dtypes = chunk.dtypes
+        best = top_k(chunk, k, column, ascending)
+        values = best[column].to_numpy(dtype=np.float64)
+        values = -values if ascending else values
+        
+        for value, row in zip(values, best.itertuples(index=False, name=None)):
+            # Topo do heap = pior candidato; em empates, o que chegou por último
+            entry = (value, -sequence, row)
+            sequence += 1
+            if len(heap) < k:
+                heapq.heappush(heap, entry)
+            elif entry[:2] > heap[0][:2]:
+                heapq.heapreplace(heap, entry)
+    
+    rows = [row for _, _, row in sorted(heap, key=lambda entry: entry[:2], reverse=True)]
+    
+    # Linhas viram tuplas no heap: restaurar os tipos (categorias podem
+    # variar entre blocos e ficam como inferidas)
+    result = pd.DataFrame(rows, columns=dtypes.index)
+    return result.astype({
+        column: dtype for column, dtype in dtypes.items() if not isinstance(dtype, pd.CategoricalDtype)
+    })
@@ -0,0 +1,279 @@
+"""
+Tracer de spans por rerun das páginas, gravado no formato Chrome Trace Event
+(abre em chrome://tracing, https://ui.perfetto.dev ou speedscope)
+"""
+import atexit
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from pathlib import Path
+
+
+# Variável de ambiente que liga o tracer: '1' grava em TRACE_PATH; outro valor é o arquivo de saída
+TRACE_ENV = 'WINE_TRACE'
+
+TRACE_PATH = Path(__file__).parent.parent / 'data' / 'traces'
+
+# Eventos acumulados antes de gravar fora de um rerun (scripts, ETL)
+MAX_BUFFERED_EVENTS = 10_000
+
+# perf_counter (preciso) deslocado para o relógio de parede, em microssegundos
+_EPOCH_US = time.time_ns() // 1000 - time.perf_counter_ns() // 1000
+
+_trace = {'ativo': False, 'arquivo': None}
+_events = []
+_reruns = {}
+_named_threads = set()
+_lock = threading.Lock()
+_NO_SPAN = nullcontext()
+
+
+def _now_us():
+    return _EPOCH_US + time.perf_counter_ns() // 1000
+
+
+def session_id(default='processo'):
+    """
+    Id da sessão do Streamlit em execução (ou `default` fora do Streamlit).
+    """
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+    except ImportError:
+        return default
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return ctx.session_id if ctx is not None else default
+
+
+def enable_tracing(path=None):
+    """
+    Liga o tracer (processo inteiro).
+    
+    Args:
+        path: Arquivo de saída (padrão: TRACE_PATH/trace-<data>-<pid>.json).
+            Se já existir, os eventos são acrescentados ao final.
+    """
+    if path is None:
+        path = TRACE_PATH / f"trace-{datetime.now():%Y%m%d-%H%M%S}-{os.getpid()}.json"
+    _trace.update(ativo=True, arquivo=Path(path))
+
+
+def disable_tracing():
+    """
+    Grava os eventos pendentes e desliga o tracer.
+    """
+    flush_trace()
+    _trace['ativo'] = False
+
+
+def tracing_enabled():
+    return _trace['ativo']
+
+
+def _emit(event):
+    with _lock:
+        _events.append(event)
+        pending = len(_events)
+    if pending >= MAX_BUFFERED_EVENTS:
+        flush_trace()
+
+
+def _complete_event(name, cat, start, args):
+    # Evento 'X' (completo): o aninhamento vem da contenção no tempo dentro da mesma thread
+    return {'name': name, 'cat': cat, 'ph': 'X', 'ts': start, 'dur': _now_us() - start,
+            'pid': os.getpid(), 'tid': threading.get_native_id(), 'args': args}
+
+
+@contextmanager
+def _traced(name, cat, args):
+    start = _now_us()
+    try:
+        yield
+    except BaseException as e:
+        # Inclui os controles de fluxo do Streamlit (rerun/stop), que também sobem como exceção
+        args = {**args, 'erro': type(e).__name__}
+        raise
+    finally:
+        _emit(_complete_event(name, cat, start, args))
+
+
+def span(name, cat='funcao', **args):
+    """
+    Context manager que registra um span (no-op com o tracer desligado).
+    
+    Args:
+        name: Nome do span
+        cat: Categoria ('rerun', 'secao', 'funcao', 'grafico'...)
+        **args: Atributos gravados no evento
+        
+    Returns:
+        Context manager
+    """
+    if not _trace['ativo']:
+        return _NO_SPAN
+    return _traced(name, cat, args)
+
+
+def _close_rerun(state, end=None, erro=None):
+    """
+    Emite o span raiz do rerun (uma vez) e grava os eventos no arquivo.
+    
+    Args:
+        state: Estado do rerun (`begin_rerun`)
+        end: Fim do span em µs (padrão: agora)
+        erro: Motivo da interrupção, gravado nos atributos do span
+    """
+    with _lock:
+        start, state['inicio'] = state['inicio'], None
+    if start is None:
+        return
+    
+    args = {'sessao': state['sessao'], 'rerun': state['numero']}
+    if erro is not None:
+        args['erro'] = erro
+    event = _complete_event(f"rerun {state['pagina']}", 'rerun', start, args)
+    if end is not None:
+        event['dur'] = max(0, end - start)
+    _emit(event)
+    flush_trace()
+
+
+def begin_rerun(page):
+    """
+    Abre o span raiz do rerun atual da página (chame logo após o `set_page_config`).
+    
+    Um rerun anterior da mesma sessão que não chegou ao `end_rerun` nem
+    foi fechado por uma exceção numa seção é emitido agora, com `erro`
+    = 'interrompido' e terminando no fim da última seção concluída.
+    
+    Args:
+        page: Nome da página
+    """
+    if not _trace['ativo']:
+        return
+    
+    session = session_id()
+    tid = threading.get_native_id()
+    now = _now_us()
+    with _lock:
+        previous = _reruns.get(session)
+        _reruns[session] = {
+            'pagina': page,
+            'sessao': session,
+            'inicio': now,
+            'fim': now,
+            'numero': previous['numero'] + 1 if previous else 1,
+        }
+        new_thread = tid not in _named_threads
+        _named_threads.add(tid)
+    
+    if previous is not None:
+        _close_rerun(previous, end=previous['fim'], erro='interrompido')
+    
+    if new_thread:
+        _emit({'name': 'thread_name', 'ph': 'M', 'pid': os.getpid(), 'tid': tid,
+               'args': {'name': f"sessão {session[:8]}"}})
+
+
+@contextmanager
+def _traced_section(state, name):
+    try:
+        with _traced(f"{state['pagina']} › {name}", 'secao', {}):
+            yield
+    except BaseException as e:
+        # st.stop(), rerun pedido por interação ou erro: o rerun termina aqui
+        _close_rerun(state, erro=type(e).__name__)
+        raise
+    finally:
+        state['fim'] = _now_us()
+
+
+def section(name):
+    """
+    Context manager de uma seção da página: span 'secao' aninhado no rerun
+    atual (no-op com o tracer desligado ou fora de um rerun).
+    
+    Uso: `with section('Seção 1: Volume'): ...`. Uma exceção que sai da
+    seção (inclusive o `st.stop()` e o rerun pedido por uma interação do
+    usuário, que o Streamlit implementa como exceções) fecha também o span
+    raiz do rerun, com o nome da exceção em `erro`.
+    
+    Args:
+        name: Nome da seção
+        
+    Returns:
+        Context manager
+    """
+    if not _trace['ativo']:
+        return _NO_SPAN
+    
+    state = _reruns.get(session_id())
+    if state is None or state['inicio'] is None:
+        return _NO_SPAN
+    return _traced_section(state, name)
+
+
+def end_rerun():
+    """
+    Fecha o span raiz do rerun e grava os eventos no arquivo.
+    """
+    if not _trace['ativo']:
+        return
+    
+    state = _reruns.get(session_id())
+    if state is not None:
+        _close_rerun(state)
+
+
+def traced_chart(fig, **kwargs):
+    """
+    `st.plotly_chart` dentro de um span (categoria 'grafico'), nomeado pelo título da figura.
+    """
+    import streamlit as st
+    
+    title = fig.layout.title.text
+    with span(f"st.plotly_chart: {title}" if title else 'st.plotly_chart', 'grafico'):
+        return st.plotly_chart(fig, **kwargs)
+
+
+def flush_trace():
+    """
+    Acrescenta os eventos pendentes ao arquivo de trace.
+    
+    O arquivo é um array JSON sem o ']' final (o formato Trace Event aceita
+    arrays não terminados), para que cada rerun só acrescente linhas.
+    """
+    with _lock:
+        events = _events[:]
+        _events.clear()
+    if not events or _trace['arquivo'] is None:
+        return
+    
+    path = _trace['arquivo']
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with _lock, open(path, 'a', encoding='utf-8') as f:
+        if f.tell() == 0:
+            f.write('[\n')
+        f.writelines(json.dumps(event, ensure_ascii=False) + ',\n' for event in events)
+
+
+def read_trace(path):
+    """
+    Lê um arquivo de trace (terminado ou não).
+    
+    Returns:
+        list: Eventos
+    """
+    text = Path(path).read_text(encoding='utf-8').rstrip().rstrip(',')
+    if not text:
+        return []
+    return json.loads(text if text.endswith(']') else text + ']')
+
+
+atexit.register(flush_trace)
+
+# Ligado pelo ambiente desde o import (ex.: WINE_TRACE=1 streamlit run Home.py)
+if os.environ.get(TRACE_ENV, '0') != '0':
+    enable_tracing(None if os.environ[TRACE_ENV] == '1' else os.environ[TRACE_ENV])
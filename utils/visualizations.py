@@ -2,10 +2,13 @@
 Funções de visualização com Plotly para o projeto Wine Export Analysis
 """
 import plotly.graph_objects as go
-import plotly.express as px
 import pandas as pd
 import numpy as np
 
+from utils.cube import as_trade_cube, country_totals
+from utils.instrumentation import instrumented
+from utils.topk import top_k, top_k_indices
+
 
 # Paleta de cores do projeto
 COLORS = {
@@ -21,6 +24,7 @@ COLORS = {
 }
 
 
+@instrumented
 def create_line_chart_evolution(df_comparacao, title="Evolução Exportação vs Importação"):
     """
     Gráfico de linhas comparando evolução temporal de exportação e importação.
@@ -74,6 +78,7 @@ def create_line_chart_evolution(df_comparacao, title="Evolução Exportação vs
     return fig
 
 
+@instrumented
 def create_bar_chart_value(df_comparacao, title="Comparação de Valores (USD)"):
     """
     Gráfico de barras comparando valores em USD.
@@ -118,12 +123,13 @@ def create_bar_chart_value(df_comparacao, title="Comparação de Valores (USD)")
     return fig
 
 
+@instrumented
 def create_treemap_countries(df_export, top_n=15, title="Distribuição por País Destino"):
     """
     Treemap mostrando distribuição de exportações por país.
     
     Args:
-        df_export: DataFrame de exportações
+        df_export: DataFrame de exportações ou cubo (`utils.cube`)
         top_n: Número de países a mostrar
         title: Título do gráfico
         
@@ -131,13 +137,10 @@ def create_treemap_countries(df_export, top_n=15, title="Distribuição por Paí
         plotly.graph_objects.Figure
     """
     # Agregar por país
-    pais_agg = df_export.groupby('pais_destino').agg({
-        'valor_usd': 'sum',
-        'quantidade_litros': 'sum'
-    }).reset_index()
+    pais_agg = country_totals(as_trade_cube(df_export))
     
     pais_agg['preco_medio'] = pais_agg['valor_usd'] / pais_agg['quantidade_litros']
-    pais_agg = pais_agg.nlargest(top_n, 'valor_usd')
+    pais_agg = top_k(pais_agg, top_n, 'valor_usd')
     
     # Calcular participação percentual
     total_valor = pais_agg['valor_usd'].sum()
@@ -171,12 +174,13 @@ def create_treemap_countries(df_export, top_n=15, title="Distribuição por Paí
     return fig
 
 
+@instrumented
 def create_horizontal_bar_top_countries(df_export, top_n=15, title="Top 15 Países Destino"):
     """
     Gráfico de barras horizontais com top países.
     
     Args:
-        df_export: DataFrame de exportações
+        df_export: DataFrame de exportações ou cubo (`utils.cube`)
         top_n: Número de países
         title: Título
         
@@ -184,13 +188,10 @@ def create_horizontal_bar_top_countries(df_export, top_n=15, title="Top 15 País
         plotly.graph_objects.Figure
     """
     # Agregar e ordenar
-    top_paises = df_export.groupby('pais_destino').agg({
-        'quantidade_litros': 'sum',
-        'valor_usd': 'sum'
-    }).reset_index()
+    top_paises = country_totals(as_trade_cube(df_export))
     
     top_paises['preco_medio'] = top_paises['valor_usd'] / top_paises['quantidade_litros']
-    top_paises = top_paises.nlargest(top_n, 'valor_usd').sort_values('valor_usd')
+    top_paises = top_k(top_paises, top_n, 'valor_usd').iloc[::-1]
     
     fig = go.Figure()
     
@@ -226,28 +227,29 @@ def create_horizontal_bar_top_countries(df_export, top_n=15, title="Top 15 País
     return fig
 
 
+@instrumented
 def create_scatter_price_volume(df_export, title="Preço Médio vs Volume por País"):
     """
     Scatter plot mostrando relação entre preço e volume.
     
     Args:
-        df_export: DataFrame de exportações
+        df_export: DataFrame de exportações ou cubo (`utils.cube`)
         title: Título
         
     Returns:
         plotly.graph_objects.Figure
     """
     # Agregar por país
-    pais_agg = df_export.groupby('pais_destino').agg({
-        'valor_usd': 'sum',
-        'quantidade_litros': 'sum'
-    }).reset_index()
+    pais_agg = country_totals(as_trade_cube(df_export))
     
     pais_agg['preco_medio'] = pais_agg['valor_usd'] / pais_agg['quantidade_litros']
     
     # Remover outliers extremos para melhor visualização
     pais_agg = pais_agg[pais_agg['preco_medio'] < 10]
     
+    # plotly.express custa ~100 ms de import: só carregado quando a figura é construída
+    import plotly.express as px
+    
     fig = px.scatter(
         pais_agg,
         x='quantidade_litros',
@@ -277,6 +279,7 @@ def create_scatter_price_volume(df_export, title="Preço Médio vs Volume por Pa
     return fig
 
 
+@instrumented
 def create_line_chart_price_trends(df_comparacao, title="Evolução do Preço Médio"):
     """
     Linha mostrando evolução dos preços médios.
@@ -321,6 +324,7 @@ def create_line_chart_price_trends(df_comparacao, title="Evolução do Preço M
     return fig
 
 
+@instrumented
 def create_gauge_chart(value, title, max_value=100, threshold_green=70, threshold_yellow=40):
     """
     Gráfico de gauge para KPIs.
@@ -363,6 +367,7 @@ def create_gauge_chart(value, title, max_value=100, threshold_green=70, threshol
     return fig
 
 
+@instrumented
 def create_area_chart_stacked(df_data, title="Distribuição ao Longo do Tempo"):
     """
     Gráfico de área empilhada.
@@ -399,12 +404,13 @@ def create_area_chart_stacked(df_data, title="Distribuição ao Longo do Tempo")
     return fig
 
 
+@instrumented
 def create_pie_chart_concentration(df_export, top_n=5, title="Concentração de Mercado"):
     """
     Gráfico de pizza mostrando concentração nos top N países.
     
     Args:
-        df_export: DataFrame de exportações
+        df_export: DataFrame de exportações ou cubo (`utils.cube`)
         top_n: Número de países top
         title: Título
         
@@ -412,11 +418,12 @@ def create_pie_chart_concentration(df_export, top_n=5, title="Concentração de
         plotly.graph_objects.Figure
     """
     # Agregar
-    pais_total = df_export.groupby('pais_destino')['valor_usd'].sum().sort_values(ascending=False)
+    pais_total = country_totals(as_trade_cube(df_export)).set_index('pais_destino')['valor_usd']
     
     # Top N e resto
-    top = pais_total.head(top_n)
-    resto = pais_total.iloc[top_n:].sum()
+    top_pos = top_k_indices(pais_total.to_numpy(), top_n)
+    top = pais_total.iloc[top_pos]
+    resto = pais_total.sum() - top.sum()
     
     # Criar DataFrame para o gráfico
     data = pd.DataFrame({
@@ -424,6 +431,8 @@ def create_pie_chart_concentration(df_export, top_n=5, title="Concentração de
         'valor': list(top.values) + [resto]
     })
     
+    import plotly.express as px
+    
     fig = px.pie(
         data,
         values='valor',